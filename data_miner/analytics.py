@@ -0,0 +1,154 @@
+"""
+Counting logic of the question analytics summaries (see :model:`data_miner.QuestionAnalytics`)
+
+The functions only read the fields of the records and write the fields of the
+summaries given to them, and do not import the models, so that the same logic
+updates the summaries in the data collection jobs, rebuilds them from the
+records (``QuestionAnalytics.rebuild``), and builds them for the existing
+records in the data migration, which works with the historical models.
+"""
+
+from datetime import datetime
+from typing import Optional, Dict, List, Iterable, Callable, Any
+
+
+# Time spent is stored in histograms rounded to TIME_RESOLUTION minutes
+TIME_RESOLUTION = 0.1
+# Longer attempts (in minutes) are treated as outliers
+MAX_TIME_SPENT = 4000 / 60
+
+
+def time_spent(record: Any) -> Optional[float]:
+    """ Time spent on the attempt of a record in minutes, or ``None`` if not completed """
+    if not (record.start_time and record.time_of_completion):
+        return None
+    return (record.time_of_completion - record.start_time).total_seconds() / 60
+
+
+def step_time_spent(record: Any, step: int) -> float:
+    """ Time spent on the given step (starting from 0) of a multi-step record in minutes """
+    step_end = datetime.fromisoformat(record.step_completion_time[step])
+    if step == 0:
+        step_start = record.start_time.replace(tzinfo=None)
+    else:
+        step_start = datetime.fromisoformat(record.step_completion_time[step - 1])
+    return (step_end - step_start).total_seconds() / 60
+
+
+def feature_list_types(feature_list: Optional[Dict[str, Any]]) -> List[str]:
+    """ Types of all features in a Part Studio feature list """
+    if not feature_list:
+        return []
+    return [fea['featureType'] for fea in feature_list['features']]
+
+
+def assembly_def_types(assembly_def: Optional[Dict[str, Any]]) -> List[str]:
+    """ Types of all features in an assembly definition, with mates counted by the mate type """
+    if not assembly_def:
+        return []
+    fea_types = []
+    for fea in assembly_def['rootAssembly']['features'] + [
+        fea for subass in assembly_def['subAssemblies'] for fea in subass['features']
+    ]:
+        if fea['featureType'] != 'mate':
+            fea_types.append(fea['featureType'])
+        else:
+            fea_types.append(fea['featureData']['mateType'])
+    return fea_types
+
+
+def add_time(hist: Dict[str, int], minutes: Optional[float]) -> None:
+    """ Count the time spent in a histogram, unless it is unknown or an outlier """
+    if minutes is None or minutes > MAX_TIME_SPENT:
+        return None
+    key = str(round(round(minutes / TIME_RESOLUTION) * TIME_RESOLUTION, 1))
+    hist[key] = hist.get(key, 0) + 1
+    return None
+
+
+def count_first_failure(summary: Any) -> None:
+    """ Count a new attempt with a failed submission """
+    summary.attempt_cnt += 1
+    summary.first_failed_cnt += 1
+    return None
+
+
+def count_step(summary: Any, step: int, minutes: float) -> None:
+    """ Count the time spent on a completed step (starting from 0) of a multi-step question """
+    if step == 0:
+        summary.attempt_cnt += 1
+    while len(summary.step_time_spent) <= step:
+        summary.step_time_spent.append({})
+    add_time(summary.step_time_spent[step], minutes)
+    return None
+
+
+def count_final_submission(
+    summary: Any, new_attempt: bool, is_final_failure: bool, first_failed: bool,
+    minutes: Optional[float], fea_types: List[str]
+) -> None:
+    """ Count the result, time spent and features of a final submission, either
+    successful or given up; ``new_attempt`` if the attempt has not been counted
+    by a failed submission or step before, and ``first_failed`` if the attempt
+    had a failed submission
+    """
+    if new_attempt:
+        summary.attempt_cnt += 1
+    if is_final_failure:
+        result = "give_up"
+        summary.give_up_cnt += 1
+    elif first_failed:
+        result = "indirect"
+        summary.indirect_succ_cnt += 1
+    else:
+        result = "direct"
+        summary.direct_succ_cnt += 1
+    add_time(summary.time_spent.setdefault(result, {}), minutes)
+
+    if not is_final_failure and fea_types:
+        key = str(len(fea_types))
+        summary.feature_cnts[key] = summary.feature_cnts.get(key, 0) + 1
+        for fea_type in fea_types:
+            summary.feature_types[fea_type] = summary.feature_types.get(fea_type, 0) + 1
+    return None
+
+
+def build_summaries(
+    ps_records: Iterable[Any], as_records: Iterable[Any], msps_records: Iterable[Any],
+    new_summary: Callable[[Any], Any], resolve: Callable[[Any], Any] = lambda value: value
+) -> Dict[int, Any]:
+    """ Build the unsaved summaries of all questions, by question ID, from the
+    records of Part Studio, assembly and multi-step questions
+
+    ``new_summary`` creates the empty summary of the question of a record, and
+    ``resolve`` gives back the stored artifact of a reference in a record.
+    """
+    summaries = {}
+
+    def summary_of(record: Any) -> Any:
+        if record.question_id not in summaries:
+            summaries[record.question_id] = new_summary(record)
+        return summaries[record.question_id]
+
+    for records, feature_types in [
+        (ps_records, lambda record: feature_list_types(resolve(record.final_feature_list))),
+        (as_records, lambda record: assembly_def_types(resolve(record.final_assembly_def)))
+    ]:
+        for record in records:
+            if record.first_failed_time:
+                count_first_failure(summary_of(record))
+            if record.time_of_completion:
+                count_final_submission(
+                    summary_of(record), record.first_failed_time is None,
+                    record.is_final_failure, bool(record.first_failed_time),
+                    time_spent(record), feature_types(record)
+                )
+    for record in msps_records:
+        for step in range(len(record.step_completion_time or [])):
+            count_step(summary_of(record), step, step_time_spent(record, step))
+        if record.time_of_completion and not record.is_final_failure:
+            count_final_submission(
+                summary_of(record), False, False, False, time_spent(record),
+                feature_list_types(resolve((record.step_feature_lists or [None])[-1]))
+            )
+    return summaries
@@ -0,0 +1,42 @@
+import base64
+
+import trimesh
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from data_miner.models import HistoryData_PS, MeshBlob
+
+
+def load_stl(data: str):
+    """ Load a base64-encoded STL mesh, merging its duplicated vertices """
+    if not data:
+        return None
+    return trimesh.load(
+        trimesh.util.wrap_as_stream(base64.b64decode(data)), file_type="stl"
+    )
+
+
+class Command(BaseCommand):
+    help = "Move the legacy STL meshes of the collected records to compressed mesh blobs"
+
+    def handle(self, *args, **options):
+        cnt = 0
+        records = HistoryData_PS.objects.filter(
+            Q(failed_mesh__isnull=False) | ~Q(process_mesh=[])
+        ).only(
+            "failed_mesh", "failed_mesh_digest", "process_mesh", "process_mesh_digests"
+        )
+        for record in records.iterator(chunk_size=20):
+            if record.failed_mesh:
+                record.failed_mesh_digest = MeshBlob.store(load_stl(record.failed_mesh))
+            if record.process_mesh:
+                record.process_mesh_digests = [
+                    (index, MeshBlob.store(load_stl(mesh))) for index, mesh in record.process_mesh
+                ]
+            record.failed_mesh = None
+            record.process_mesh = []
+            record.save(update_fields=[
+                "failed_mesh", "failed_mesh_digest", "process_mesh", "process_mesh_digests"
+            ])
+            cnt += 1
+        self.stdout.write("Compressed the meshes of {} records".format(cnt))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from data_miner.models import HistoryData_PS, HistoryData_AS, HistoryData_MSPS, Artifact
+
+
+class Command(BaseCommand):
+    help = "Move the shaded views, feature lists and assembly definitions stored in the collected records to the content-addressed artifact store"
+
+    def handle(self, *args, **options):
+        cnt = 0
+        for model, json_fields in (
+            (HistoryData_PS, ["failed_feature_list", "final_feature_list"]),
+            (HistoryData_AS, ["failed_assembly_def", "final_assembly_def"]),
+        ):
+            fields = json_fields + ["failed_shaded_views", "final_shaded_views"]
+            for record in model.objects.only(*fields).iterator(chunk_size=20):
+                for field in json_fields:
+                    setattr(record, field, Artifact.store_json(getattr(record, field) or None))
+                record.failed_shaded_views = Artifact.store_images(record.failed_shaded_views or {})
+                record.final_shaded_views = Artifact.store_images(record.final_shaded_views or {})
+                record.save(update_fields=fields)
+                cnt += 1
+        fields = ["step_feature_lists", "step_shaded_views"]
+        for record in HistoryData_MSPS.objects.only(*fields).iterator(chunk_size=20):
+            record.step_feature_lists = [
+                Artifact.store_json(feature_list) for feature_list in record.step_feature_lists or []
+            ]
+            record.step_shaded_views = [
+                Artifact.store_images(shaded_views) for shaded_views in record.step_shaded_views or []
+            ]
+            record.save(update_fields=fields)
+            cnt += 1
+        self.stdout.write("Moved the artifacts of {} records to the artifact store".format(cnt))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from data_miner.models import HistoryData_PS, HistoryData_AS, HistoryData_MSPS, ShadedViewHash, Artifact
+
+
+class Command(BaseCommand):
+    help = "Compute the perceptual hashes of the shaded views of all collected records that have not been indexed yet"
+
+    def handle(self, *args, **options):
+        cnt = 0
+        for model in (HistoryData_PS, HistoryData_AS):
+            for record in model.objects.filter(view_hashes__isnull=True).only(
+                "question_id", "failed_shaded_views", "final_shaded_views"
+            ).iterator(chunk_size=100):
+                # Views moved to the artifact store (by dedupe_artifacts) are references
+                ShadedViewHash.index(
+                    record, ShadedViewHash.FAILED, Artifact.resolve_images(record.failed_shaded_views)
+                )
+                ShadedViewHash.index(
+                    record, ShadedViewHash.FINAL, Artifact.resolve_images(record.final_shaded_views)
+                )
+                cnt += 1
+        for record in HistoryData_MSPS.objects.filter(view_hashes__isnull=True).only(
+            "question_id", "step_shaded_views"
+        ).iterator(chunk_size=100):
+            for step, shaded_views in enumerate(record.step_shaded_views or []):
+                ShadedViewHash.index(
+                    record, ShadedViewHash.STEP, Artifact.resolve_images(shaded_views), step=step
+                )
+            cnt += 1
+        self.stdout.write("Indexed the shaded views of {} records".format(cnt))
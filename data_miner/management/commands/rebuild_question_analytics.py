@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from data_miner.models import QuestionAnalytics
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the analytics summaries of all questions from the collected history data. "
+        "Run it with the RQ workers stopped: data collected during the rebuild may be "
+        "counted twice or not at all."
+    )
+
+    def handle(self, *args, **options):
+        QuestionAnalytics.rebuild()
+        self.stdout.write("Rebuilt {} question analytics summaries".format(QuestionAnalytics.objects.count()))
@@ -0,0 +1,48 @@
+# Generated by Django 4.2 on 2026-10-17 02:43
+
+from django.db import migrations, models
+
+from data_miner.analytics import build_summaries
+
+
+def build_question_analytics(apps, schema_editor):
+    """ Build the summaries of the questions from the records collected so far,
+    with the same counting logic as ``QuestionAnalytics.rebuild`` """
+    QuestionAnalytics = apps.get_model('data_miner', 'QuestionAnalytics')
+    summaries = build_summaries(
+        apps.get_model('data_miner', 'HistoryData_PS').objects.iterator(chunk_size=100),
+        apps.get_model('data_miner', 'HistoryData_AS').objects.iterator(chunk_size=100),
+        apps.get_model('data_miner', 'HistoryData_MSPS').objects.iterator(chunk_size=100),
+        new_summary=lambda record: QuestionAnalytics(
+            question_id=record.question_id, question_type=record.question_type
+        )
+    )
+    QuestionAnalytics.objects.bulk_create(summaries.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_miner', '0007_alter_historydata_is_final_failure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionAnalytics',
+            fields=[
+                ('question_id', models.IntegerField(help_text='Unique question ID', primary_key=True, serialize=False)),
+                ('question_type', models.CharField(choices=[('UNKN', 'Unknown'), ('SPPS', 'Single-part Part Studio'), ('MPPS', 'Multi-part Part Studio'), ('ASMB', 'Assembly Mating'), ('MSPS', 'Multi-step Part Studio')], default='UNKN', max_length=4)),
+                ('attempt_cnt', models.IntegerField(default=0, help_text='Number of attempts')),
+                ('first_failed_cnt', models.IntegerField(default=0, help_text='Number of attempts with at least one failed submission')),
+                ('direct_succ_cnt', models.IntegerField(default=0, help_text='Number of successful attempts with the first submission')),
+                ('indirect_succ_cnt', models.IntegerField(default=0, help_text='Number of successful attempts after failed submissions')),
+                ('give_up_cnt', models.IntegerField(default=0, help_text='Number of failed attempts with give-up')),
+                ('time_spent', models.JSONField(default=dict, help_text='Histograms of time spent in minutes by attempt result: direct, indirect, give_up')),
+                ('step_time_spent', models.JSONField(default=list, help_text='Histograms of time spent in minutes on every step of multi-step questions')),
+                ('feature_cnts', models.JSONField(default=dict, help_text='Histogram of the number of features used in successful attempts')),
+                ('feature_types', models.JSONField(default=dict, help_text='Number of features used of every feature type in successful attempts')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(build_question_analytics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2 on 2026-10-17 02:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from data_miner.phash import hash_shaded_views
+
+
+def index_shaded_views(apps, schema_editor):
+    """ Hash the shaded views of the records collected so far, the same way as
+    ``ShadedViewHash.index``, so that they are found by the view clusters """
+    ShadedViewHash = apps.get_model('data_miner', 'ShadedViewHash')
+
+    def index(record, kind, shaded_views, step=None):
+        ShadedViewHash.objects.bulk_create([
+            ShadedViewHash(
+                record_id=record.pk, question_id=record.question_id, kind=kind, step=step,
+                view=view, phash=phash, thumbnail=thumbnail
+            )
+            for view, phash, thumbnail in hash_shaded_views(shaded_views)
+        ])
+
+    for model_name in ['HistoryData_PS', 'HistoryData_AS']:
+        for record in apps.get_model('data_miner', model_name).objects.only(
+            'question_id', 'failed_shaded_views', 'final_shaded_views'
+        ).iterator(chunk_size=100):
+            index(record, 'failed', record.failed_shaded_views)
+            index(record, 'final', record.final_shaded_views)
+    for record in apps.get_model('data_miner', 'HistoryData_MSPS').objects.only(
+        'question_id', 'step_shaded_views'
+    ).iterator(chunk_size=100):
+        for step, shaded_views in enumerate(record.step_shaded_views or []):
+            index(record, 'step', shaded_views, step=step)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_miner', '0008_question_analytics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShadedViewHash',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question_id', models.IntegerField(default=0, help_text='Unique question ID')),
+                ('kind', models.CharField(choices=[('final', 'Final submission'), ('failed', 'First failed submission'), ('step', 'Step submission')], max_length=6)),
+                ('step', models.IntegerField(default=None, help_text='Step number (from 0) of step submissions', null=True)),
+                ('view', models.CharField(help_text='FRT or BLB', max_length=3)),
+                ('phash', models.BigIntegerField(help_text='64-bit DCT perceptual hash')),
+                ('thumbnail', models.BinaryField(help_text='Grayscale pixels of the view downsampled to 16x16')),
+                ('record', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_hashes', to='data_miner.historydata')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='shadedviewhash',
+            index=models.Index(fields=['question_id', 'kind', 'view', 'step'], name='data_miner__questio_0bd6d8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shadedviewhash',
+            index=models.Index(fields=['phash'], name='data_miner__phash_b63e12_idx'),
+        ),
+        migrations.RunPython(index_shaded_views, migrations.RunPython.noop),
+    ]
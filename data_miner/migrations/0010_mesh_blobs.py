@@ -0,0 +1,42 @@
+# Generated by Django 4.2 on 2026-10-17 02:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_miner', '0009_shaded_view_hashes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeshBlob',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('vertex_cnt', models.IntegerField(default=0)),
+                ('face_cnt', models.IntegerField(default=0)),
+                ('data', models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='historydata_ps',
+            name='failed_mesh_digest',
+            field=models.CharField(blank=True, default='', help_text='MeshBlob of the first failed submission model', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='historydata_ps',
+            name='process_mesh_digests',
+            field=models.JSONField(default=list, help_text='MeshBlobs of the model after every feature of the final submitted model', null=True),
+        ),
+        migrations.AlterField(
+            model_name='historydata_ps',
+            name='failed_mesh',
+            field=models.TextField(blank=True, default=None, help_text='(Legacy) mesh of the first failed submission model in STL format (base64 encoded)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='historydata_ps',
+            name='process_mesh',
+            field=models.JSONField(default=list, help_text='(Legacy) the mesh of the model after every feature of the final submitted model in STL format (base64 encoded)', null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-17 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_miner', '0010_mesh_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Artifact',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('content_type', models.CharField(max_length=100)),
+                ('data', models.BinaryField()),
+            ],
+        ),
+    ]
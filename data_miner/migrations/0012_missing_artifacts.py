@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 02:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_miner', '0011_artifacts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historydata',
+            name='missing_artifacts',
+            field=models.JSONField(default=list, help_text='Names of the design data that could not be retrieved from Onshape'),
+        ),
+    ]
@@ -17,16 +17,24 @@ When creating new history data types:
 """
 
 import os 
+import io 
 import base64 
-import requests 
+import hashlib 
+import json 
+import zlib 
 import trimesh
+import numpy as np 
 from datetime import timedelta
-from typing import Tuple, Dict, List, Any 
+from functools import partial
+from typing import Optional, Tuple, Dict, List, Any 
 
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
+from questioner import onshape
 from questioner.models import AuthUser, QuestionType
+from . import analytics
+from .phash import perceptual_hash, hamming_distances, hash_shaded_views
 
 
 # Two isometric view matrices 
@@ -79,6 +87,9 @@ class HistoryData(models.Model):
     final_query_complete_time = models.DateTimeField(
         default=None, null=True, help_text="Time when all data query API calls were completed"
     )
+    missing_artifacts = models.JSONField(
+        default=list, help_text="Names of the design data that could not be retrieved from Onshape"
+    )
 
     def first_failure_record(self, user: AuthUser, q_info: Tuple[str]) -> None: 
         return None 
@@ -86,6 +97,31 @@ class HistoryData(models.Model):
     def final_sub_record(self, user: AuthUser, q_info: Tuple[str]) -> None: 
         return None 
 
+    def final_feature_types(self) -> List[str]: 
+        """ Types of all features in the final submitted model """
+        return [] 
+
+    def fetch_artifacts(self, user: AuthUser, prefix: str, **calls) -> Dict[str, Any]: 
+        """ Retrieve the design data of a submission from Onshape concurrently (see :func:`questioner.onshape.fetch_all`), 
+        limited per user, and add the names (with the ``prefix``) of the ones that could not be retrieved (``None``) to ``missing_artifacts`` 
+        """
+        artifacts = onshape.fetch_all(concurrency_key=user.os_user_id, **calls)
+        for name, artifact in artifacts.items(): 
+            if artifact is None and prefix + name not in self.missing_artifacts: 
+                self.missing_artifacts.append(prefix + name)
+        return artifacts 
+
+    def shaded_view_calls(self, user: AuthUser, q_info: Tuple[str]) -> Dict[str, Any]: 
+        """ Calls for :meth:`fetch_artifacts` of the two isometric shaded views """
+        return {
+            "FRT": partial(get_shaded_view, user, q_info, view_mat=FRT_VIEW_MAT), 
+            "BLB": partial(get_shaded_view, user, q_info, view_mat=BLB_VIEW_MAT)
+        }
+
+    def get_time_spent(self) -> float: 
+        """ Time spent on the attempt in minutes, or ``None`` if not completed """
+        return analytics.time_spent(self)
+
 
 class HistoryData_PS(HistoryData): 
     """ 
@@ -102,7 +138,10 @@ class HistoryData_PS(HistoryData):
         default=dict, null=True, help_text="Shaded view images of the first failed submission model"
     )
     failed_mesh = models.TextField(
-        default=None, null=True, blank=True, help_text="Mesh of the first failed submission model"
+        default=None, null=True, blank=True, help_text="(Legacy) mesh of the first failed submission model in STL format (base64 encoded)"
+    )
+    failed_mesh_digest = models.CharField(
+        max_length=64, default="", blank=True, help_text="MeshBlob of the first failed submission model"
     )
 
     # Final submission 
@@ -113,8 +152,11 @@ class HistoryData_PS(HistoryData):
         default=dict, null=True, help_text="Shaded view images of the final submitted model"
     )
     process_mesh = models.JSONField(
-        default=list, null=True, help_text="The mesh of the model after every feature of the final submitted model"
+        default=list, null=True, help_text="(Legacy) the mesh of the model after every feature of the final submitted model in STL format (base64 encoded)"
     ) # List[Tuple[rollbackBarIndex, mesh]]
+    process_mesh_digests = models.JSONField(
+        default=list, null=True, help_text="MeshBlobs of the model after every feature of the final submitted model"
+    ) # List[Tuple[rollbackBarIndex, digest]]
 
     def first_failure_record(self, user: AuthUser, q_info: Tuple[str]) -> None: 
         """ 
@@ -129,14 +171,21 @@ class HistoryData_PS(HistoryData):
         if user.expires_at <= timezone.now() + timedelta(minutes=10): 
             user.refresh_oauth_token() 
 
-        self.failed_feature_list = get_feature_list(user, q_info)
-        self.failed_shaded_views = {
-            "FRT": get_shaded_view(user, q_info, view_mat=FRT_VIEW_MAT), 
-            "BLB": get_shaded_view(user, q_info, view_mat=BLB_VIEW_MAT)
-        }
-        self.failed_mesh = get_stl_mesh(user, q_info)
+        artifacts = self.fetch_artifacts(
+            user, "failed_", 
+            feature_list=partial(get_feature_list, user, q_info), 
+            mesh=partial(get_mesh, user, q_info), 
+            **self.shaded_view_calls(user, q_info)
+        )
+        failed_shaded_views = {view: artifacts[view] or "" for view in ("FRT", "BLB")}
+        self.failed_feature_list = Artifact.store_json(artifacts["feature_list"])
+        self.failed_shaded_views = Artifact.store_images(failed_shaded_views)
+        self.failed_mesh_digest = MeshBlob.store(artifacts["mesh"])
         self.final_query_complete_time = timezone.now() 
-        self.save() 
+        with transaction.atomic(): # the summary counts the record iff it is saved 
+            self.save() 
+            ShadedViewHash.index(self, ShadedViewHash.FAILED, failed_shaded_views)
+            QuestionAnalytics.record_first_failure(self)
 
     def final_sub_record(self, user: AuthUser, q_info: Tuple[str]) -> None: 
         """ 
@@ -151,15 +200,42 @@ class HistoryData_PS(HistoryData):
         if user.expires_at <= timezone.now() + timedelta(minutes=10): 
             user.refresh_oauth_token() 
 
-        self.microversions_descrip = get_microversions_descrip(user, q_info)
-        self.final_feature_list = get_feature_list(user, q_info)
-        self.final_shaded_views = {
-            "FRT": get_shaded_view(user, q_info, view_mat=FRT_VIEW_MAT), 
-            "BLB": get_shaded_view(user, q_info, view_mat=BLB_VIEW_MAT)
-        }
-        self.process_mesh = [(-1, get_stl_mesh(user, q_info))]
+        artifacts = self.fetch_artifacts(
+            user, "final_", 
+            microversions=partial(get_microversions_descrip, user, q_info), 
+            feature_list=partial(get_feature_list, user, q_info), 
+            mesh=partial(get_mesh, user, q_info), 
+            **self.shaded_view_calls(user, q_info)
+        )
+        final_shaded_views = {view: artifacts[view] or "" for view in ("FRT", "BLB")}
+        self.microversions_descrip = artifacts["microversions"] or [] 
+        self.final_feature_list = Artifact.store_json(artifacts["feature_list"])
+        self.final_shaded_views = Artifact.store_images(final_shaded_views)
+        self.process_mesh_digests = [(-1, MeshBlob.store(artifacts["mesh"]))]
         self.final_query_complete_time = timezone.now() 
-        self.save() 
+        with transaction.atomic(): # the summary counts the record iff it is saved 
+            self.save() 
+            ShadedViewHash.index(self, ShadedViewHash.FINAL, final_shaded_views)
+            QuestionAnalytics.record_final_submission(self, new_attempt=self.first_failed_time is None)
+
+    def final_feature_types(self) -> List[str]: 
+        return analytics.feature_list_types(Artifact.resolve(self.final_feature_list))
+
+    def get_failed_stl(self) -> str: 
+        """ Mesh of the first failed submission model in STL format (base64 encoded) """
+        if self.failed_mesh_digest: 
+            return MeshBlob.objects.get(digest=self.failed_mesh_digest).to_stl() 
+        return self.failed_mesh or ""
+
+    def get_process_stl(self) -> List[Tuple[int, str]]: 
+        """ Meshes of the model after every feature of the final submitted model in STL format (base64 encoded) """
+        if self.process_mesh_digests: 
+            blobs = MeshBlob.objects.in_bulk([digest for _, digest in self.process_mesh_digests if digest])
+            return [
+                (index, blobs[digest].to_stl() if digest else "") 
+                for index, digest in self.process_mesh_digests
+            ]
+        return self.process_mesh or [] 
 
 
 class HistoryData_AS(HistoryData): 
@@ -198,13 +274,19 @@ class HistoryData_AS(HistoryData):
         if user.expires_at <= timezone.now() + timedelta(minutes=10): 
             user.refresh_oauth_token() 
 
-        self.failed_feature_list = get_assembly_definition(user, q_info)
-        self.failed_shaded_views = {
-            "FRT": get_shaded_view(user, q_info, view_mat=FRT_VIEW_MAT), 
-            "BLB": get_shaded_view(user, q_info, view_mat=BLB_VIEW_MAT)
-        }
+        artifacts = self.fetch_artifacts(
+            user, "failed_", 
+            assembly_def=partial(get_assembly_definition, user, q_info), 
+            **self.shaded_view_calls(user, q_info)
+        )
+        failed_shaded_views = {view: artifacts[view] or "" for view in ("FRT", "BLB")}
+        self.failed_assembly_def = Artifact.store_json(artifacts["assembly_def"])
+        self.failed_shaded_views = Artifact.store_images(failed_shaded_views)
         self.final_query_complete_time = timezone.now() 
-        self.save() 
+        with transaction.atomic(): # the summary counts the record iff it is saved 
+            self.save() 
+            ShadedViewHash.index(self, ShadedViewHash.FAILED, failed_shaded_views)
+            QuestionAnalytics.record_first_failure(self)
 
     def final_sub_record(self, user: AuthUser, q_info: Tuple[str]) -> None: 
         """ 
@@ -219,14 +301,25 @@ class HistoryData_AS(HistoryData):
         if user.expires_at <= timezone.now() + timedelta(minutes=10): 
             user.refresh_oauth_token() 
 
-        self.microversions_descrip = get_microversions_descrip(user, q_info)
-        self.final_assembly_def = get_assembly_definition(user, q_info)
-        self.final_shaded_views = {
-            "FRT": get_shaded_view(user, q_info, view_mat=FRT_VIEW_MAT), 
-            "BLB": get_shaded_view(user, q_info, view_mat=BLB_VIEW_MAT)
-        }
+        artifacts = self.fetch_artifacts(
+            user, "final_", 
+            microversions=partial(get_microversions_descrip, user, q_info), 
+            assembly_def=partial(get_assembly_definition, user, q_info), 
+            **self.shaded_view_calls(user, q_info)
+        )
+        final_shaded_views = {view: artifacts[view] or "" for view in ("FRT", "BLB")}
+        self.microversions_descrip = artifacts["microversions"] or [] 
+        self.final_assembly_def = Artifact.store_json(artifacts["assembly_def"])
+        self.final_shaded_views = Artifact.store_images(final_shaded_views)
         self.final_query_complete_time = timezone.now() 
-        self.save() 
+        with transaction.atomic(): # the summary counts the record iff it is saved 
+            self.save() 
+            ShadedViewHash.index(self, ShadedViewHash.FINAL, final_shaded_views)
+            QuestionAnalytics.record_final_submission(self, new_attempt=self.first_failed_time is None)
+
+    def final_feature_types(self) -> List[str]: 
+        # Mates are counted by the mate type 
+        return analytics.assembly_def_types(Artifact.resolve(self.final_assembly_def))
 
 
 class HistoryData_MSPS(HistoryData): 
@@ -259,18 +352,338 @@ class HistoryData_MSPS(HistoryData):
         if user.expires_at <= timezone.now() + timedelta(minutes=10): 
             user.refresh_oauth_token() 
         
-        self.step_feature_lists.append(get_feature_list(user, q_info))
-        self.step_shaded_views.append({
-            "FRT": get_shaded_view(user, q_info, view_mat=FRT_VIEW_MAT), 
-            "BLB": get_shaded_view(user, q_info, view_mat=BLB_VIEW_MAT)
-        })
-        self.final_query_complete_time = timezone.now() 
-        
+        calls = dict(
+            feature_list=partial(get_feature_list, user, q_info), 
+            **self.shaded_view_calls(user, q_info)
+        )
         # If final step of the question 
         if is_final_step: 
-            self.microversions_descrip = get_microversions_descrip(user, q_info)
+            calls["microversions"] = partial(get_microversions_descrip, user, q_info)
+        artifacts = self.fetch_artifacts(
+            user, "step_{}_".format(len(self.step_feature_lists) + 1), **calls
+        )
+        
+        step_shaded_views = {view: artifacts[view] or "" for view in ("FRT", "BLB")}
+        self.step_feature_lists.append(Artifact.store_json(artifacts["feature_list"]))
+        self.step_shaded_views.append(Artifact.store_images(step_shaded_views))
+        if is_final_step: 
+            self.microversions_descrip = artifacts["microversions"] or [] 
+        self.final_query_complete_time = timezone.now() 
         
-        self.save() 
+        with transaction.atomic(): # the summary counts the record iff it is saved 
+            self.save() 
+            ShadedViewHash.index(
+                self, ShadedViewHash.STEP, step_shaded_views, 
+                step=len(self.step_shaded_views) - 1
+            )
+            QuestionAnalytics.record_step(self, len(self.step_completion_time) - 1)
+            if is_final_step: 
+                QuestionAnalytics.record_final_submission(self, new_attempt=False)
+
+    def final_feature_types(self) -> List[str]: 
+        if not self.step_feature_lists: 
+            return [] 
+        return analytics.feature_list_types(Artifact.resolve(self.step_feature_lists[-1]))
+
+    def get_step_time_spent(self, step: int) -> float: 
+        """ Time spent on the given step (starting from 0) in minutes """
+        return analytics.step_time_spent(self, step)
+
+
+class QuestionAnalytics(models.Model): 
+    """
+    Summary of the collected data of a question presented in the data_miner dashboards, updated incrementally by the data collection jobs of :model:`data_miner.HistoryData` as they complete, such that the dashboards do not read the raw records 
+    
+    Time spent and feature counts are stored as histograms, ``{value: count}``, with time spent rounded to ``TIME_RESOLUTION`` minutes. Successful full attempts of multi-step questions are counted as successful attempts with the first submission. The counting logic is in ``data_miner.analytics``, shared with the data migration that builds the summaries of the existing records. 
+    
+    The summaries can be rebuilt from the raw records with the ``rebuild_question_analytics`` management command (with the data collection workers stopped). 
+    """
+    TIME_RESOLUTION = analytics.TIME_RESOLUTION 
+    MAX_TIME_SPENT = analytics.MAX_TIME_SPENT # longer attempts are treated as outliers 
+
+    question_id = models.IntegerField(primary_key=True, help_text='Unique question ID') 
+    question_type = models.CharField(
+        max_length=4, choices=QuestionType.choices, default=QuestionType.UNKNOWN
+    )
+    
+    # Attempt counts 
+    attempt_cnt = models.IntegerField(default=0, help_text="Number of attempts")
+    first_failed_cnt = models.IntegerField(default=0, help_text="Number of attempts with at least one failed submission")
+    direct_succ_cnt = models.IntegerField(default=0, help_text="Number of successful attempts with the first submission")
+    indirect_succ_cnt = models.IntegerField(default=0, help_text="Number of successful attempts after failed submissions")
+    give_up_cnt = models.IntegerField(default=0, help_text="Number of failed attempts with give-up")
+
+    # Histograms 
+    time_spent = models.JSONField(
+        default=dict, help_text="Histograms of time spent in minutes by attempt result: direct, indirect, give_up"
+    )
+    step_time_spent = models.JSONField(
+        default=list, help_text="Histograms of time spent in minutes on every step of multi-step questions"
+    )
+    feature_cnts = models.JSONField(
+        default=dict, help_text="Histogram of the number of features used in successful attempts"
+    )
+    feature_types = models.JSONField(
+        default=dict, help_text="Number of features used of every feature type in successful attempts"
+    )
+    
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def succ_cnt(self) -> int: 
+        return self.direct_succ_cnt + self.indirect_succ_cnt
+
+    @property
+    def partial_cnt(self) -> int: 
+        """ Attempts of multi-step questions that did not reach the last step """
+        return self.attempt_cnt - self.direct_succ_cnt
+
+    @property
+    def no_give_up_cnt(self) -> int: 
+        """ Attempts with failed submissions that were neither completed nor given up """
+        return self.first_failed_cnt - self.indirect_succ_cnt - self.give_up_cnt
+
+    @classmethod
+    def _update(cls, record: HistoryData, update) -> None: 
+        """ Apply ``update`` to the locked summary of the question of the ``record`` """
+        with transaction.atomic(): 
+            summary, _ = cls.objects.select_for_update().get_or_create(
+                question_id=record.question_id, 
+                defaults={"question_type": record.question_type}
+            )
+            update(summary)
+            summary.save() 
+        return None 
+
+    @classmethod
+    def record_first_failure(cls, record: HistoryData) -> None: 
+        """ Count a new attempt with a failed submission """
+        return cls._update(record, analytics.count_first_failure)
+
+    @classmethod
+    def record_step(cls, record: HistoryData_MSPS, step: int) -> None: 
+        """ Add the time spent on a completed step (starting from 0) of a multi-step question """
+        minutes = record.get_step_time_spent(step)
+        return cls._update(
+            record, lambda summary: analytics.count_step(summary, step, minutes)
+        )
+
+    @classmethod
+    def record_final_submission(cls, record: HistoryData, new_attempt: bool) -> None: 
+        """ Add the result, time spent and features of a final submission, either successful or failed; 
+        ``new_attempt`` if the attempt has not been counted by a failed submission or step before 
+        """
+        args = (
+            new_attempt, record.is_final_failure, bool(getattr(record, "first_failed_time", None)), 
+            record.get_time_spent(), record.final_feature_types() 
+        )
+        return cls._update(
+            record, lambda summary: analytics.count_final_submission(summary, *args)
+        )
+
+    def get_time_spent(self, *results: str) -> List[float]: 
+        """ Time spent in minutes of all attempts with the given results (``direct``, ``indirect``, or ``give_up``) """
+        return [
+            float(key) for result in results 
+            for key, cnt in self.time_spent.get(result, {}).items() for _ in range(cnt)
+        ]
+
+    def get_step_time_spent(self) -> List[List[float]]: 
+        """ Time spent in minutes on every step of all attempts of a multi-step question """
+        return [
+            [float(key) for key, cnt in hist.items() for _ in range(cnt)] 
+            for hist in self.step_time_spent
+        ]
+
+    def get_feature_cnts(self) -> List[int]: 
+        """ Number of features used in all successful attempts """
+        return [int(key) for key, cnt in self.feature_cnts.items() for _ in range(cnt)]
+
+    def get_avg_feature_types(self) -> Dict[str, float]: 
+        """ Average number of features used of every feature type per successful attempt """
+        num_attempts = sum(self.feature_cnts.values())
+        return {
+            key: round(cnt / num_attempts, 2) for key, cnt in self.feature_types.items()
+        }
+
+    @classmethod
+    def rebuild(cls) -> None: 
+        """ Rebuild the summaries of all questions from the collected records 
+        
+        The summaries are computed in memory and replace the stored ones in one transaction. Records saved by data collection jobs during the rebuild may be counted twice or not at all, so the data collection workers should be stopped. 
+        """
+        summaries = analytics.build_summaries(
+            HistoryData_PS.objects.iterator(chunk_size=100), 
+            HistoryData_AS.objects.iterator(chunk_size=100), 
+            HistoryData_MSPS.objects.iterator(chunk_size=100), 
+            new_summary=lambda record: cls(question_id=record.question_id, question_type=record.question_type), 
+            resolve=Artifact.resolve
+        )
+        with transaction.atomic(): 
+            cls.objects.all().delete() 
+            cls.objects.bulk_create(summaries.values())
+        return None 
+
+
+class Artifact(models.Model): 
+    """
+    Design artifact collected in :model:`data_miner.HistoryData` records, i.e., a shaded view image or a JSON document (feature list or assembly definition), stored once by the SHA-256 digest of its content 
+    
+    Records hold references to the artifacts in place of the artifacts: ``"sha256:<digest>"`` for images (:meth:`store_image`) and ``{"$ref": "sha256:<digest>"}`` for JSON documents (:meth:`store_json`). :meth:`resolve` gives back the artifact of a reference, and passes artifacts stored in records before through. JSON documents are hashed in a canonical form and stored compressed. 
+    
+    Existing records can be moved to the store with the ``dedupe_artifacts`` management command. 
+    """
+    REF_PREFIX = "sha256:"
+    JSON_TYPE = "application/json+zlib"
+
+    digest = models.CharField(max_length=64, primary_key=True)
+    content_type = models.CharField(max_length=100)
+    data = models.BinaryField()
+
+    @classmethod
+    def _store(cls, data: bytes, content_type: str, digest: str) -> str: 
+        if not cls.objects.filter(digest=digest).exists(): 
+            cls.objects.get_or_create(digest=digest, defaults={"content_type": content_type, "data": data})
+        return cls.REF_PREFIX + digest 
+
+    @classmethod
+    def store_image(cls, uri: str) -> str: 
+        """ Store an image given as a base64-encoded data URI and return its reference """
+        if not uri or not uri.startswith("data:"): # empty or already stored 
+            return uri 
+        header, _, encoded = uri.partition(",")
+        data = base64.b64decode(encoded)
+        return cls._store(data, header[len("data:"):].split(";")[0], hashlib.sha256(data).hexdigest())
+
+    @classmethod
+    def store_images(cls, shaded_views: Dict[str, str]) -> Dict[str, str]: 
+        """ Store the images of shaded views, ``{view: data URI}``, and return ``{view: reference}`` """
+        return {view: cls.store_image(uri) for view, uri in shaded_views.items()}
+
+    @classmethod
+    def store_json(cls, doc: Any) -> Any: 
+        """ Store a JSON document and return its reference, or ``None`` without a document """
+        if doc is None or cls.is_json_ref(doc): 
+            return doc 
+        data = json.dumps(doc, sort_keys=True, separators=(",", ":")).encode()
+        return {"$ref": cls._store(zlib.compress(data), cls.JSON_TYPE, hashlib.sha256(data).hexdigest())}
+
+    @classmethod
+    def is_json_ref(cls, value: Any) -> bool: 
+        return isinstance(value, dict) and set(value) == {"$ref"}
+
+    @classmethod
+    def resolve(cls, value: Any) -> Any: 
+        """ Give the image (as a data URI) or JSON document of a reference; other values are returned as they are """
+        if isinstance(value, str) and value.startswith(cls.REF_PREFIX): 
+            artifact = cls.objects.get(digest=value[len(cls.REF_PREFIX):])
+            return "data:{};base64,{}".format(
+                artifact.content_type, base64.b64encode(bytes(artifact.data)).decode()
+            )
+        if cls.is_json_ref(value): 
+            artifact = cls.objects.get(digest=value["$ref"][len(cls.REF_PREFIX):])
+            return json.loads(zlib.decompress(bytes(artifact.data)))
+        return value 
+
+    @classmethod
+    def resolve_images(cls, shaded_views: Dict[str, str]) -> Dict[str, str]: 
+        """ Give the images of shaded views, ``{view: reference}``, as ``{view: data URI}`` """
+        return {view: cls.resolve(ref) for view, ref in (shaded_views or {}).items()}
+
+
+class MeshBlob(models.Model): 
+    """
+    Triangle mesh collected in :model:`data_miner.HistoryData_PS` records, stored once by the SHA-256 digest of its content 
+    
+    The indexed vertices (``float32``) and faces (``uint32``) are stored as compressed NumPy arrays (``numpy.savez_compressed``), which is several times smaller than the STL format; STL is exported on demand with :meth:`to_stl`. 
+    """
+    digest = models.CharField(max_length=64, primary_key=True)
+    vertex_cnt = models.IntegerField(default=0)
+    face_cnt = models.IntegerField(default=0)
+    data = models.BinaryField()
+
+    @classmethod
+    def store(cls, mesh: Optional[trimesh.Trimesh]) -> str: 
+        """ Store the mesh if not stored yet and return its digest, or ``""`` without a mesh """
+        if mesh is None: 
+            return ""
+        vertices = np.ascontiguousarray(mesh.vertices, dtype=np.float32)
+        faces = np.ascontiguousarray(mesh.faces, dtype=np.uint32)
+        digest = hashlib.sha256(vertices.tobytes() + faces.tobytes()).hexdigest()
+        if not cls.objects.filter(digest=digest).exists(): 
+            data = io.BytesIO() 
+            np.savez_compressed(data, vertices=vertices, faces=faces)
+            cls.objects.get_or_create(digest=digest, defaults={
+                "vertex_cnt": len(vertices), "face_cnt": len(faces), "data": data.getvalue()
+            })
+        return digest 
+
+    def load(self) -> trimesh.Trimesh: 
+        arrays = np.load(io.BytesIO(bytes(self.data)), allow_pickle=False)
+        return trimesh.Trimesh(vertices=arrays["vertices"], faces=arrays["faces"], process=False)
+
+    def to_stl(self) -> str: 
+        """ The mesh in STL format (base64 encoded) """
+        return base64.b64encode(trimesh.exchange.stl.export_stl(self.load())).decode()
+
+
+class ShadedViewHash(models.Model): 
+    """
+    Perceptual hash and downsampled grayscale image of a shaded view stored in a :model:`data_miner.HistoryData` record, computed once when the view is recorded, such that similar views can be found by Hamming distances between hashes without decoding the images 
+    
+    The views of the records collected before are indexed by the migration adding the hashes; records can be indexed again with the ``index_shaded_views`` management command. 
+    """
+    FINAL = "final"
+    FAILED = "failed"
+    STEP = "step"
+    
+    record = models.ForeignKey(HistoryData, on_delete=models.CASCADE, related_name="view_hashes")
+    question_id = models.IntegerField(default=0, help_text='Unique question ID') 
+    kind = models.CharField(max_length=6, choices=[
+        (FINAL, "Final submission"), (FAILED, "First failed submission"), (STEP, "Step submission")
+    ])
+    step = models.IntegerField(default=None, null=True, help_text="Step number (from 0) of step submissions")
+    view = models.CharField(max_length=3, help_text="FRT or BLB")
+    phash = models.BigIntegerField(help_text="64-bit DCT perceptual hash")
+    thumbnail = models.BinaryField(help_text="Grayscale pixels of the view downsampled to 16x16")
+
+    class Meta: 
+        indexes = [
+            models.Index(fields=["question_id", "kind", "view", "step"]), 
+            models.Index(fields=["phash"])
+        ]
+
+    @classmethod
+    def index(cls, record: HistoryData, kind: str, shaded_views: Dict[str, str], step=None) -> None: 
+        """ Hash the shaded views (``{view: data URI}``) of the ``record``, replacing previous hashes of the same views """
+        cls.objects.filter(record=record, kind=kind, step=step).delete() 
+        cls.objects.bulk_create([
+            cls(
+                record=record, question_id=record.question_id, kind=kind, step=step, 
+                view=view, phash=phash, thumbnail=thumbnail
+            )
+            for view, phash, thumbnail in hash_shaded_views(Artifact.resolve_images(shaded_views))
+        ])
+        return None 
+
+    @classmethod
+    def similar_records(
+        cls, question_id: int, uri: str, kind=FINAL, view="FRT", max_distance=5
+    ) -> List[int]: 
+        """ IDs of records of the question with views within ``max_distance`` bits of the given image 
+        (or its artifact reference), from the most similar by their downsampled images 
+        """
+        phash, thumbnail = perceptual_hash(Artifact.resolve(uri))
+        candidates = list(cls.objects.filter(
+            question_id=question_id, kind=kind, view=view
+        ).values_list("record_id", "phash", "thumbnail"))
+        if not candidates: 
+            return [] 
+        record_ids, phashes, thumbnails = zip(*candidates)
+        distances = hamming_distances(np.array(phashes), np.array([phash]))[:, 0]
+        thumbnails = np.stack([np.frombuffer(bytes(t), dtype=np.uint8) for t in thumbnails]).astype(np.float32)
+        errors = ((thumbnails - np.frombuffer(thumbnail, dtype=np.uint8)) ** 2).mean(axis=1)
+        return [record_ids[i] for i in np.argsort(errors) if distances[i] <= max_distance]
 
 
 #################### Helper API calls ####################
@@ -286,18 +699,14 @@ def get_microversions_descrip(user: AuthUser, q_info: Tuple[str]) -> List[Any]:
         """ Call the getDocumentHistory endpoint to get the last 20 
         microversions of the document, starting from the mid argument. 
         """
-        response = requests.get(
+        response = onshape.get(
             os.path.join(
                 q_info[0], # os_domain 
                 "api/documents/d/{}/m/{}/documenthistory".format(
                     q_info[1], mid
                 )
             ), 
-            headers={
-                "Content-Type": "application/json", 
-                "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-                "Authorization": "Bearer " + user.access_token
-            }
+            auth_token=user.access_token
         )
         if response.ok: 
             return response.json() 
@@ -344,18 +753,14 @@ def get_feature_list(user: AuthUser, q_info: Tuple[str]) -> Any:
 
     q_info: [domain, did, begin_mid, end_mid, eid, etype] at the time of completion 
     """
-    response = requests.get(
+    response = onshape.get(
         os.path.join(
             q_info[0], 
             "api/{}/d/{}/m/{}/e/{}/features".format(
                 q_info[5], q_info[1], q_info[3], q_info[4]
             )
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-            "Authorization": "Bearer " + user.access_token
-        }
+        auth_token=user.access_token
     )
     if response.ok: 
         return response.json() 
@@ -366,24 +771,20 @@ def get_feature_list(user: AuthUser, q_info: Tuple[str]) -> Any:
 def get_shaded_view(
     user: AuthUser, q_info: Tuple[str], view_mat: List[float], 
     output_dim=(128, 128), pixel_size=0
-) -> str: 
-    """ Generate the shaded view of the element as a base64-encoded string of PNG image 
+) -> Optional[str]: 
+    """ Generate the shaded view of the element as a base64-encoded string of PNG image (``None`` if the call failed) 
     
     q_info: [domain, did, begin_mid, end_mid, eid, etype] at the time of completion 
     output_dim: Tuple[outputHeight, outputWidth]
     """
-    response = requests.get(
+    response = onshape.get(
         os.path.join(
             q_info[0], 
             "api/{}/d/{}/m/{}/e/{}/shadedviews".format(
                 q_info[5], q_info[1], q_info[3], q_info[4]
             )
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-            "Authorization": "Bearer " + user.access_token
-        }, 
+        auth_token=user.access_token, 
         params={
             "viewMatrix": str(view_mat)[1:-1], 
             "outputHeight": output_dim[0], 
@@ -394,38 +795,43 @@ def get_shaded_view(
     if response.ok: 
         return f"data:image/png;base64,{response.json()['images'][0]}"
     else: 
-        return ""
+        return None
 
 
-def get_stl_mesh(user: AuthUser, q_info: Tuple[str], rollbackBarIndex=-1) -> str: 
-    """ Export the mesh representation of the part studio in STL format (base64 encoded)
-    To view the original data in bytes: base64.b64decode(data)
+def get_mesh(user: AuthUser, q_info: Tuple[str], rollbackBarIndex=-1) -> Optional[trimesh.Trimesh]: 
+    """ Export the mesh representation of the part studio, or ``None`` if the export failed 
 
     q_info: [domain, did, begin_mid, end_mid, eid, etype] at the time of completion 
     """
-    response = requests.get(
+    response = onshape.get(
         os.path.join(
             q_info[0], 
             "api/partstudios/d/{}/m/{}/e/{}/gltf".format(
                 q_info[1], q_info[3], q_info[4]
             )
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "model/gltf-binary;qs=0.08", 
-            "Authorization": "Bearer " + user.access_token
-        }, 
+        auth_token=user.access_token, accept=onshape.GLTF_ACCEPT, 
         params={
             "rollbackBarIndex": rollbackBarIndex
         }
     )
     if not response.ok: 
-        return ""
-    # Convert GLB format to STL format for storage 
-    mesh = trimesh.load(
+        return None 
+    return trimesh.load(
         trimesh.util.wrap_as_stream(response.content), 
         file_type="glb", force="mesh"
     )
+
+
+def get_stl_mesh(user: AuthUser, q_info: Tuple[str], rollbackBarIndex=-1) -> str: 
+    """ Export the mesh representation of the part studio in STL format (base64 encoded)
+    To view the original data in bytes: base64.b64decode(data)
+
+    q_info: [domain, did, begin_mid, end_mid, eid, etype] at the time of completion 
+    """
+    mesh = get_mesh(user, q_info, rollbackBarIndex=rollbackBarIndex)
+    if mesh is None: 
+        return ""
     stl_mesh = trimesh.exchange.stl.export_stl(mesh)
     return base64.b64encode(stl_mesh).decode()
 
@@ -435,18 +841,14 @@ def get_assembly_definition(user: AuthUser, q_info: Tuple[str], includeMateFeatu
 
     q_info: [domain, did, begin_mid, end_mid, eid, etype] at the time of completion 
     """
-    response = requests.get(
+    response = onshape.get(
         os.path.join(
             q_info[0], 
             "api/assemblies/d/{}/m/{}/e/{}".format(
                 q_info[1], q_info[3], q_info[4]
             )
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-            "Authorization" : "Bearer " + user.access_token
-        }, 
+        auth_token=user.access_token, 
         params={
             "includeMateFeatures": includeMateFeatures 
         }
@@ -0,0 +1,61 @@
+"""
+Perceptual hashes of shaded views (see :model:`data_miner.ShadedViewHash`)
+
+The functions work on the images only and do not import the models, so that
+the views are hashed the same way when they are recorded and in the data
+migration indexing the views of the existing records.
+"""
+
+import io
+import base64
+from typing import Tuple, Dict, List
+
+import numpy as np
+from PIL import Image
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """ Orthonormal DCT-II matrix """
+    k = np.arange(size)[:, None]
+    i = np.arange(size)[None, :]
+    mat = np.cos(np.pi * (2 * i + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    mat[0] /= np.sqrt(2)
+    return mat
+
+DCT_MAT = _dct_matrix(32)
+
+
+def perceptual_hash(uri: str) -> Tuple[int, bytes]:
+    """ Compute the 64-bit perceptual hash (signs of the lowest 8x8 DCT frequencies of the 32x32 grayscale
+    image against their median) and the 16x16 grayscale pixels of a base64-encoded image
+    """
+    image = Image.open(io.BytesIO(base64.b64decode(uri.split(',')[1]))).convert("L")
+    pixels = np.asarray(image.resize((32, 32), Image.LANCZOS), dtype=np.float64)
+    freqs = (DCT_MAT @ pixels @ DCT_MAT.T)[:8, :8].ravel()
+    bits = freqs > np.median(freqs[1:]) # excluding the DC term
+    phash = int.from_bytes(np.packbits(bits).tobytes(), "big", signed=True)
+    thumbnail = np.asarray(image.resize((16, 16), Image.BILINEAR), dtype=np.uint8).tobytes()
+    return phash, thumbnail
+
+
+def hash_shaded_views(shaded_views: Dict[str, str]) -> List[Tuple[str, int, bytes]]:
+    """ Perceptual hashes and thumbnails of shaded views, ``{view: data URI}``, as
+    ``[(view, phash, thumbnail)]``, skipping the views of failed image queries
+    """
+    return [
+        (view, *perceptual_hash(uri)) for view, uri in (shaded_views or {}).items() if uri
+    ]
+
+
+# Number of set bits of every byte value
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def hamming_distances(phashes_a: np.ndarray, phashes_b: np.ndarray) -> np.ndarray:
+    """ Number of different bits between every pair of 64-bit hashes of ``phashes_a`` and ``phashes_b``,
+    counted per byte with a lookup table (8 bytes per pair)
+    """
+    xor = np.bitwise_xor(
+        phashes_a.astype(np.int64)[:, None], phashes_b.astype(np.int64)[None, :]
+    )
+    return POPCOUNT[xor.view(np.uint8)].reshape(xor.shape + (8,)).sum(axis=-1, dtype=np.uint8)
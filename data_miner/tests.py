@@ -1,3 +1,342 @@
-from django.test import TestCase
+import io
+import base64
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import trimesh
+from PIL import Image
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+from questioner.models import AuthUser
+from .models import *
+from .views import cluster_by_error, shaded_view_cluster, daily_attempt_counts
+
+
+def create_record(question_id=1, minutes=10, first_failed=False, given_up=False, features=("extrude",)) -> HistoryData_PS:
+    """ A collected attempt of an SPPS question
+    """
+    start = timezone.now() - timezone.timedelta(minutes=minutes)
+    return HistoryData_PS.objects.create(
+        os_user_id="user-1", question_id=question_id, question_type="SPPS",
+        start_time=start, time_of_completion=start + timezone.timedelta(minutes=minutes),
+        first_failed_time=start if first_failed else None, is_final_failure=given_up,
+        final_feature_list={"features": [{"featureType": fea} for fea in features]}
+    )
+
+
+@override_settings(STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage")
+class DashboardTests(TestCase):
+    """ The dashboard counts the collected records and the attempts per day in SQL
+    """
+    def setUp(self):
+        for os_user_id in ["user-1", "user-2", "user-3"]:
+            AuthUser.objects.create(os_user_id=os_user_id)
+        day = timezone.datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+        self.start_times = [day, day + timezone.timedelta(hours=1), day + timezone.timedelta(days=2), None]
+        for i, start_time in enumerate(self.start_times):
+            HistoryData_PS.objects.create(
+                os_user_id="user-{}".format(i % 2 + 1), question_id=1, question_type="SPPS", start_time=start_time
+            )
+
+    def test_counts(self):
+        response = self.client.get(reverse("data_miner:dashboard"))
+        self.assertEqual(
+            [response.context[key] for key in ["attempt_total", "user_attempt_total", "user_login_total"]],
+            [4, 2, 3]
+        )
+
+    def test_daily_counts_add_up_to_the_cumulative_series(self):
+        daily_cnt = daily_attempt_counts(HistoryData.objects.all())
+        self.assertEqual(
+            daily_cnt, [(timezone.datetime(2026, 10, 1).date(), 2), (timezone.datetime(2026, 10, 3).date(), 1)]
+        )
+        started = [start_time for start_time in self.start_times if start_time is not None]
+        self.assertEqual(
+            np.cumsum([cnt for _, cnt in daily_cnt]).tolist(),
+            [sum(start_time.date() <= day for start_time in started) for day, _ in daily_cnt]
+        )
+        response = self.client.get(reverse("data_miner:cumulative_question_attempts"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("cum_attempt_cnt", response.json())
+
+
+class QuestionAnalyticsTests(TestCase):
+    """ The analytics summaries count the collected records of every question
+    """
+    def record(self, record: HistoryData_PS) -> None:
+        if record.first_failed_time:
+            QuestionAnalytics.record_first_failure(record)
+        QuestionAnalytics.record_final_submission(record, new_attempt=record.first_failed_time is None)
+
+    def test_attempts_are_counted_by_result(self):
+        self.record(create_record(minutes=10, features=("extrude", "fillet")))
+        self.record(create_record(minutes=20, first_failed=True))
+        self.record(create_record(minutes=30, first_failed=True, given_up=True))
+        summary = QuestionAnalytics.objects.get(question_id=1)
+        self.assertEqual(summary.attempt_cnt, 3)
+        self.assertEqual(summary.first_failed_cnt, 2)
+        self.assertEqual(
+            (summary.direct_succ_cnt, summary.indirect_succ_cnt, summary.give_up_cnt), (1, 1, 1)
+        )
+        self.assertEqual(summary.get_time_spent("direct", "indirect"), [10.0, 20.0])
+        self.assertEqual(sorted(summary.get_feature_cnts()), [1, 2])
+        self.assertEqual(summary.get_avg_feature_types(), {"extrude": 1.0, "fillet": 0.5})
+
+    def test_outliers_are_not_in_the_time_histograms(self):
+        self.record(create_record(minutes=100))
+        self.assertEqual(QuestionAnalytics.objects.get(question_id=1).get_time_spent("direct"), [])
+
+    def test_rebuild_replaces_the_summaries(self):
+        for kwargs in [{}, {"first_failed": True}, {"question_id": 2, "given_up": True}]:
+            self.record(create_record(**kwargs))
+        expected = list(QuestionAnalytics.objects.order_by("pk").values())
+        QuestionAnalytics.objects.filter(question_id=1).update(attempt_cnt=100)
+        QuestionAnalytics.objects.create(question_id=3)
+
+        QuestionAnalytics.rebuild()
+        fields = ["question_id", "attempt_cnt", "first_failed_cnt", "direct_succ_cnt", "give_up_cnt", "time_spent", "feature_types"]
+        self.assertEqual(
+            [{field: row[field] for field in fields} for row in QuestionAnalytics.objects.order_by("pk").values()],
+            [{field: row[field] for field in fields} for row in expected]
+        )
+
+
+def migrate(target=None):
+    """ Migrate the data_miner app to the ``target`` migration (the latest one by default)
+    and return the historical models """
+    executor = MigrationExecutor(connection)
+    target = target or executor.loader.graph.leaf_nodes("data_miner")[0]
+    executor.migrate([target])
+    return executor.loader.project_state([target]).apps
+
+
+class QuestionAnalyticsMigrationTests(TransactionTestCase):
+    """ The summaries of the records collected before the analytics are built by the migration
+    """
+    def test_existing_records_are_summarized(self):
+        apps = migrate(("data_miner", "0007_alter_historydata_is_final_failure"))
+        start = timezone.now() - timezone.timedelta(minutes=30)
+        for minutes, failed in [(10, False), (20, True)]:
+            apps.get_model("data_miner", "HistoryData_PS").objects.create(
+                os_user_id="user-1", question_id=1, question_type="SPPS", start_time=start,
+                time_of_completion=start + timezone.timedelta(minutes=minutes),
+                first_failed_time=start if failed else None,
+                final_feature_list={"features": [{"featureType": "extrude"}]}
+            )
+        apps.get_model("data_miner", "HistoryData_MSPS").objects.create(
+            os_user_id="user-1", question_id=2, question_type="MSPS", start_time=start,
+            time_of_completion=start + timezone.timedelta(minutes=10),
+            step_completion_time=[(start + timezone.timedelta(minutes=4)).replace(tzinfo=None).isoformat()],
+            step_feature_lists=[{"features": [{"featureType": "extrude"}]}]
+        )
+        migrate()
+
+        fields = ["question_id", "question_type", "attempt_cnt", "first_failed_cnt", "direct_succ_cnt", "indirect_succ_cnt", "time_spent", "step_time_spent", "feature_cnts", "feature_types"]
+        migrated = list(QuestionAnalytics.objects.order_by("pk").values(*fields))
+        self.assertEqual([row["attempt_cnt"] for row in migrated], [2, 1])
+        QuestionAnalytics.rebuild()
+        self.assertEqual(migrated, list(QuestionAnalytics.objects.order_by("pk").values(*fields)))
+
+
+class RecordJobTests(TestCase):
+    """ The data collection jobs save the records and count them in the summaries together
+    """
+    def setUp(self):
+        self.user = AuthUser.objects.create(
+            os_user_id="user-1", expires_at=timezone.now() + timezone.timedelta(hours=1)
+        )
+        patcher = mock.patch.object(HistoryData, "fetch_artifacts", return_value={
+            "feature_list": {"features": []}, "mesh": None, "FRT": None, "BLB": None
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_record_is_counted(self):
+        record = HistoryData_PS(os_user_id="user-1", question_id=1, question_type="SPPS")
+        record.first_failure_record(self.user, ())
+        self.assertEqual(QuestionAnalytics.objects.get(question_id=1).first_failed_cnt, 1)
+
+    def test_record_is_not_saved_if_it_cannot_be_counted(self):
+        record = HistoryData_PS(os_user_id="user-1", question_id=1, question_type="SPPS")
+        with mock.patch.object(QuestionAnalytics, "record_first_failure", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                record.first_failure_record(self.user, ())
+        self.assertFalse(HistoryData_PS.objects.exists())
+
+
+class FetchArtifactsTests(TestCase):
+    """ Design data that could not be retrieved are recorded as missing
+    """
+    def test_only_failed_calls_are_missing(self):
+        user = AuthUser(os_user_id="user-1")
+        record = HistoryData_PS(os_user_id="user-1", question_id=1, question_type="SPPS")
+        with mock.patch("questioner.onshape.fetch_all", return_value={
+            "microversions": [], "feature_list": {"features": []}, "mesh": None, "FRT": None, "BLB": "data:"
+        }) as fetch_all:
+            record.fetch_artifacts(user, "final_")
+        fetch_all.assert_called_once_with(concurrency_key="user-1")
+        self.assertEqual(record.missing_artifacts, ["final_mesh", "final_FRT"])
+
+
+class MeshBlobTests(TestCase):
+    """ Collected meshes are stored once as compressed arrays and exported as STL on demand
+    """
+    def test_round_trip_to_stl(self):
+        mesh = trimesh.creation.icosphere(subdivisions=2)
+        digest = MeshBlob.store(mesh)
+        self.assertEqual(MeshBlob.store(mesh.copy()), digest)
+        self.assertEqual(MeshBlob.objects.count(), 1)
+
+        blob = MeshBlob.objects.get(digest=digest)
+        self.assertEqual((blob.vertex_cnt, blob.face_cnt), (len(mesh.vertices), len(mesh.faces)))
+        stl = trimesh.load(
+            trimesh.util.wrap_as_stream(base64.b64decode(blob.to_stl())), file_type="stl"
+        )
+        self.assertEqual(len(stl.faces), len(mesh.faces))
+        self.assertAlmostEqual(stl.volume, mesh.volume, places=4)
+
+    def test_records_export_stored_and_legacy_meshes(self):
+        mesh = trimesh.creation.box()
+        record = create_record()
+        record.failed_mesh_digest = MeshBlob.store(mesh)
+        record.process_mesh_digests = [(-1, MeshBlob.store(mesh)), (0, MeshBlob.store(None))]
+        self.assertEqual(record.get_failed_stl(), MeshBlob.objects.get().to_stl())
+        self.assertEqual([index for index, _ in record.get_process_stl()], [-1, 0])
+        self.assertEqual(record.get_process_stl()[1][1], "")
+
+        legacy = create_record()
+        legacy.failed_mesh, legacy.process_mesh = "stl", [[-1, "stl"]]
+        self.assertEqual((legacy.get_failed_stl(), legacy.get_process_stl()), ("stl", [[-1, "stl"]]))
+
+
+def png_uri(shade: int, box=None) -> str:
+    """ A base64-encoded 64x64 PNG image filled with ``shade``, with an optional white box
+    """
+    image = Image.new("L", (64, 64), shade)
+    if box:
+        image.paste(255, box)
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(output.getvalue()).decode()
+
+
+class ShadedViewHashTests(TestCase):
+    """ Shaded views are compared and clustered by their perceptual hashes
+    """
+    def test_hamming_distances(self):
+        phashes = np.array([0, -1, 1, 0b1011, np.iinfo(np.int64).min], dtype=np.int64)
+        expected = [[bin((int(a) ^ int(b)) & (2 ** 64 - 1)).count("1") for b in phashes] for a in phashes]
+        distances = hamming_distances(phashes, phashes)
+        self.assertEqual(distances.tolist(), expected)
+        self.assertEqual(distances.itemsize, 1)
+
+    def test_cluster_by_error(self):
+        err_mat = np.array([
+            [0, 1, 9, 1],
+            [1, 0, 9, 9],
+            [9, 9, 0, 9],
+            [1, 9, 9, 0]
+        ])
+        self.assertEqual(cluster_by_error(err_mat, 2), [[0, 1, 3], [2]])
+        self.assertEqual(cluster_by_error(np.zeros((0, 0)), 2), [])
+
+    def test_similar_records(self):
+        views = [png_uri(0, (8, 8, 40, 40)), png_uri(0, (8, 8, 40, 41)), png_uri(0, (24, 0, 64, 64))]
+        records = []
+        for uri in views:
+            record = create_record()
+            ShadedViewHash.index(record, ShadedViewHash.FINAL, {"FRT": uri, "BLB": ""})
+            records.append(record.pk)
+        self.assertEqual(ShadedViewHash.objects.filter(view="BLB").count(), 0)
+        self.assertEqual(ShadedViewHash.similar_records(1, views[0]), records[:2])
+
+    def test_hashes_of_stored_artifacts(self):
+        record = create_record()
+        uri = png_uri(0, (8, 8, 40, 40))
+        ShadedViewHash.index(record, ShadedViewHash.FINAL, Artifact.store_images({"FRT": uri}))
+        self.assertEqual(
+            ShadedViewHash.objects.get(record=record).phash, perceptual_hash(uri)[0]
+        )
+
+    def test_clusters_are_renewed_with_new_hashes(self):
+        records = HistoryData_PS.objects.filter(question_id=1)
+        for box in [(8, 8, 40, 40), (24, 0, 64, 64)]:
+            record = create_record()
+            record.final_shaded_views = Artifact.store_images({"FRT": png_uri(0, box)})
+            record.save()
+            shaded_view_cluster(records, 1) # before the new view is hashed
+            ShadedViewHash.index(record, ShadedViewHash.FINAL, record.final_shaded_views)
+        self.assertEqual(shaded_view_cluster(records, 1).count("<img"), 2)
+
+
+class ShadedViewHashMigrationTests(TransactionTestCase):
+    """ The shaded views of the records collected before the hashes are indexed by the migration
+    """
+    def test_existing_views_are_indexed(self):
+        apps = migrate(("data_miner", "0008_question_analytics"))
+        uri = png_uri(0, (8, 8, 40, 40))
+        record = apps.get_model("data_miner", "HistoryData_PS").objects.create(
+            os_user_id="user-1", question_id=1, question_type="SPPS",
+            failed_shaded_views={"FRT": uri, "BLB": ""}, final_shaded_views={"FRT": uri}
+        )
+        msps = apps.get_model("data_miner", "HistoryData_MSPS").objects.create(
+            os_user_id="user-1", question_id=2, question_type="MSPS",
+            step_shaded_views=[{"FRT": uri}, {"FRT": uri, "BLB": uri}]
+        )
+        migrate()
+
+        self.assertEqual(
+            sorted(ShadedViewHash.objects.values_list("record_id", "kind", "step", "view")),
+            sorted([
+                (record.pk, ShadedViewHash.FAILED, None, "FRT"), (record.pk, ShadedViewHash.FINAL, None, "FRT"),
+                (msps.pk, ShadedViewHash.STEP, 0, "FRT"), (msps.pk, ShadedViewHash.STEP, 1, "FRT"),
+                (msps.pk, ShadedViewHash.STEP, 1, "BLB")
+            ])
+        )
+        self.assertEqual(set(ShadedViewHash.objects.values_list("phash", flat=True)), {perceptual_hash(uri)[0]})
+        self.assertEqual(ShadedViewHash.similar_records(1, uri, kind=ShadedViewHash.FAILED), [record.pk])
+
+
+class ArtifactTests(TestCase):
+    """ Collected artifacts are stored once by content and resolved from their references
+    """
+    def test_images_are_stored_once(self):
+        uri = png_uri(128)
+        refs = Artifact.store_images({"FRT": uri, "BLB": uri})
+        self.assertTrue(refs["FRT"].startswith(Artifact.REF_PREFIX))
+        self.assertEqual(refs["FRT"], refs["BLB"])
+        self.assertEqual(Artifact.objects.count(), 1)
+        self.assertEqual(Artifact.resolve_images(refs), {"FRT": uri, "BLB": uri})
+
+    def test_json_documents_are_stored_canonically(self):
+        ref = Artifact.store_json({"features": [{"featureType": "extrude"}], "b": 1})
+        self.assertEqual(ref, Artifact.store_json({"b": 1, "features": [{"featureType": "extrude"}]}))
+        self.assertEqual(Artifact.store_json(ref), ref)
+        self.assertEqual(Artifact.resolve(ref), {"b": 1, "features": [{"featureType": "extrude"}]})
+        self.assertIsNone(Artifact.store_json(None))
+
+    def test_values_stored_before_are_passed_through(self):
+        for value in [png_uri(0), "", None, {"features": []}, [1, 2]]:
+            self.assertEqual(Artifact.resolve(value), value)
+        self.assertEqual(Artifact.store_image(""), "")
+
+    def test_views_are_indexed_after_dedupe(self):
+        uri = png_uri(0, (8, 8, 40, 40))
+        record = create_record()
+        HistoryData_PS.objects.filter(pk=record.pk).update(
+            failed_shaded_views={"FRT": uri, "BLB": ""}, final_shaded_views={"FRT": uri}
+        )
+        call_command("dedupe_artifacts", stdout=io.StringIO())
+        self.assertTrue(HistoryData_PS.objects.get(pk=record.pk).final_shaded_views["FRT"].startswith("sha256:"))
+        call_command("index_shaded_views", stdout=io.StringIO())
+        self.assertEqual(
+            set(ShadedViewHash.objects.values_list("kind", "phash")),
+            {(ShadedViewHash.FAILED, perceptual_hash(uri)[0]), (ShadedViewHash.FINAL, perceptual_hash(uri)[0])}
+        )
+        self.assertEqual(ShadedViewHash.similar_records(1, Artifact.store_image(uri)), [record.pk])
@@ -1,9 +1,8 @@
 import io 
 import base64
-from typing import List, Dict 
-from datetime import datetime
+from typing import List, Dict, Tuple 
+from datetime import datetime, date
 import numpy as np 
-from PIL import Image
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_agg import FigureCanvasAgg
 import requests
@@ -13,11 +12,14 @@ import django_rq
 from django.shortcuts import render
 from django.http import HttpRequest, HttpResponse
 from django.utils import timezone
-from django.db.models import QuerySet
+from django.db.models import QuerySet, Count, Max
+from django.db.models.functions import TruncDate
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.cache import cache
+from django.conf import settings
 
-from .models import HistoryData, HistoryData_PS, HistoryData_AS, HistoryData_MSPS
-from questioner.models import AuthUser, Question, QuestionType, Question_MSPS, ElementType
+from .models import HistoryData, HistoryData_PS, HistoryData_AS, HistoryData_MSPS, QuestionAnalytics, ShadedViewHash, Artifact, hamming_distances
+from questioner.models import AuthUser, Question, QuestionType, Question_MSPS, ElementType, CompletionRecord, FailureRecord, question_cards
 
 
 # Create your views here.
@@ -28,6 +30,9 @@ D_Type_Dict = {
     QuestionType.MULTI_STEP_PS: HistoryData_MSPS
 }
 
+# Max. Hamming distance between perceptual hashes of shaded views of the same final model 
+SHADED_VIEW_HASH_THRESHOLD = 5 
+
 
 ######################## Data Presentation ########################
 def convert_plot_to_str(plot) -> str: 
@@ -41,134 +46,113 @@ def convert_plot_to_str(plot) -> str:
     return "data:image/png;base64," + str(img_data)[2:-1]
 
 
-def calc_time_spent(
-    q_records: QuerySet[D_Type_Dict.values()], qid: int, all: bool, 
-    is_final_failure=False, all_success=False, has_failed_attempts=False
-) -> List[float]: 
+def daily_attempt_counts(q_records: QuerySet) -> List[Tuple[date, int]]: 
     """
-    Given a ``question_id`` for a :model:`questioner.Question` object, return a list of the time spent by all user attempts on the question in minutes 
-    
-    **Arguments:** 
-    
-    - ``all``: if True, time spent of all attempts are returned, and other trailing arguments are ignored 
-    - ``is_final_failure``: True if filter by successful attempts only; False otherwise 
-    - ``all_success``: True if filter by all successful attempts; False to consider ``has_failed_attempts`` 
-    - ``has_failed_attempts``: if True, no failed submissions are recorded; i.e., got the question right at the first attempt (not available for multi-step questions)
+    Number of attempts in ``q_records`` started on every date, counted per day in SQL, ordered by date; attempts without a start time are left out 
     """
-    if all: 
-        temp_set = q_records.filter(
-            time_of_completion__isnull=False
-        )
-    elif is_final_failure: 
-        temp_set = q_records.filter(
-            time_of_completion__isnull=False, is_final_failure=True
-        )
-    elif all_success: 
-        temp_set = q_records.filter(is_final_failure=False)
-    elif has_failed_attempts: 
-        temp_set = q_records.filter(
-            is_final_failure=False, first_failed_time__isnull=False
-        )
-    else: 
-        temp_set = q_records.filter(
-            is_final_failure=False, first_failed_time__isnull=True
-        )
-    all_times = [] 
-    for entry in temp_set: 
-        curr_time = (entry.time_of_completion - entry.start_time).total_seconds() 
-        if curr_time <= 4000: 
-            all_times.append(curr_time / 60) # in minutes 
-    return all_times
+    return list(q_records.filter(start_time__isnull=False).annotate(
+        date=TruncDate("start_time")
+    ).order_by("date").values("date").annotate(cnt=Count("pk")).values_list("date", "cnt"))
 
 
-def calc_feature_cnt(q_records: QuerySet[D_Type_Dict.values()], qid: int) -> List[int]: 
+def cumulative_attempts_plot(q_records: QuerySet, figsize=(10, 6)) -> str: 
     """
-    Given a ``question_id`` for a :model:`questioner.Question` object, return a list of the number of features used for all user attempts on the question 
+    Plot the cumulative number of attempts in ``q_records`` by date (see :func:`daily_attempt_counts`), and return the plot as a string from :func:`convert_plot_to_str` 
     """
-    que = Question.objects.get(question_id=qid)
-    temp_cnt = [] 
-    if que.question_type == QuestionType.MULTI_STEP_PS: 
-        records = q_records.filter(is_final_failure=False)
-        for entry in records: 
-            if entry.step_feature_lists:
-                temp_cnt.append(
-                    len(entry.step_feature_lists[-1]['features'])
-                )
-    elif que.allowed_etype == ElementType.PARTSTUDIO: 
-        records = q_records.filter(is_final_failure=False)
-        for entry in records: 
-            if entry.final_feature_list: 
-                temp_cnt.append(
-                    len(entry.final_feature_list['features'])
-                )
-    else: # que.allowed_etype == ElementType.ASSEMBLY 
-        records = q_records.filter(is_final_failure=False)
-        for entry in records: 
-            if entry.final_assembly_def: 
-                temp_cnt.append(
-                    len(entry.final_assembly_def['rootAssembly']['features']) + 
-                    sum([len(subass['features']) for subass in entry.final_assembly_def['subAssemblies']])
-                )
-    return temp_cnt
+    daily_cnt = daily_attempt_counts(q_records)
+    dates, cnts = zip(*daily_cnt) if daily_cnt else ((), ())
     
+    cum_cnt_plot = Figure(figsize=figsize)
+    ax = cum_cnt_plot.add_subplot(1, 1, 1)
+    ax.step(dates, np.cumsum(cnts), where="post")
+    for label in ax.get_xticklabels():
+        label.set(rotation=90)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Cumulative Number of Question Attempts")
+    cum_cnt_plot.tight_layout() 
+    return convert_plot_to_str(cum_cnt_plot)
+
+
+def question_analytics(all_ques: List[Question]) -> List[QuestionAnalytics]: 
+    """
+    Get the :model:`data_miner.QuestionAnalytics` summary of every question in ``all_ques`` in one query, with empty summaries for questions without collected data 
+    """
+    summaries = QuestionAnalytics.objects.in_bulk([q.question_id for q in all_ques])
+    return [
+        summaries.get(q.question_id, QuestionAnalytics(question_id=q.question_id)) 
+        for q in all_ques
+    ]
+
+
+def cluster_by_error(err_mat: np.ndarray, threshold: float) -> List[List[int]]: 
+    """
+    Cluster images given their pairwise errors (e.g., Hamming distances between hashes): the image with the most unclustered neighbours (error within ``threshold``) is taken as the centre of the next cluster together with these neighbours, until all images are clustered. Clusters are returned from the largest, with the centre first. 
+    """
+    adjacency = err_mat <= threshold 
+    unclustered = np.ones(len(err_mat), dtype=bool)
+    clusters = [] 
+    while unclustered.any(): 
+        neighbour_cnts = adjacency[:, unclustered].sum(axis=1)
+        neighbour_cnts[~unclustered] = -1 
+        centre = int(np.argmax(neighbour_cnts))
+        members = np.flatnonzero(adjacency[centre] & unclustered)
+        members = [centre] + [int(i) for i in members if i != centre]
+        clusters.append(members)
+        unclustered[members] = False 
+    return clusters 
+
+
+def shaded_view_of(record: HistoryData, select_img: str) -> str: 
+    """ The shaded view of the final model of a record """
+    if isinstance(record, HistoryData_MSPS): 
+        return Artifact.resolve(record.step_shaded_views[-1][select_img])
+    return Artifact.resolve(record.final_shaded_views[select_img])
+
 
 def shaded_view_cluster(
     q_records: QuerySet[D_Type_Dict.values()], qid: int, select_img="FRT"
 ) -> str: 
     """
-    Given a ``question_id`` for a :model:`questioner.Question` object, this function analyze all the captured shaded view images of the final workspace. This function automatically clusters all the images based on the similarity (MSE difference) between images. 
+    Given a ``question_id`` for a :model:`questioner.Question` object, this function analyze all the captured shaded view images of the final workspace. This function automatically clusters all the images based on the similarity (Hamming distance) between their perceptual hashes (:model:`data_miner.ShadedViewHash`). 
     
-    A formatted table presenting the clustering results is returned. 
+    A formatted table presenting the clustering results is returned. The clusters are cached per question until views are hashed or removed. 
     
     ``select_img``: ``"FRT"`` or ``"BLB"`` 
     """
-    def image_error(img1, img2):
-        """ Calculate the mean squared error (MSE) between two images """
-        def readb64_img(uri: str):
-            """ Clean the raw image from html format """
-            encoded_data = uri.split(',')[1]
-            base64_decoded = base64.b64decode(encoded_data)
-            image = Image.open(io.BytesIO(base64_decoded))
-            image = image.convert("L") # convert the images to grayscale
-            return np.array(image)
-    
-        # load the input images
-        img1 = readb64_img(img1)
-        img2 = readb64_img(img2)
-        # Compute MSE between two images
-        h, w = img1.shape
-        diff = np.subtract(img1, img2)
-        err = np.sum(diff**2)
-        mse = err/(float(h*w))
-        return mse, diff
+    # Get the hashes of the views of the final models 
+    view_hashes = ShadedViewHash.objects.filter(
+        record__in=q_records.values("pk"), view=select_img
+    )
+    if q_records.model is HistoryData_MSPS: 
+        total_steps = Question_MSPS.objects.get(question_id=qid).total_steps
+        view_hashes = view_hashes.filter(kind=ShadedViewHash.STEP, step=total_steps - 1)
+    else: 
+        view_hashes = view_hashes.filter(kind=ShadedViewHash.FINAL)
+    # Hashes are only added (or replaced with new ones), so their number and 
+    # last ID identify the hashed views 
+    hashes_state = view_hashes.aggregate(cnt=Count("pk"), last_id=Max("pk"))
+    cache_key = "shaded-view-clusters:{}:{}:{}:{}".format(
+        qid, select_img, hashes_state["cnt"], hashes_state["last_id"] or 0
+    )
+    clusters = cache.get(cache_key)
+    
+    if clusters is None: 
+        view_hashes = list(view_hashes.values_list("record_id", "phash"))
+        record_ids, phashes = zip(*view_hashes) if view_hashes else ((), ())
         
-    # Get all images for the question 
-    imgs = [] 
-    q_type = Question.objects.get(question_id=qid).question_type
-    for entry in q_records: 
-        if q_type == QuestionType.MULTI_STEP_PS: 
-            if len(entry.step_shaded_views) == Question_MSPS.objects.get(question_id=qid).total_steps: 
-                imgs.append(entry.step_shaded_views[-1][select_img])
-        else: 
-            if entry.final_shaded_views: 
-                imgs.append(entry.final_shaded_views[select_img])
-    # Calculate MSE between images 
-    err_mat = np.identity(len(imgs))
-    for i in range(len(imgs)): 
-        for j in range(i + 1, len(imgs)): 
-            err_mat[i][j] = image_error(imgs[i], imgs[j])[0]
-    # Cluster images based on MSE values 
-    imgs_ind = list(range(len(imgs))) 
-    clusters = [] 
-    while imgs_ind: 
-        curr_ind = imgs_ind.pop(0)
-        clusters.append([curr_ind])
-        curr_cluster_size = len(clusters)
-        for item in imgs_ind.copy(): 
-            if err_mat[curr_ind][item] <= 15: 
-                imgs_ind.remove(item)
-                clusters[curr_cluster_size-1].append(item)
-    clusters.sort(key=lambda x:len(x), reverse=True)
+        # Cluster images based on Hamming distances 
+        clusters = cluster_by_error(
+            hamming_distances(np.array(phashes), np.array(phashes)), SHADED_VIEW_HASH_THRESHOLD
+        ) if view_hashes else [] 
+        
+        # Only the views at the cluster centres are loaded 
+        centres = q_records.in_bulk([record_ids[cluster[0]] for cluster in clusters])
+        clusters = [
+            (shaded_view_of(centres[record_ids[cluster[0]]], select_img), len(cluster)) 
+            for cluster in clusters
+        ]
+        cache.set(cache_key, clusters, settings.ANALYTICS_CACHE_TTL)
+    
     # Format results to be returned 
     result = '''
     <table>
@@ -178,76 +162,17 @@ def shaded_view_cluster(
             <th>Number of Successful Attempts with the Same View</th>
         </tr>
     '''
-    for i, cluster in enumerate(clusters): 
-        # if len(cluster) == 1: 
-        #     result += f'''
-        #     <tr>
-        #         <td>{i+1}</td>
-        #         <td>Others</td>
-        #         <td>{len(clusters) - i}</td>
-        #     </tr>
-        #     '''
-        #     break 
+    for i, (img, cluster_size) in enumerate(clusters): 
         result += f'''
         <tr>
             <td>{i+1}</td>
-            <td><img src="{imgs[cluster[0]]}" alt=""/></td>
-            <td>{len(cluster)}</td>
+            <td><img src="{img}" alt=""/></td>
+            <td>{cluster_size}</td>
         </tr>
         '''
     return result + "</table>"
 
 
-def get_feature_counts(
-    q_records: QuerySet[D_Type_Dict.values()], qid: int
-) -> Dict[str, int]: 
-    """
-    Given a ``question_id`` for a :model:`questioner.Question` object, return a dictionary of the features used and the average counts of features used per user attempt on the question 
-    """
-    feature_cnts = {} 
-    que = Question.objects.get(question_id=qid)
-    if que.question_type == QuestionType.MULTI_STEP_PS: 
-        total_steps = Question_MSPS.objects.get(question_id=qid).total_steps
-        for entry in q_records: 
-            if len(entry.step_feature_lists) == total_steps: 
-                for fea in entry.step_feature_lists[-1]['features']: 
-                    if fea['featureType'] not in feature_cnts: 
-                        feature_cnts[fea['featureType']] = 0 
-                    feature_cnts[fea['featureType']] += 1 
-    elif que.allowed_etype == ElementType.PARTSTUDIO: 
-        for entry in q_records: 
-            if entry.final_feature_list: 
-                for fea in entry.final_feature_list['features']: 
-                    if fea['featureType'] not in feature_cnts: 
-                        feature_cnts[fea['featureType']] = 0 
-                    feature_cnts[fea['featureType']] += 1 
-    else: # Assembly 
-        for entry in q_records: 
-            if entry.final_assembly_def: 
-                for fea in entry.final_assembly_def['rootAssembly']['features']: 
-                    if fea['featureType'] != 'mate': 
-                        fea_type = fea['featureType']
-                    else: 
-                        fea_type = fea['featureData']['mateType']
-                    if fea_type not in feature_cnts: 
-                        feature_cnts[fea_type] = 0 
-                    feature_cnts[fea_type] += 1 
-                for subass in entry.final_assembly_def['subAssemblies']: 
-                    for fea in subass['features']: 
-                        if fea['featureType'] != 'mate': 
-                            fea_type = fea['featureType']
-                        else: 
-                            fea_type = fea['featureData']['mateType']
-                        if fea_type not in feature_cnts: 
-                            feature_cnts[fea_type] = 0 
-                        feature_cnts[fea_type] += 1 
-    
-    num_attempts = len(q_records)
-    for key, item in feature_cnts.items(): 
-        feature_cnts[key] = round(item / num_attempts, 2)
-    return feature_cnts 
-
-
 def dashboard(request: HttpRequest): 
     """
     This view provides a dashboard of analytics to present some basic statistics of the collected user data 
@@ -259,15 +184,14 @@ def dashboard(request: HttpRequest):
     context = {} 
     
     # Buttons for detailed views 
-    all_ques = Question.objects.filter(is_published=True)
-    context['all_questions'] = sorted(all_ques, key=lambda x:x.question_name)
+    context['all_questions'] = question_cards(published_only=True)
     
     # Simple counting 
-    all_records = HistoryData.objects.all() 
-    context['all_records'] = all_records
-    context['attempt_total'] = len(all_records)
-    context['user_attempt_total'] = len(all_records.values('os_user_id').distinct())
-    context['user_login_total'] = len(AuthUser.objects.all())
+    context.update(HistoryData.objects.aggregate(
+        attempt_total=Count("pk"), 
+        user_attempt_total=Count("os_user_id", distinct=True)
+    ))
+    context['user_login_total'] = AuthUser.objects.count() 
     
     return render(request, "data_miner/dashboard.html", context=context)
 
@@ -276,19 +200,7 @@ def cumulative_question_attempts(request: HttpRequest):
     This AJAX view for creating a cumulative attempt plot
     """
     context = {} 
-
-    all_records = HistoryData.objects.all() 
-    
-    temp = sorted(all_records, key=lambda x:x.start_time)
-    cum_cnt_plot = Figure(figsize=(10, 6))
-    ax = cum_cnt_plot.add_subplot(1, 1, 1)
-    ax.plot([e.start_time for e in temp], [i + 1 for i in range(len(temp))])
-    for label in ax.get_xticklabels():
-        label.set(rotation=90)
-    ax.set_xlabel("Date")
-    ax.set_ylabel("Cumulative Number of Question Attempts")
-    cum_cnt_plot.tight_layout() 
-    context['cum_attempt_cnt'] = convert_plot_to_str(cum_cnt_plot)
+    context['cum_attempt_cnt'] = cumulative_attempts_plot(HistoryData.objects.all())
 
     return HttpResponse(
         json.dumps(context),
@@ -305,16 +217,12 @@ def succ_fail_cnt(request: HttpRequest):
     """
     context = {} 
 
-    all_ques = Question.objects.filter(is_published=True)
-    all_ques = sorted(all_ques, key=lambda x:x.question_name)
+    all_ques = list(question_cards(published_only=True))
+    summaries = question_analytics(all_ques)
 
     x = np.arange(len(all_ques))
-    y_succ = np.zeros(len(all_ques)) 
-    y_fail = np.zeros(len(all_ques)) 
-    for i, qid in enumerate([q.question_id for q in all_ques]): 
-        temp = HistoryData.objects.filter(question_id=qid)
-        y_succ[i] = len(temp.filter(is_final_failure=False))
-        y_fail[i] = len(temp) - y_succ[i]
+    y_succ = np.array([summary.succ_cnt for summary in summaries]) 
+    y_fail = np.array([summary.attempt_cnt for summary in summaries]) - y_succ 
     
     fig_cnt_bar = Figure(figsize=(10, 6)) 
     ax = fig_cnt_bar.add_subplot(1, 1, 1)
@@ -347,17 +255,11 @@ def time_distribution(request: HttpRequest):
     """
     context = {} 
 
-    all_ques = Question.objects.filter(is_published=True)
-    all_ques = sorted(all_ques, key=lambda x:x.question_name)
+    all_ques = list(question_cards(published_only=True))
 
     y_time = [
-        calc_time_spent(
-            D_Type_Dict[q.question_type].objects.filter(
-                question_id=q.question_id, is_final_failure=False
-            ), 
-            q.question_id, all=True
-        ) 
-        for q in all_ques
+        summary.get_time_spent("direct", "indirect") 
+        for summary in question_analytics(all_ques)
     ]
     fig_time_dist = Figure(figsize=(10, 6)) 
     ax = fig_time_dist.add_subplot(1, 1, 1)
@@ -387,17 +289,11 @@ def feature_count(request: HttpRequest):
     """
     context = {} 
 
-    all_ques = Question.objects.filter(is_published=True)
-    all_ques = sorted(all_ques, key=lambda x:x.question_name)
+    all_ques = list(question_cards(published_only=True))
 
     y_cnt = [
-        calc_feature_cnt(
-            D_Type_Dict[q.question_type].objects.filter(
-                question_id=q.question_id, is_final_failure=False 
-            ), 
-            q.question_id
-        ) 
-        for q in all_ques
+        summary.get_feature_cnts() 
+        for summary in question_analytics(all_ques)
     ] 
     fea_use_dist = Figure(figsize=(10, 6)) 
     ax = fea_use_dist.add_subplot(1, 1, 1)
@@ -431,16 +327,16 @@ def dashboard_question(request: HttpRequest, qid: int):
     """
     question = Question.objects.get(question_id=qid)
     q_records = D_Type_Dict[question.question_type].objects.filter(question_id=qid)
+    summary = question_analytics([question])[0]
     
     context = {
         "question": question, 
-        "attempt_total": len(q_records)
+        "attempt_total": summary.attempt_cnt 
     }
     
     # General counts for the question 
     context['additional_counts'] = ""
     if question.question_type == QuestionType.MULTI_STEP_PS: 
-        total_steps = Question_MSPS.objects.get(question_id=qid).total_steps
         context['additional_counts'] += '''
         <div class="box">
             Successful Full Attempts (completed last step): &nbsp<b>{}</b>
@@ -448,16 +344,7 @@ def dashboard_question(request: HttpRequest, qid: int):
         <div class="box">
             Successful Partial Attempts (before reaching last step): &nbsp<b>{}</b>
         </div>
-        '''.format(
-            sum([
-                1 if len(entry.step_completion_time) == total_steps else 0 
-                for entry in q_records
-            ]), 
-            sum([
-                1 if entry.step_completion_time and len(entry.step_completion_time) < total_steps else 0 
-                for entry in q_records
-            ])
-        )
+        '''.format(summary.direct_succ_cnt, summary.partial_cnt)
     else: 
         context['additional_counts'] += '''
         <div class="box">
@@ -473,35 +360,16 @@ def dashboard_question(request: HttpRequest, qid: int):
             Failed Attempts without Give Up: &nbsp<b>{}</b>
         </div>
         '''.format(
-            len(q_records.filter(
-                is_final_failure=False, first_failed_time__isnull=True
-            )), 
-            len(q_records.filter(
-                is_final_failure=False, first_failed_time__isnull=False 
-            )), 
-            len(q_records.filter(
-                is_final_failure=True, time_of_completion__isnull=False
-            )), 
-            len(q_records.filter(
-                time_of_completion__isnull=True, first_failed_time__isnull=False 
-            ))
+            summary.direct_succ_cnt, summary.indirect_succ_cnt, 
+            summary.give_up_cnt, summary.no_give_up_cnt 
         )
     
     context['additional_plots'] = ""
     # Cumulative number of question attempts 
-    temp = sorted(q_records, key=lambda x:x.start_time)
-    cum_cnt_plot = Figure(figsize=(6, 4))
-    ax = cum_cnt_plot.add_subplot(1, 1, 1)
-    ax.plot([e.start_time for e in temp], [i + 1 for i in range(len(temp))])
-    for label in ax.get_xticklabels():
-        label.set(rotation=90)
-    ax.set_xlabel("Date")
-    ax.set_ylabel("Cumulative Number of Question Attempts")
-    cum_cnt_plot.tight_layout() 
-    context['cum_attempt_cnt'] = convert_plot_to_str(cum_cnt_plot)
+    context['cum_attempt_cnt'] = cumulative_attempts_plot(q_records, figsize=(6, 4))
     
     # Time spent distribution of the question 
-    y_time = calc_time_spent(q_records, qid, all=True)
+    y_time = summary.get_time_spent("direct", "indirect", "give_up")
     time_dist = Figure(figsize=(6, 4)) 
     ax = time_dist.add_subplot(1, 1, 1)
     ax.hist(y_time)
@@ -512,22 +380,7 @@ def dashboard_question(request: HttpRequest, qid: int):
     
     # Time spent comparison of different outcomes of the question 
     if question.question_type == QuestionType.MULTI_STEP_PS: 
-        total_steps = Question_MSPS.objects.get(question_id=qid).total_steps
-        records = HistoryData_MSPS.objects.filter(step_completion_time__isnull=False)
-        step_time = [[] for _ in range(total_steps)]
-        for entry in records: 
-            for i, t in enumerate(entry.step_completion_time): 
-                if i == 0: 
-                    step_time[i].append(
-                        (datetime.fromisoformat(t) - entry.start_time.replace(tzinfo=None)).total_seconds() / 60
-                    )
-                else: 
-                    step_time[i].append(
-                        (datetime.fromisoformat(t) - datetime.fromisoformat(
-                            entry.step_completion_time[i-1]
-                        )).total_seconds() / 60 
-                    )
-                    
+        step_time = summary.get_step_time_spent() 
         fig_time_compare = Figure(figsize=(6, 4))
         ax = fig_time_compare.add_subplot(1, 1, 1)
         ax.boxplot(step_time, positions=np.arange(len(step_time)))
@@ -538,13 +391,9 @@ def dashboard_question(request: HttpRequest, qid: int):
         fig_time_compare.tight_layout()
         context['time_spent_comparison'] = convert_plot_to_str(fig_time_compare)
     else: 
-        direct_succ = calc_time_spent(
-            q_records, qid, all=False, is_final_failure=False, has_failed_attempts=False
-        )
-        indirect_succ = calc_time_spent(
-            q_records, qid, all=False, is_final_failure=False, has_failed_attempts=True
-        )
-        failure = calc_time_spent(q_records, qid, all=False, is_final_failure=True)
+        direct_succ = summary.get_time_spent("direct")
+        indirect_succ = summary.get_time_spent("indirect")
+        failure = summary.get_time_spent("give_up")
         
         fig_time_compare = Figure(figsize=(6, 4))
         ax = fig_time_compare.add_subplot(1, 1, 1)
@@ -561,9 +410,7 @@ def dashboard_question(request: HttpRequest, qid: int):
         context['time_spent_comparison'] = convert_plot_to_str(fig_time_compare)
     
     # Feature counts of the question 
-    fea_cnt = calc_feature_cnt(
-        q_records.filter(is_final_failure=False), qid
-    )
+    fea_cnt = summary.get_feature_cnts() 
     fea_dist = Figure(figsize=(6, 4))
     ax = fea_dist.add_subplot(1, 1, 1)
     ax.hist(fea_cnt)
@@ -573,15 +420,15 @@ def dashboard_question(request: HttpRequest, qid: int):
     context['feature_cnt'] = convert_plot_to_str(fea_dist) 
     
     # Cluster final screen capture of the workspace 
-    if Question.objects.get(question_id=qid).allowed_etype == ElementType.PARTSTUDIO: 
-        if len(HistoryData.objects.filter(question_id=qid)) >= 1: 
+    if question.allowed_etype == ElementType.PARTSTUDIO: 
+        if context["attempt_total"] >= 1: 
             context['additional_plots'] += shaded_view_cluster(
                 q_records.filter(is_final_failure=False), qid
             )
             
     # Average count of features used per user in the question 
-    if len(HistoryData.objects.filter(question_id=qid)) >= 5: 
-        fea_cnts = get_feature_counts(q_records, qid)
+    if context["attempt_total"] >= 5: 
+        fea_cnts = summary.get_avg_feature_types() 
         fea_cnt_table = '''
         <table>
             <tr>
@@ -652,15 +499,17 @@ def collect_final_data(user: AuthUser, is_failure: bool) -> None:
             )) + 1
         )
 
-    q_name = user.curr_question_type + "_" + str(user.curr_question_id)
-
-    # history_data: Tuple[completion_datetime, time_taken, ...]
+    # Time of the attempt just recorded 
     if not is_failure: 
-        attempt_data = user.completed_history[q_name][-1] 
+        attempt = CompletionRecord.objects.filter(
+            user=user, question_id=user.curr_question_id
+        ).latest("pk").completed_at 
     else: 
-        attempt_data = user.failure_history[q_name][-1] 
+        attempt = FailureRecord.objects.filter(
+            user=user, question_id=user.curr_question_id
+        ).latest("pk").failed_at 
     data_entry.is_final_failure = is_failure
-    data_entry.time_of_completion = datetime.fromisoformat(attempt_data[0])
+    data_entry.time_of_completion = attempt 
     data_entry.save() 
     
     # Initiate final submission data record 
@@ -711,10 +560,9 @@ def collect_multi_step_data(user: AuthUser) -> None:
         question_id=user.curr_question_id
     ).total_steps: 
         data_entry.is_final_failure = False 
-        q_name = user.curr_question_type + "_" + str(user.curr_question_id)
-        data_entry.time_of_completion = datetime.fromisoformat(
-            user.completed_history[q_name][-1][0]
-        )
+        data_entry.time_of_completion = CompletionRecord.objects.filter(
+            user=user, question_id=user.curr_question_id
+        ).latest("pk").completed_at 
         data_entry.save() 
         django_rq.enqueue(data_entry.collect_data, args=[user, query_info, True])
     else: 
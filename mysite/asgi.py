@@ -3,6 +3,21 @@ ASGI config for mysite project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The Onshape-bound views of the questioner app (login, authorize, model, 
+check_model, solution and complete) are async views, so one ASGI worker can 
+keep many Onshape API calls in flight at the same time over the pooled 
+connections of its event loop. The app is served through ASGI (as the ``web`` 
+process type in the Procfile): 
+
+    gunicorn mysite.asgi:application -k uvicorn.workers.UvicornWorker
+
+or, for development: 
+
+    uvicorn mysite.asgi:application --reload
+
+Served through WSGI instead, every async view runs on a new event loop, so 
+its Onshape API calls cannot reuse the pooled connections. 
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
 """
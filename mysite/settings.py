@@ -139,6 +139,37 @@ if not IS_HEROKU:
     for queueConfig in RQ_QUEUES.values(): 
         queueConfig['ASYNC'] = False
 
+# Evaluate submitted models on the 'high' RQ queue instead of in the web worker 
+ASYNC_EVALUATION = os.getenv('ASYNC_EVALUATION', 'True') == 'True'
+
+# Onshape API client (see questioner/onshape.py) 
+# Timeouts are in seconds; the pool size is the max number of kept-alive 
+# connections per host in every process 
+ONSHAPE_CONNECT_TIMEOUT = float(os.getenv('ONSHAPE_CONNECT_TIMEOUT', 5))
+ONSHAPE_READ_TIMEOUT = float(os.getenv('ONSHAPE_READ_TIMEOUT', 60))
+ONSHAPE_POOL_SIZE = int(os.getenv('ONSHAPE_POOL_SIZE', 10))
+# Max number of concurrent connections of the async client of an ASGI worker 
+ONSHAPE_ASYNC_POOL_SIZE = int(os.getenv('ONSHAPE_ASYNC_POOL_SIZE', 200))
+# Issue independent API calls (e.g., of a submission evaluation) concurrently, 
+# all of which have to complete within the deadline (in seconds) 
+ONSHAPE_CONCURRENT_CALLS = os.getenv('ONSHAPE_CONCURRENT_CALLS', 'True') == 'True'
+ONSHAPE_FETCH_DEADLINE = float(os.getenv('ONSHAPE_FETCH_DEADLINE', 90))
+# Max number of concurrent API calls for the same user across all processes 
+# (e.g., of the data collection jobs of a submission), counted in the cache 
+ONSHAPE_USER_CONCURRENCY = int(os.getenv('ONSHAPE_USER_CONCURRENCY', 4))
+
+# OAuth tokens 
+# Max time (in seconds) a token refresh may hold the per-user lock, during 
+# which concurrent refreshes of the same user wait for and reuse its result 
+OAUTH_REFRESH_LOCK_TIMEOUT = int(os.getenv('OAUTH_REFRESH_LOCK_TIMEOUT', 30))
+# A periodic RQ job renews the tokens of active users (and the main admins) 
+# expiring within the renewal window, running every interval (in seconds) 
+OAUTH_RENEWAL_WINDOW = int(os.getenv('OAUTH_RENEWAL_WINDOW', 25 * 60))
+OAUTH_RENEWAL_INTERVAL = int(os.getenv('OAUTH_RENEWAL_INTERVAL', 5 * 60))
+# The admin token used for question management is cached until this many 
+# seconds before it expires 
+ADMIN_TOKEN_MARGIN = int(os.getenv('ADMIN_TOKEN_MARGIN', 10 * 60))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -223,4 +254,40 @@ CACHES = {
                 "ssl_cert_reqs": None
         }
     }
-}
\ No newline at end of file
+}
+
+# Fall back to a local memory cache for development without Redis 
+if 'REDIS_URL' not in os.environ: 
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+    }
+
+# Time (in seconds) a failed evaluation of a submitted microversion is cached 
+EVALUATION_CACHE_TTL = 60 * 60
+
+# Rendered completion histograms are cached by the number of completions 
+HISTOGRAM_CACHE_TTL = 7 * 24 * 60 * 60
+
+# The dashboard summary of a user is cached, and invalidated on completion 
+DASHBOARD_CACHE_TTL = 10 * 60
+
+# Rendered certificates and the users' Onshape names shown on them are cached 
+CERTIFICATE_CACHE_TTL = 7 * 24 * 60 * 60
+USER_NAME_CACHE_TTL = 24 * 60 * 60
+
+# Snapshots of the question catalog are cached by version, which is bumped 
+# whenever questions or certificates change 
+CATALOG_CACHE_TTL = 24 * 60 * 60
+# The completion counters and average times shown with the catalog change with 
+# every completion, so they are cached separately for a short time 
+COMPLETION_COUNTER_CACHE_TTL = 60
+
+# The public home page (without login information) is cached as a whole 
+HOME_CACHE_TTL = 60 * 60
+
+# Clusters of the shaded views of a question are cached until its records change 
+ANALYTICS_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Max number of data entries collected for every question; identical collected 
+# artifacts (shaded views, meshes, feature lists) are only stored once 
+DATA_MAX_ENTRIES_PER_QUESTION = int(os.getenv('DATA_MAX_ENTRIES_PER_QUESTION', '250'))
@@ -42,7 +42,7 @@ class Certificate_Admin(admin.ModelAdmin):
         'certificate_name', 'required_challenges', 'is_published'
     ] 
     search_fields = ['certificate_name']
-    exclude = ['drawing_jpeg']
+    exclude = ['drawing_jpeg', 'drawing_etag']
     actions = ['force_update','publish_certificate']
 
     @admin.action(description="Force update selected certificate")
@@ -77,7 +77,10 @@ class Questions_SPPS_Admin(admin.ModelAdmin):
         'is_published', 'completion_count', 'reviewer_completion_count', 
         'is_multi_step', 'is_collecting_data'
     ]
-    exclude = ['thumbnail', 'completion_time', 'completion_feature_cnt', 'drawing_jpeg']
+    exclude = [
+        'thumbnail', 'completion_stats', 'drawing_jpeg', 
+        'thumbnail_etag', 'drawing_etag'
+    ]
     search_fields = ['question_name', '__str__']
     actions = ['publish_question', 'force_update', 'change_collect_status']
 
@@ -116,7 +119,10 @@ class Questions_MPPS_Admin(admin.ModelAdmin):
         'model_name', 'is_published', 'completion_count', 'reviewer_completion_count', 
         'is_multi_step', 'is_collecting_data'
     ]
-    exclude = ['thumbnail', 'completion_time', 'completion_feature_cnt', 'drawing_jpeg']
+    exclude = [
+        'thumbnail', 'completion_stats', 'drawing_jpeg', 
+        'thumbnail_etag', 'drawing_etag'
+    ]
     search_fields = ['question_name', '__str__']
     actions = ['publish_question', 'force_update', 'change_collect_status']
 
@@ -155,7 +161,10 @@ class Questions_ASMB_Admin(admin.ModelAdmin):
         'is_published', 'completion_count', 'reviewer_completion_count', 
         'is_multi_step', 'is_collecting_data'
     ]
-    exclude = ['thumbnail', 'completion_time', 'completion_feature_cnt', 'drawing_jpeg']
+    exclude = [
+        'thumbnail', 'completion_stats', 'drawing_jpeg', 
+        'thumbnail_etag', 'drawing_etag'
+    ]
     search_fields = ['question_name', '__str__']
     actions = ['publish_question', 'force_update', 'change_collect_status']
 
@@ -189,7 +198,7 @@ class PS_Steps(admin.StackedInline):
     readonly_fields = [
         'mid', 'model_mass', 'model_volume', 'model_SA', 'model_inertia', 'model_name'
     ]
-    exclude = ['drawing_jpeg']
+    exclude = ['drawing_jpeg', 'drawing_etag']
 
 
 class Questions_MSPS_Admin(admin.ModelAdmin): 
@@ -203,7 +212,10 @@ class Questions_MSPS_Admin(admin.ModelAdmin):
         'is_published', 'completion_count', 'reviewer_completion_count', 
         'is_multi_step', 'is_collecting_data', 'total_steps'
     ]
-    exclude = ['thumbnail', 'completion_time', 'completion_feature_cnt', 'drawing_jpeg']
+    exclude = [
+        'thumbnail', 'completion_stats', 'drawing_jpeg', 
+        'thumbnail_etag', 'drawing_etag'
+    ]
     search_fields = ['question_name', '__str__']
     actions = ['publish_question', 'force_update', 'change_collect_status']
 
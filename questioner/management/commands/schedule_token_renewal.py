@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from questioner.models import schedule_oauth_renewal
+
+
+class Command(BaseCommand):
+    help = "Start the periodic RQ job renewing the OAuth tokens of active users before they expire"
+
+    def handle(self, *args, **options):
+        schedule_oauth_renewal()
+        self.stdout.write("OAuth token renewal scheduled")
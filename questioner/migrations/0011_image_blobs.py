@@ -0,0 +1,65 @@
+# Generated by Django 4.2 on 2026-10-17 02:28
+
+import base64
+import hashlib
+
+from django.db import migrations, models
+
+
+def store_images(apps, schema_editor):
+    """ Decode the base64 images of existing questions into image blobs """
+    ImageBlob = apps.get_model('questioner', 'ImageBlob')
+
+    def store(data_uri):
+        if not data_uri:
+            return ""
+        header, _, encoded = data_uri.partition(",")
+        content_type = header[len("data:"):].split(";")[0] or "image/png"
+        data = base64.b64decode(encoded)
+        etag = hashlib.sha256(data).hexdigest()
+        ImageBlob.objects.get_or_create(
+            etag=etag, defaults={"content_type": content_type, "data": data}
+        )
+        return etag
+
+    for question in apps.get_model('questioner', 'Question').objects.all():
+        question.thumbnail_etag = store(question.thumbnail)
+        question.drawing_etag = store(question.drawing_jpeg)
+        question.save(update_fields=['thumbnail_etag', 'drawing_etag'])
+    for step in apps.get_model('questioner', 'Question_Step_PS').objects.all():
+        step.drawing_etag = store(step.drawing_jpeg)
+        step.save(update_fields=['drawing_etag'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questioner', '0010_merge_20240716_1619'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageBlob',
+            fields=[
+                ('etag', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('content_type', models.CharField(default='image/png', max_length=40)),
+                ('data', models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='drawing_etag',
+            field=models.CharField(blank=True, default='', help_text='Content hash of the JPEG drawing, served from :model:`questioner.ImageBlob`', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='thumbnail_etag',
+            field=models.CharField(blank=True, default='', help_text='Content hash of the thumbnail, served from :model:`questioner.ImageBlob`', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='question_step_ps',
+            name='drawing_etag',
+            field=models.CharField(blank=True, default='', help_text='Content hash of the JPEG drawing, served from :model:`questioner.ImageBlob`', max_length=64),
+        ),
+        migrations.RunPython(store_images, migrations.RunPython.noop),
+    ]
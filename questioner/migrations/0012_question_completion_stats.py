@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questioner', '0011_image_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='completion_stats',
+            field=models.JSONField(blank=True, default=dict, help_text='Histogram bins of the completion stats, updated when the question is saved'),
+        ),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 4.2 on 2026-10-17 02:32
+
+from itertools import zip_longest
+
+import numpy as np
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def copy_completions(apps, schema_editor):
+    """ Move the completion lists of existing questions into completion records;
+    the completion time and user of these records are unknown """
+    CompletionRecord = apps.get_model('questioner', 'CompletionRecord')
+    for model_name in ['Question_SPPS', 'Question_MPPS', 'Question_ASMB', 'Question_MSPS']:
+        for question in apps.get_model('questioner', model_name).objects.all():
+            CompletionRecord.objects.bulk_create([
+                CompletionRecord(
+                    question_id=question.question_id, completed_at=None,
+                    time_spent=time_spent, feature_cnt=feature_cnt
+                )
+                for time_spent, feature_cnt in zip_longest(
+                    question.completion_time, question.completion_feature_cnt
+                )
+                if time_spent is not None
+            ])
+
+
+def histogram_bins(values, scale=1.0, n_bins=10):
+    """ Same histogram bins as ``questioner.models.histogram_bins`` computed from
+    a list of values """
+    if not values:
+        return None
+    values = np.array(values, dtype=float) * scale
+    lo, hi = values.min(), values.max()
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    counts, edges = np.histogram(values, bins=np.linspace(lo, hi, n_bins + 1))
+    return {
+        "n": len(values), "counts": counts.tolist(),
+        "edges": edges.tolist(), "mean": float(values.mean())
+    }
+
+
+def compute_completion_stats(apps, schema_editor):
+    """ Store the completion stats of the existing questions from the copied
+    completion records, so that they are not computed on every render """
+    Question = apps.get_model('questioner', 'Question')
+    CompletionRecord = apps.get_model('questioner', 'CompletionRecord')
+    for question in Question.objects.only('question_id', 'completion_count'):
+        records = list(CompletionRecord.objects.filter(
+            question_id=question.question_id
+        ).values_list('time_spent', 'feature_cnt'))
+        stats = {"count": question.completion_count}
+        # Outliers (more than 4000 s) are excluded from the distribution of time spent
+        time_bins = histogram_bins([t for t, _ in records if t <= 4000], scale=1/60)
+        if time_bins:
+            time_bins["n"] = len(records)
+            stats["time"] = time_bins
+        feature_bins = histogram_bins([f for _, f in records if f is not None])
+        if feature_bins:
+            stats["features"] = feature_bins
+        Question.objects.filter(question_id=question.question_id).update(completion_stats=stats)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questioner', '0012_question_completion_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompletionRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_reviewer', models.BooleanField(default=False, help_text='If the question was completed by a reviewer')),
+                ('completed_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Unknown (empty) for completions recorded before the completion records were introduced', null=True)),
+                ('time_spent', models.FloatField(help_text='Time spent to complete the question (in seconds)')),
+                ('feature_cnt', models.PositiveIntegerField(help_text='Number of features used to complete the question', null=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='completions', to='questioner.question')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='completions', to='questioner.authuser')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='completionrecord',
+            index=models.Index(fields=['question', 'completed_at'], name='questioner__questio_e90464_idx'),
+        ),
+        migrations.RunPython(copy_completions, migrations.RunPython.noop),
+        migrations.RunPython(compute_completion_stats, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='question',
+            name='completion_time',
+        ),
+        migrations.RemoveField(
+            model_name='question_asmb',
+            name='completion_feature_cnt',
+        ),
+        migrations.RemoveField(
+            model_name='question_mpps',
+            name='completion_feature_cnt',
+        ),
+        migrations.RemoveField(
+            model_name='question_msps',
+            name='completion_feature_cnt',
+        ),
+        migrations.RemoveField(
+            model_name='question_spps',
+            name='completion_feature_cnt',
+        ),
+    ]
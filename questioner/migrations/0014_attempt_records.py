@@ -0,0 +1,99 @@
+# Generated by Django 4.2 on 2026-10-17 02:34
+
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def copy_attempt_history(apps, schema_editor):
+    """ Move the attempt history of the users into completion and failure records
+
+    Completions were copied from the question lists without their user and time
+    (0013); they are matched by the time spent and completed with the user's
+    history, and completions without a match are added.
+    """
+    AuthUser = apps.get_model('questioner', 'AuthUser')
+    Question = apps.get_model('questioner', 'Question')
+    CompletionRecord = apps.get_model('questioner', 'CompletionRecord')
+    FailureRecord = apps.get_model('questioner', 'FailureRecord')
+    question_ids = set(Question.objects.values_list('question_id', flat=True))
+
+    def parse_time(attempt):
+        return datetime.strptime(attempt[0], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+
+    for user in AuthUser.objects.all():
+        for key, attempts in user.completed_history.items():
+            question_id = int(key.split('_')[1])
+            if question_id not in question_ids:
+                continue
+            for attempt in attempts:
+                record = CompletionRecord.objects.filter(
+                    question_id=question_id, user=None, completed_at=None,
+                    time_spent=attempt[1]
+                ).order_by('pk').first()
+                if record is None:
+                    record = CompletionRecord(question_id=question_id, time_spent=attempt[1])
+                record.user = user
+                record.is_reviewer = user.is_reviewer
+                record.completed_at = parse_time(attempt)
+                if record.feature_cnt is None and len(attempt) > 2:
+                    record.feature_cnt = attempt[2]
+                record.save()
+        FailureRecord.objects.bulk_create([
+            FailureRecord(
+                question_id=int(key.split('_')[1]), user=user,
+                failed_at=parse_time(attempt), time_spent=attempt[1]
+            )
+            for key, attempts in user.failure_history.items()
+            if int(key.split('_')[1]) in question_ids
+            for attempt in attempts
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questioner', '0013_completion_records'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FailureRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('failed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('time_spent', models.FloatField(help_text='Time spent before giving up the question (in seconds)')),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='authuser',
+            name='completed_history',
+            field=models.JSONField(default=dict, help_text='Question completion history of the user (see :model:`questioner.CompletionRecord`)'),
+        ),
+        migrations.AlterField(
+            model_name='authuser',
+            name='failure_history',
+            field=models.JSONField(default=dict, help_text='Question failure history of the user (see :model:`questioner.FailureRecord`)'),
+        ),
+        migrations.AddIndex(
+            model_name='completionrecord',
+            index=models.Index(fields=['user', 'question'], name='questioner__user_id_2934b9_idx'),
+        ),
+        migrations.AddField(
+            model_name='failurerecord',
+            name='question',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='failures', to='questioner.question'),
+        ),
+        migrations.AddField(
+            model_name='failurerecord',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='failures', to='questioner.authuser'),
+        ),
+        migrations.AddIndex(
+            model_name='failurerecord',
+            index=models.Index(fields=['user', 'question'], name='questioner__user_id_e791b8_idx'),
+        ),
+        migrations.RunPython(copy_attempt_history, migrations.RunPython.noop),
+    ]
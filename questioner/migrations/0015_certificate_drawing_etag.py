@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-17 02:36
+
+import base64
+import hashlib
+
+from django.db import migrations, models
+
+
+def store_templates(apps, schema_editor):
+    """ Decode the base64 templates of existing certificates into image blobs """
+    ImageBlob = apps.get_model('questioner', 'ImageBlob')
+    for certificate in apps.get_model('questioner', 'Certificate').objects.all():
+        if not certificate.drawing_jpeg:
+            continue
+        header, _, encoded = certificate.drawing_jpeg.partition(",")
+        content_type = header[len("data:"):].split(";")[0] or "image/png"
+        data = base64.b64decode(encoded)
+        certificate.drawing_etag = hashlib.sha256(data).hexdigest()
+        ImageBlob.objects.get_or_create(
+            etag=certificate.drawing_etag, defaults={"content_type": content_type, "data": data}
+        )
+        certificate.save(update_fields=['drawing_etag'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questioner', '0014_attempt_records'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='drawing_etag',
+            field=models.CharField(blank=True, default='', help_text='Content hash of the certificate template, stored as :model:`questioner.ImageBlob`', max_length=64),
+        ),
+        migrations.RunPython(store_templates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questioner', '0015_certificate_drawing_etag'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='question',
+            name='completion_stats',
+            field=models.JSONField(blank=True, default=dict, help_text='Histogram bins of the completion stats, recomputed when read after new completions'),
+        ),
+    ]
@@ -34,21 +34,49 @@ When creating new question types:
 
 import io 
 import os 
-import requests
+import time 
+import asyncio 
 import base64
+import hashlib 
+import uuid 
+from functools import partial, lru_cache 
 from datetime import datetime, timedelta
-from typing import Optional, Iterable, Union, Tuple, Dict, Any
+from typing import Optional, Iterable, Union, Tuple, Dict, List, Any
 
 import numpy as np 
+import django_rq
+from rq import get_current_job
+from PIL import Image, ImageDraw, ImageFont 
 import numpy.typing as npt 
+from matplotlib import font_manager, rcParams 
 from matplotlib.figure import Figure 
 from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 from django.db import models
+from django.db.models import F, Q, Count, Min, Max, Avg
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from django.utils.translation import gettext_lazy 
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 
+from . import onshape
+
+
+# Cache of the dashboard summary of a user, invalidated when the user completes a question 
+DASHBOARD_CACHE_KEY = "dashboard:{}"
+# Cache of the IDs of the questions a user has completed 
+COMPLETED_CACHE_KEY = "completed:{}"
+# Version of the cached question catalog, bumped when questions or certificates change 
+CATALOG_VERSION_KEY = "catalog-version"
+# Completion counters of all questions shown with the catalog 
+COMPLETION_COUNTERS_CACHE_KEY = "completion-counters"
+# ID of the next run of the periodic OAuth renewal job; runs of other IDs are 
+# left over from a replaced schedule and stop re-scheduling themselves 
+OAUTH_RENEWAL_JOB_KEY = "oauth-renewal-job"
+
 
 #################### Create your models here ####################
 class QuestionType(models.TextChoices): 
@@ -122,12 +150,13 @@ class AuthUser(models.Model):
         help_text="An additional field that can be used for some question types to store additional data in the user's model"
     )
     
-    # User question attempt history 
+    # User question attempt history, kept for compatibility; the attempts are 
+    # recorded and queried as CompletionRecord and FailureRecord 
     completed_history = models.JSONField(
-        default=dict, help_text="Question completion history of the user"
+        default=dict, help_text="Question completion history of the user (see :model:`questioner.CompletionRecord`)"
     )
     failure_history = models.JSONField(
-        default=dict, help_text="Question failure history of the user"
+        default=dict, help_text="Question failure history of the user (see :model:`questioner.FailureRecord`)"
     )
     """
     history_data = Dict[
@@ -138,29 +167,100 @@ class AuthUser(models.Model):
     For MSPS: ... includes feature_cnt
     """
     
-    def refresh_oauth_token(self) -> None: 
+    # Token fields updated by a refresh of the OAuth tokens 
+    _TOKEN_FIELDS = ["access_token", "refresh_token", "expires_at"]
+
+    def _oauth_refresh_url(self) -> str: 
         """
-        When a user's ``access_token`` is expired or about to expire, tracked by the user's ``expires_at``, this function can be called to use the ``refresh_token`` to exchange for a new ``access_token``.  
+        URL of the OAuth request to exchange the ``refresh_token`` for new tokens 
         """
-        response = requests.post(
-            os.path.join(
-                os.environ['OAUTH_URL'], 
-                "oauth/token"
-            ) + "?grant_type=refresh_token&refresh_token={}&client_id={}&client_secret={}".format(
-                self.refresh_token.replace('=', '%3D'), 
-                os.environ['OAUTH_CLIENT_ID'].replace('=', '%3D'), 
-                os.environ['OAUTH_CLIENT_SECRET'].replace('=', '%3D')
-            ), 
-            headers={'Content-Type': "application/x-www-form-urlencoded"}
+        return os.path.join(
+            os.environ['OAUTH_URL'], 
+            "oauth/token"
+        ) + "?grant_type=refresh_token&refresh_token={}&client_id={}&client_secret={}".format(
+            self.refresh_token.replace('=', '%3D'), 
+            os.environ['OAUTH_CLIENT_ID'].replace('=', '%3D'), 
+            os.environ['OAUTH_CLIENT_SECRET'].replace('=', '%3D')
         )
-        response = response.json() 
 
+    def _set_oauth_tokens(self, response: Dict[str, Any]) -> None: 
         self.access_token = response['access_token']
         self.refresh_token = response['refresh_token']
         self.expires_at = timezone.now() + timedelta(seconds=response['expires_in'])
-        self.save() 
+
+    def refresh_oauth_token(self) -> None: 
+        """
+        When a user's ``access_token`` is expired or about to expire, tracked by the user's ``expires_at``, this function can be called to use the ``refresh_token`` to exchange for a new ``access_token``.  
+        
+        A ``refresh_token`` can only be used once, so the refresh of the same user is single-flight across all processes: the first caller takes a lock in the cache and refreshes, while concurrent callers wait for the lock to be released and reuse the new tokens stored in the database. A caller holding outdated tokens (e.g., a user object passed to an RQ job) also reuses the stored tokens instead of refreshing again. 
+        """
+        lock_key = "oauth-refresh:" + self.os_user_id 
+        lock_token = uuid.uuid4().hex 
+        used_token = self.refresh_token 
+        if cache.add(lock_key, lock_token, settings.OAUTH_REFRESH_LOCK_TIMEOUT): 
+            try: 
+                self.refresh_from_db(fields=self._TOKEN_FIELDS)
+                if self.refresh_token == used_token: # not refreshed by others 
+                    response = onshape.post(
+                        self._oauth_refresh_url(), 
+                        headers={'Content-Type': "application/x-www-form-urlencoded"}
+                    )
+                    self._set_oauth_tokens(response.json())
+                    self.save(update_fields=self._TOKEN_FIELDS)
+            finally: 
+                # The lock may have expired during a slow refresh and been 
+                # taken by another caller, whose lock is kept 
+                if cache.get(lock_key) == lock_token: 
+                    cache.delete(lock_key)
+        else: 
+            # Wait for the refresh in progress and reuse its result 
+            deadline = time.monotonic() + settings.OAUTH_REFRESH_LOCK_TIMEOUT
+            while cache.get(lock_key) is not None and time.monotonic() < deadline: 
+                time.sleep(0.2)
+            self.refresh_from_db(fields=self._TOKEN_FIELDS)
         return None 
 
+    async def arefresh_oauth_token(self) -> None: 
+        """
+        Asynchronous version of ``refresh_oauth_token`` to be used in async views 
+        """
+        lock_key = "oauth-refresh:" + self.os_user_id 
+        lock_token = uuid.uuid4().hex 
+        used_token = self.refresh_token 
+        if await cache.aadd(lock_key, lock_token, settings.OAUTH_REFRESH_LOCK_TIMEOUT): 
+            try: 
+                await self.arefresh_from_db(fields=self._TOKEN_FIELDS)
+                if self.refresh_token == used_token: # not refreshed by others 
+                    response = await onshape.apost(
+                        self._oauth_refresh_url(), 
+                        headers={'Content-Type': "application/x-www-form-urlencoded"}
+                    )
+                    self._set_oauth_tokens(response.json())
+                    await self.asave(update_fields=self._TOKEN_FIELDS)
+            finally: 
+                if await cache.aget(lock_key) == lock_token: 
+                    await cache.adelete(lock_key)
+        else: 
+            # Wait for the refresh in progress and reuse its result 
+            deadline = time.monotonic() + settings.OAUTH_REFRESH_LOCK_TIMEOUT
+            while await cache.aget(lock_key) is not None and time.monotonic() < deadline: 
+                await asyncio.sleep(0.2)
+            await self.arefresh_from_db(fields=self._TOKEN_FIELDS)
+        return None 
+
+    def save(self, *args, **kwargs): 
+        """
+        Save the user without writing the OAuth tokens back, unless they are listed in ``update_fields`` 
+
+        The tokens may be renewed (see ``renew_oauth_tokens``) while a request or an RQ job holds a user loaded earlier, and a refresh token can only be used once, so a full save of an existing user must not overwrite the renewed tokens with the outdated ones. Only the OAuth paths (``refresh_oauth_token`` and :view:`questioner.views.authorize`) save the tokens, with ``update_fields``. 
+        """
+        if kwargs.get("update_fields") is None and not self._state.adding and not args: 
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields 
+                if not field.primary_key and field.name not in self._TOKEN_FIELDS
+            ]
+        return super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return self.os_user_id
 
@@ -198,17 +298,15 @@ class Reviewer(models.Model):
             if user.expires_at < timezone.now() + timedelta(minutes=10): 
                 user.refresh_oauth_token() 
             
-            response = requests.get(
+            response = onshape.get(
                 "https://cad.onshape.com/api/users/sessioninfo", 
-                headers={
-                    "Content-Type": "application/json", 
-                    "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-                    "Authorization" : "Bearer " + user.access_token
-                }
+                auth_token=user.access_token
             )
             if response.ok: 
                 response = response.json() 
                 self.user_name = response['name']
+        # The main admin may have changed 
+        invalidate_admin_token() 
         return super().save(*args, **kwargs)
     
     def delete(self, using: Any = ..., keep_parents: bool = ...) -> Tuple[int, Dict[str, int]]:
@@ -216,6 +314,7 @@ class Reviewer(models.Model):
         user = AuthUser.objects.get(os_user_id=self.os_user_id)
         user.is_reviewer = False 
         user.save() 
+        invalidate_admin_token() 
         return super().delete(using, keep_parents)
 
 
@@ -242,6 +341,10 @@ class Certificate(models.Model):
     drawing_jpeg = models.TextField(
         null=True, help_text="The exported JPEG image of the question stored as a base64 JPEG image"
     )
+    drawing_etag = models.CharField(
+        max_length=64, default="", blank=True, 
+        help_text="Content hash of the certificate template, stored as :model:`questioner.ImageBlob`"
+    )
 
     # This boolean indicates when the system check is passed 
     is_published = models.BooleanField(
@@ -268,7 +371,12 @@ class Certificate(models.Model):
                 self.did, self.vid, self.jpeg_eid, 
                 get_admin_token()
             )
-        return super().save(*args, **kwargs)
+            self.drawing_etag = ""
+        if not self.drawing_etag: 
+            self.drawing_etag = store_image(self.drawing_jpeg)
+        result = super().save(*args, **kwargs)
+        bump_catalog_version() 
+        return result 
 
 class Question(models.Model): 
     """ 
@@ -331,12 +439,13 @@ class Question(models.Model):
     completion_count = models.PositiveIntegerField(
         default=0, help_text="The number of times this question is completed by users"
     )
-    completion_time = models.JSONField(
-        default=list, help_text="List of completion time spent (in seconds) by users in history"
-    )
     reviewer_completion_count = models.PositiveIntegerField(
         default=0, help_text="The number of times this question is completed by reviewers"
     )
+    completion_stats = models.JSONField(
+        default=dict, blank=True, 
+        help_text="Histogram bins of the completion stats, recomputed when read after new completions"
+    )
 
     # Admin-specified parameters for the question 
     question_name = models.CharField(
@@ -355,6 +464,14 @@ class Question(models.Model):
     drawing_jpeg = models.TextField(
         null=True, help_text="The exported JPEG image of the question stored as a base64 JPEG image"
     )
+    thumbnail_etag = models.CharField(
+        max_length=64, default="", blank=True, 
+        help_text="Content hash of the thumbnail, served from :model:`questioner.ImageBlob`"
+    )
+    drawing_etag = models.CharField(
+        max_length=64, default="", blank=True, 
+        help_text="Content hash of the JPEG drawing, served from :model:`questioner.ImageBlob`"
+    )
     
     # This boolean indicates when the system check is passed 
     is_published = models.BooleanField(
@@ -373,8 +490,9 @@ class Question(models.Model):
         """
         Get average completion time required for the question (outliers are excluded)
         """
-        if self.completion_count > 0: 
-            avg_time = np.mean([t for t in self.completion_time if t <= 4000])
+        bins = self.get_completion_bins("time")
+        if self.completion_count > 0 and bins: 
+            avg_time = bins["mean"] * 60 
             return "{} minutes {} seconds".format(
                 int(avg_time // 60), round(divmod(avg_time, 60)[1])
             )
@@ -444,39 +562,118 @@ class Question(models.Model):
         All results are returned as a formatted string of HTML code to be used directly in :view:`questioner.views.complete`
         """
         # Print out user's time spent 
-        if show_best: 
-            my_time = sorted(user.completed_history[str(self)], key=lambda x:x[1])[0][1] 
-        else: 
-            my_time = user.completed_history[str(self)][-1][1] # in seconds
+        my_time = self.get_user_completion(user, best=show_best).time_spent # in seconds
         output = "<p>You completed the model {} in {} minutes and {} seconds.</p>".format(
             self.question_name, int(my_time // 60), int(my_time % 60)
         )
 
         # Plot a histogram of time spent 
-        if len(self.completion_time) >= 10: 
+        bins = self.get_completion_bins("time")
+        if bins and bins["n"] >= 10: 
             output += """
             <p>Take a look at how you did compared to other people who also completed this model:</p>
             <img src="{}" alt="stats_time"/>
             """.format(
                 plot_dist(
-                    np.array([t for t in self.completion_time if t <= 4000]) / 60, 
-                    my_time / 60, x_label="Time Spent to Complete This Question (mins)"
+                    bins, my_time / 60, x_label="Time Spent to Complete This Question (mins)", 
+                    cache_key="{}:time:{}".format(self, bins["n"])
                 )
             )
         return output 
 
+    def record_completion(self, user: AuthUser, time_spent: float, feature_cnt: int) -> None: 
+        """
+        Record a successful attempt as a :model:`questioner.CompletionRecord` and update the completion counters of the question; the attempt is also added to the user's ``completed_history`` (the user is saved by the caller) 
+
+        The counters are incremented in the database with a single ``UPDATE`` of the counter columns, so concurrent completions of the same question neither block on nor overwrite each other, and the question's ``save`` actions are not run. The completion stats are recomputed when they are next read (see ``get_completion_bins``). 
+        """
+        record = CompletionRecord.objects.create(
+            question_id=self.question_id, user=user, is_reviewer=user.is_reviewer, 
+            time_spent=time_spent, feature_cnt=feature_cnt
+        )
+        cache.delete_many([
+            DASHBOARD_CACHE_KEY.format(user.os_user_id), 
+            COMPLETED_CACHE_KEY.format(user.os_user_id)
+        ])
+        user.completed_history.setdefault(str(self), []).append((
+            datetime.strftime(record.completed_at, '%Y-%m-%d %H:%M:%S'), 
+            time_spent, feature_cnt
+        ))
+        counters = {"completion_count": F("completion_count") + 1}
+        if user.is_reviewer: 
+            counters["reviewer_completion_count"] = F("reviewer_completion_count") + 1
+        Question.objects.filter(question_id=self.question_id).update(**counters)
+        self.refresh_from_db(fields=["completion_count", "reviewer_completion_count"])
+        return None 
+
+    def record_failure(self, user: AuthUser, time_spent: float) -> None: 
+        """
+        Record a failed attempt (given up after at least one evaluated submission) as a :model:`questioner.FailureRecord`; the attempt is also added to the user's ``failure_history`` (the user is saved by the caller) 
+        """
+        record = FailureRecord.objects.create(
+            question_id=self.question_id, user=user, time_spent=time_spent
+        )
+        user.failure_history.setdefault(str(self), []).append((
+            datetime.strftime(record.failed_at, '%Y-%m-%d %H:%M:%S'), 
+            time_spent
+        ))
+        return None 
+
+    def get_user_completion(self, user: AuthUser, best=False) -> Optional["CompletionRecord"]: 
+        """
+        Get the user's last completion of the question, or the fastest one if ``best`` 
+        """
+        records = CompletionRecord.objects.filter(user=user, question_id=self.question_id)
+        return records.order_by("time_spent" if best else "-pk").first() 
+
+    def update_completion_stats(self) -> None: 
+        """
+        Compute the histogram bins of the completion stats from the question's :model:`questioner.CompletionRecord` in SQL, to be stored in ``completion_stats`` and used by ``show_result``. The stats are labelled with the ``completion_count`` they are computed for. 
+
+        Only the stats column is updated, so the completion counters incremented concurrently are kept. 
+        """
+        records = CompletionRecord.objects.filter(question_id=self.question_id)
+        stats = {"count": self.completion_count}
+        # Outliers (more than 4000 s) are excluded from the distribution of time spent 
+        time_bins = histogram_bins(records.filter(time_spent__lte=4000), "time_spent", scale=1/60)
+        if time_bins: 
+            time_bins["n"] = records.count() 
+            stats["time"] = time_bins 
+        feature_bins = histogram_bins(records.filter(feature_cnt__isnull=False), "feature_cnt")
+        if feature_bins: 
+            stats["features"] = feature_bins 
+        self.completion_stats = stats 
+        Question.objects.filter(question_id=self.question_id).update(completion_stats=stats)
+        return None 
+
+    def get_completion_bins(self, stat: str) -> Optional[Dict[str, Any]]: 
+        """
+        Get the stored histogram bins of a completion stat (``"time"`` or ``"features"``), which are recomputed if the question has been completed since they were stored 
+        """
+        if self.completion_stats.get("count") != self.completion_count: 
+            self.update_completion_stats() 
+        return self.completion_stats.get(stat)
+
     def save(self, *args, **kwargs): 
         """
         Default actions when a question is saved, either first added or updated afterward 
         """
         if not self.thumbnail: 
             self.thumbnail = get_thumbnail(self, get_admin_token()) 
+            self.thumbnail_etag = ""
         if not self.drawing_jpeg: 
             self.drawing_jpeg = get_jpeg_drawing(
                 self.did, self.vid, self.jpeg_drawing_eid, 
                 get_admin_token()
             )
-        return super().save(*args, **kwargs)
+            self.drawing_etag = ""
+        if not self.thumbnail_etag: 
+            self.thumbnail_etag = store_image(self.thumbnail)
+        if not self.drawing_etag: 
+            self.drawing_etag = store_image(self.drawing_jpeg)
+        result = super().save(*args, **kwargs)
+        bump_catalog_version() 
+        return result 
 
 
 class Question_SPPS(Question): 
@@ -490,10 +687,6 @@ class Question_SPPS(Question):
         help_text="Input custom tolerance for challenge (input in decimal percent - default is 0.005 for part studios)"
     ) 
 
-    # Additional analytics to be collected and presented 
-    completion_feature_cnt = models.JSONField(
-        default=list, help_text="List of feature counts required by users to complete the question in history"
-    )
     ref_mid = models.CharField(
         max_length=40, default=None, null=True, 
         help_text="Last microversion of the reference element's version, required for derived import"
@@ -542,11 +735,16 @@ class Question_SPPS(Question):
         Results are returned to :view:`questioner.views.check_model`
         """
         # Get info from user model 
-        feature_list = get_feature_list(user)
-        mass_prop = get_mass_properties(
-            user.os_domain, user.did, "w", user.wid, user.eid, user.etype, 
-            massAsGroup=True, auth_token=user.access_token
+        user_info = onshape.fetch_all(
+            feature_list=partial(get_feature_list, user), 
+            mass_prop=partial(
+                get_mass_properties, 
+                user.os_domain, user.did, "w", user.wid, user.eid, user.etype, 
+                massAsGroup=True, auth_token=user.access_token
+            )
         )
+        feature_list = user_info['feature_list']
+        mass_prop = user_info['mass_prop']
         if not feature_list or not mass_prop: # API call failed 
             return False 
 
@@ -593,25 +791,10 @@ class Question_SPPS(Question):
             feature_cnt = len(feature_list['features'])
             end_mid = get_current_microversion(user)
 
-            self.completion_count += 1
-            self.completion_time.append(time_spent)
-            self.completion_feature_cnt.append(feature_cnt)
-            if user.is_reviewer: 
-                self.reviewer_completion_count += 1
-            self.save()
+            self.record_completion(user, time_spent, feature_cnt)
 
             user.end_mid = end_mid
             user.is_modelling = False 
-            if str(self) in user.completed_history: 
-                user.completed_history[str(self)].append((
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent, feature_cnt
-                ))
-            else: 
-                user.completed_history[str(self)] = [(
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent, feature_cnt
-                )]
             user.save() 
             return True 
 
@@ -642,16 +825,7 @@ class Question_SPPS(Question):
         # Determine if data miner should collect data 
         if user.end_mid: # if at least one meaningful attempt evaluated before 
             time_spent = (timezone.now() - user.last_start).total_seconds()
-            if str(self) in user.failure_history: 
-                user.failure_history[str(self)].append((
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent
-                ))
-            else: 
-                user.failure_history[str(self)] = [(
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent
-                )]
+            self.record_failure(user, time_spent)
             user.end_mid = temp_mid
             user.save() 
             return msg, True 
@@ -671,19 +845,18 @@ class Question_SPPS(Question):
         
         Formatted string of HTML code returned to :view:`questioner.views.complete`
         """
-        if show_best: 
-            my_fea_cnt = sorted(user.completed_history[str(self)], key=lambda x:x[1])[0][2] 
-        else: 
-            my_fea_cnt = user.completed_history[str(self)][-1][2] 
+        my_fea_cnt = self.get_user_completion(user, best=show_best).feature_cnt 
         output = "<p>You completed the model {} with {} features.</p>".format(
             self.question_name, int(my_fea_cnt)
         )
         # Plot a histogram of feature counts 
-        if len(self.completion_feature_cnt) >= 10: 
+        bins = self.get_completion_bins("features")
+        if bins and bins["n"] >= 10: 
             output += """<img src="{}" alt="stats_time"/>""".format(
                 plot_dist(
-                    self.completion_feature_cnt, my_fea_cnt, 
-                    x_label="Number of Features Used to Complete This Question"
+                    bins, my_fea_cnt, 
+                    x_label="Number of Features Used to Complete This Question", 
+                    cache_key="{}:features:{}".format(self, bins["n"])
                 )
             )
         return super().show_result(user, show_best=show_best) + output
@@ -744,11 +917,6 @@ class Question_MPPS(Question):
         help_text="Last microversion of the reference element's version, required for derived import"
     )
 
-    # Additional analytics to be collected and presented 
-    completion_feature_cnt = models.JSONField(
-        default=list, help_text="List of feature counts required by users to complete the question in history"
-    )
-
     # Properties for evaluation 
     model_mass = models.JSONField(default=list, null=True, help_text="Mass in kg")
     model_volume = models.JSONField(default=list, null=True, help_text="Volume in m^3")
@@ -810,14 +978,21 @@ class Question_MPPS(Question):
         Results are returned to :view:`questioner.views.check_model`
         """
         # Get info from user model 
-        feature_list = get_feature_list(user)
-        mass_prop = get_mass_properties(
-            user.os_domain, user.did, "w", user.wid, user.eid, user.etype, 
-            massAsGroup=False, auth_token=user.access_token
-        )
-        part_list = get_part_list(
-            user.os_domain, user.did, "w", user.wid, user.eid, user.access_token
+        user_info = onshape.fetch_all(
+            feature_list=partial(get_feature_list, user), 
+            mass_prop=partial(
+                get_mass_properties, 
+                user.os_domain, user.did, "w", user.wid, user.eid, user.etype, 
+                massAsGroup=False, auth_token=user.access_token
+            ), 
+            part_list=partial(
+                get_part_list, 
+                user.os_domain, user.did, "w", user.wid, user.eid, user.access_token
+            )
         )
+        feature_list = user_info['feature_list']
+        mass_prop = user_info['mass_prop']
+        part_list = user_info['part_list']
         
         if not feature_list or not mass_prop or not part_list: # API call failed 
             return False 
@@ -881,25 +1056,10 @@ class Question_MPPS(Question):
             feature_cnt = len(feature_list['features'])
             end_mid = get_current_microversion(user)
 
-            self.completion_count += 1
-            self.completion_time.append(time_spent)
-            self.completion_feature_cnt.append(feature_cnt)
-            if user.is_reviewer: 
-                self.reviewer_completion_count += 1
-            self.save()
+            self.record_completion(user, time_spent, feature_cnt)
 
             user.end_mid = end_mid
             user.is_modelling = False 
-            if str(self) in user.completed_history: 
-                user.completed_history[str(self)].append((
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent, feature_cnt
-                ))
-            else: 
-                user.completed_history[str(self)] = [(
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent, feature_cnt
-                )]
             user.save() 
             return True 
 
@@ -926,16 +1086,7 @@ class Question_MPPS(Question):
         # Determine if data miner should collect data 
         if user.end_mid: # if at least one meaningful attempt evaluated before 
             time_spent = (timezone.now() - user.last_start).total_seconds()
-            if str(self) in user.failure_history: 
-                user.failure_history[str(self)].append((
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent
-                ))
-            else: 
-                user.failure_history[str(self)] = [(
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent
-                )]
+            self.record_failure(user, time_spent)
             user.end_mid = temp_mid
             user.save() 
             return msg, True 
@@ -954,19 +1105,18 @@ class Question_MPPS(Question):
         
         Formatted string of HTML code returned to :view:`questioner.views.complete`
         """
-        if show_best: 
-            my_fea_cnt = sorted(user.completed_history[str(self)], key=lambda x:x[1])[0][2] 
-        else: 
-            my_fea_cnt = user.completed_history[str(self)][-1][2] 
+        my_fea_cnt = self.get_user_completion(user, best=show_best).feature_cnt 
         output = "<p>You completed the model {} with {} features.</p>".format(
             self.question_name, int(my_fea_cnt)
         )
         # Plot a histogram of feature counts 
-        if len(self.completion_feature_cnt) >= 10: 
+        bins = self.get_completion_bins("features")
+        if bins and bins["n"] >= 10: 
             output += """<img src="{}" alt="stats_time"/>""".format(
                 plot_dist(
-                    self.completion_feature_cnt, my_fea_cnt, 
-                    x_label="Number of Features Used to Complete This Question"
+                    bins, my_fea_cnt, 
+                    x_label="Number of Features Used to Complete This Question", 
+                    cache_key="{}:features:{}".format(self, bins["n"])
                 )
             )
         return super().show_result(user, show_best=show_best) + output
@@ -1037,11 +1187,6 @@ class Question_ASMB(Question):
         help_text="Starting part studio with parts that need to be imported to user assembly as part instances to be assembled"
     )
 
-    # Additional analytics to be collected and presented 
-    completion_feature_cnt = models.JSONField(
-        default=list, help_text="List of mate feature counts required by users to complete the question in history"
-    )
-
     # Properties for evaluation 
     model_inertia = models.JSONField(default=list, null=True, help_text="An ordered list of 3 principal interia in kg.m^2")
 
@@ -1093,11 +1238,16 @@ class Question_ASMB(Question):
         Results are returned to :view:`questioner.views.check_model`
         """
         # Get info from user model 
-        assembly_def = get_assembly_definition(user)
-        mass_prop = get_mass_properties(
-            user.os_domain, user.did, "w", user.wid, user.eid, user.etype, 
-            auth_token=user.access_token
+        user_info = onshape.fetch_all(
+            assembly_def=partial(get_assembly_definition, user), 
+            mass_prop=partial(
+                get_mass_properties, 
+                user.os_domain, user.did, "w", user.wid, user.eid, user.etype, 
+                auth_token=user.access_token
+            )
         )
+        assembly_def = user_info['assembly_def']
+        mass_prop = user_info['mass_prop']
         if not assembly_def or not mass_prop: # API call failed 
             return False 
 
@@ -1140,25 +1290,10 @@ class Question_ASMB(Question):
             feature_cnt = feature_cnt
             end_mid = get_current_microversion(user)
 
-            self.completion_count += 1
-            self.completion_time.append(time_spent)
-            self.completion_feature_cnt.append(feature_cnt)
-            if user.is_reviewer: 
-                self.reviewer_completion_count += 1
-            self.save()
+            self.record_completion(user, time_spent, feature_cnt)
 
             user.end_mid = end_mid
             user.is_modelling = False 
-            if str(self) in user.completed_history: 
-                user.completed_history[str(self)].append((
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent, feature_cnt
-                ))
-            else: 
-                user.completed_history[str(self)] = [(
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent, feature_cnt
-                )]
             user.save() 
             return True 
 
@@ -1174,16 +1309,7 @@ class Question_ASMB(Question):
         # Determine if data miner should collect data 
         if user.end_mid: # if at least one meaningful attempt evaluated before 
             time_spent = (timezone.now() - user.last_start).total_seconds()
-            if str(self) in user.failure_history: 
-                user.failure_history[str(self)].append((
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent
-                ))
-            else: 
-                user.failure_history[str(self)] = [(
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent
-                )]
+            self.record_failure(user, time_spent)
             user.end_mid = temp_mid
             user.save() 
             return msg, True 
@@ -1203,19 +1329,18 @@ class Question_ASMB(Question):
         
         Formatted string of HTML code returned to :view:`questioner.views.complete`
         """
-        if show_best: 
-            my_fea_cnt = sorted(user.completed_history[str(self)], key=lambda x:x[1])[0][2] 
-        else: 
-            my_fea_cnt = user.completed_history[str(self)][-1][2] 
+        my_fea_cnt = self.get_user_completion(user, best=show_best).feature_cnt 
         output = "<p>You completed the model {} with {} features.</p>".format(
             self.question_name, int(my_fea_cnt)
         )
         # Plot a histogram of feature counts 
-        if len(self.completion_feature_cnt) >= 10: 
+        bins = self.get_completion_bins("features")
+        if bins and bins["n"] >= 10: 
             output += """<img src="{}" alt="stats_time"/>""".format(
                 plot_dist(
-                    self.completion_feature_cnt, my_fea_cnt, 
-                    x_label="Number of Features Used to Complete This Question"
+                    bins, my_fea_cnt, 
+                    x_label="Number of Features Used to Complete This Question", 
+                    cache_key="{}:features:{}".format(self, bins["n"])
                 )
             )
         return super().show_result(user, show_best=show_best) + output
@@ -1265,11 +1390,6 @@ class Question_MSPS(Question):
     )
     total_steps = models.IntegerField("Number of steps", default=0)
 
-    # Additional analytics to be collected and presented 
-    completion_feature_cnt = models.JSONField(
-        default=list, help_text="List of feature counts required by users to complete the question in history"
-    )
-
     class Meta: 
         verbose_name = "Multi-step Part Studio Question"
 
@@ -1363,16 +1483,7 @@ class Question_MSPS(Question):
         # Record basic data for database stats 
         if user.end_mid: # at least one meaningful attempt evaluated before 
             time_spent = (timezone.now() - user.last_start).total_seconds()
-            if str(self) in user.failure_history: 
-                user.failure_history[str(self)].append((
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent
-                ))
-            else: 
-                user.failure_history[str(self)] = [(
-                    datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                    time_spent
-                )]
+            self.record_failure(user, time_spent)
             user.end_mid = temp_mid
             user.save() 
         return msg, False 
@@ -1389,19 +1500,18 @@ class Question_MSPS(Question):
         
         Formatted string of HTML code returned to :view:`questioner.views.complete`
         """
-        if show_best: 
-            my_fea_cnt = sorted(user.completed_history[str(self)], key=lambda x:x[1])[0][2] 
-        else: 
-            my_fea_cnt = user.completed_history[str(self)][-1][2] 
+        my_fea_cnt = self.get_user_completion(user, best=show_best).feature_cnt 
         output = "<p>You completed the model {} with {} features.</p>".format(
             self.question_name, int(my_fea_cnt)
         )
         # Plot a histogram of feature counts 
-        if len(self.completion_feature_cnt) >= 10: 
+        bins = self.get_completion_bins("features")
+        if bins and bins["n"] >= 10: 
             output += """<img src="{}" alt="stats_time"/>""".format(
                 plot_dist(
-                    self.completion_feature_cnt, my_fea_cnt, 
-                    x_label="Number of Features Used to Complete This Question"
+                    bins, my_fea_cnt, 
+                    x_label="Number of Features Used to Complete This Question", 
+                    cache_key="{}:features:{}".format(self, bins["n"])
                 )
             )
         return super().show_result(user, show_best=show_best) + output
@@ -1454,6 +1564,10 @@ class Question_Step_PS(models.Model):
     drawing_jpeg = models.TextField(
         null=True, help_text="The exported JPEG image of the question stored as a base64 JPEG image"
     )
+    drawing_etag = models.CharField(
+        max_length=64, default="", blank=True, 
+        help_text="Content hash of the JPEG drawing, served from :model:`questioner.ImageBlob`"
+    )
     additional_instructions = models.TextField(
         null=True, default=None, blank=True, 
         help_text="(Opitonal) additional instructions for this step"
@@ -1482,16 +1596,23 @@ class Question_Step_PS(models.Model):
         
         Results are returned to :model:`questioner.Question_MSPS`
         """
-         # Get info from user model 
-        feature_list = get_feature_list(user)
-        mass_prop = get_mass_properties(
-            user.os_domain, user.did, "w", user.wid, user.eid, user.etype, 
-            massAsGroup=bool(not self.question.is_multi_part), 
-            auth_token=user.access_token
-        )
-        part_list = get_part_list(
-            user.os_domain, user.did, "w", user.wid, user.eid, user.access_token
+        # Get info from user model 
+        user_info = onshape.fetch_all(
+            feature_list=partial(get_feature_list, user), 
+            mass_prop=partial(
+                get_mass_properties, 
+                user.os_domain, user.did, "w", user.wid, user.eid, user.etype, 
+                massAsGroup=bool(not self.question.is_multi_part), 
+                auth_token=user.access_token
+            ), 
+            part_list=partial(
+                get_part_list, 
+                user.os_domain, user.did, "w", user.wid, user.eid, user.access_token
+            )
         )
+        feature_list = user_info['feature_list']
+        mass_prop = user_info['mass_prop']
+        part_list = user_info['part_list']
         
         if not feature_list or not mass_prop or not part_list: # API call failed 
             return False 
@@ -1551,25 +1672,10 @@ class Question_Step_PS(models.Model):
                 feature_cnt = len(feature_list['features'])
                 end_mid = get_current_microversion(user)
 
-                self.question.completion_count += 1
-                self.question.completion_time.append(time_spent)
-                self.question.completion_feature_cnt.append(feature_cnt)
-                if user.is_reviewer: 
-                    self.question.reviewer_completion_count += 1
-                self.question.save()
+                self.question.record_completion(user, time_spent, feature_cnt)
 
                 user.end_mid = end_mid
                 user.is_modelling = False 
-                if str(self.question) in user.completed_history: 
-                    user.completed_history[str(self.question)].append((
-                        datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                        time_spent, feature_cnt
-                    ))
-                else: 
-                    user.completed_history[str(self.question)] = [(
-                        datetime.strftime(timezone.now(), '%Y-%m-%d %H:%M:%S'), 
-                        time_spent, feature_cnt
-                    )]
                 user.save() 
             return True 
         else: 
@@ -1607,6 +1713,9 @@ class Question_Step_PS(models.Model):
                 self.question.did, self.question.vid, self.jpeg_drawing_eid, 
                 get_admin_token()
             )
+            self.drawing_etag = ""
+        if not self.drawing_etag: 
+            self.drawing_etag = store_image(self.drawing_jpeg)
         if not self.model_mass: 
             mass_prop = get_mass_properties(
                 "https://cad.onshape.com/", 
@@ -1654,17 +1763,120 @@ class Question_Step_PS(models.Model):
         return msg 
 
 
+class CompletionRecord(models.Model): 
+    """
+    Append-only record of every successful attempt of a question, from which the completion stats of :model:`questioner.Question` are derived 
+    """
+    question = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name="completions"
+    )
+    user = models.ForeignKey(
+        AuthUser, on_delete=models.SET_NULL, null=True, related_name="completions"
+    )
+    is_reviewer = models.BooleanField(
+        default=False, help_text="If the question was completed by a reviewer"
+    )
+    completed_at = models.DateTimeField(
+        default=timezone.now, null=True, 
+        help_text="Unknown (empty) for completions recorded before the completion records were introduced"
+    )
+    time_spent = models.FloatField(help_text="Time spent to complete the question (in seconds)")
+    feature_cnt = models.PositiveIntegerField(
+        null=True, help_text="Number of features used to complete the question"
+    )
+
+    class Meta: 
+        indexes = [
+            models.Index(fields=["question", "completed_at"]), 
+            models.Index(fields=["user", "question"])
+        ]
+
+    def __str__(self) -> str:
+        return "{}_{}".format(self.question_id, self.pk)
+
+
+class FailureRecord(models.Model): 
+    """
+    Record of every failed attempt of a question, i.e., the user gave up after at least one evaluated submission 
+    """
+    question = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name="failures"
+    )
+    user = models.ForeignKey(
+        AuthUser, on_delete=models.CASCADE, related_name="failures"
+    )
+    failed_at = models.DateTimeField(default=timezone.now)
+    time_spent = models.FloatField(help_text="Time spent before giving up the question (in seconds)")
+
+    class Meta: 
+        indexes = [
+            models.Index(fields=["user", "question"])
+        ]
+
+    def __str__(self) -> str:
+        return "{}_{}".format(self.question_id, self.pk)
+
+
+class ImageBlob(models.Model): 
+    """
+    Raw bytes of the images displayed in the app (question thumbnails and drawings), decoded once from the base64 images stored with the questions. 
+
+    Images are addressed by the SHA-256 hash of their content, which is also used as the ETag when served by :view:`questioner.views.image`. 
+    """
+    etag = models.CharField(max_length=64, primary_key=True)
+    content_type = models.CharField(max_length=40, default="image/png")
+    data = models.BinaryField() 
+
+    def __str__(self) -> str:
+        return self.etag
+
+
+def store_image(data_uri: Optional[str]) -> str: 
+    """ Decode a base64 image (data URI) and store it as an :model:`questioner.ImageBlob`; 
+    returns the content hash of the image, or an empty string if there is no image 
+    """
+    if not data_uri: 
+        return ""
+    header, _, encoded = data_uri.partition(",")
+    content_type = header[len("data:"):].split(";")[0] or "image/png"
+    data = base64.b64decode(encoded)
+    etag = hashlib.sha256(data).hexdigest() 
+    ImageBlob.objects.get_or_create(
+        etag=etag, defaults={"content_type": content_type, "data": data}
+    )
+    return etag 
+
+
 #################### Helper API calls ####################
 _Q_TYPES = Union[
     Question_SPPS, Question_MPPS, Question_ASMB, Question_MSPS
 ] # for function argument hints 
 
 
+ADMIN_TOKEN_CACHE_KEY = "admin-token"
+# Token of the main admin cached in the current process: (token, valid until) 
+_admin_token: Optional[Tuple[str, datetime]] = None 
+
+
 def get_admin_token() -> str: 
     """ Get a token (refresh if needed) from one of the main admins, 
     as defined in the Reviewer model, to complete question management 
     related actions 
+
+    The token is cached in the current process and in the shared cache until 
+    ``ADMIN_TOKEN_MARGIN`` seconds before it expires, so the repeated calls of 
+    a question save or an admin bulk action all get the same token without 
+    querying the database or refreshing the token again. 
     """
+    global _admin_token
+    now = timezone.now() 
+    if _admin_token is not None and _admin_token[1] > now: 
+        return _admin_token[0]
+    cached = cache.get(ADMIN_TOKEN_CACHE_KEY)
+    if cached is not None and cached[1] > now: 
+        _admin_token = cached 
+        return cached[0]
+
     # Get one main admin user 
     try: 
         admin_user = AuthUser.objects.get(
@@ -1673,15 +1885,97 @@ def get_admin_token() -> str:
     except Exception: 
         raise ValidationError("No main admin users have been assigned from the reviewers yet.")
     # Refresh token if needed 
-    if admin_user.expires_at < timezone.now() + timedelta(hours=1): 
+    margin = timedelta(seconds=settings.ADMIN_TOKEN_MARGIN)
+    if admin_user.expires_at < now + margin: 
         admin_user.refresh_oauth_token() 
-    return admin_user.access_token
+    _admin_token = (admin_user.access_token, admin_user.expires_at - margin)
+    cache.set(
+        ADMIN_TOKEN_CACHE_KEY, _admin_token, 
+        max(int((_admin_token[1] - now).total_seconds()), 1)
+    )
+    return _admin_token[0]
+
+
+def invalidate_admin_token() -> None: 
+    """ Drop the cached admin token, e.g., when the main admins are changed 
+
+    Other processes keep using their cached token until it is no longer valid. 
+    """
+    global _admin_token
+    _admin_token = None 
+    cache.delete(ADMIN_TOKEN_CACHE_KEY)
+    return None 
+
+
+def renew_oauth_tokens() -> int: 
+    """ Periodic RQ job to renew the tokens before they expire, so that no 
+    request has to wait for a token refresh 
+
+    Tokens are renewed for users in an active modelling session (started 
+    within the last few hours) and for the main admins, if they expire within 
+    ``OAUTH_RENEWAL_WINDOW`` seconds. The job re-schedules itself on the 'low' 
+    queue every ``OAUTH_RENEWAL_INTERVAL`` seconds, even if the renewal fails, 
+    unless it has been replaced by ``schedule_oauth_renewal`` in the meantime. 
+
+    Returns the number of users whose tokens were renewed 
+    """
+    job = get_current_job() 
+    if job is not None and cache.get(OAUTH_RENEWAL_JOB_KEY) != job.id: 
+        return 0 # left over from a replaced schedule 
+
+    renewed = 0 
+    try: 
+        now = timezone.now() 
+        expiring = AuthUser.objects.filter(
+            expires_at__lt=now + timedelta(seconds=settings.OAUTH_RENEWAL_WINDOW)
+        )
+        active_users = expiring.filter(
+            is_modelling=True, last_start__gt=now - timedelta(hours=6)
+        ) | expiring.filter(
+            os_user_id__in=Reviewer.objects.filter(is_main_admin=True).values("os_user_id")
+        )
+        for user in active_users.distinct(): 
+            try: 
+                user.refresh_oauth_token() 
+                renewed += 1 
+            except Exception: 
+                # e.g., the user revoked the app; it is refreshed again on login 
+                continue 
+    finally: 
+        queue = django_rq.get_queue("low")
+        if queue.is_async and job is not None and cache.get(OAUTH_RENEWAL_JOB_KEY) == job.id: 
+            next_id = uuid.uuid4().hex 
+            cache.set(OAUTH_RENEWAL_JOB_KEY, next_id, None)
+            queue.enqueue_in(
+                timedelta(seconds=settings.OAUTH_RENEWAL_INTERVAL), renew_oauth_tokens, 
+                job_id=next_id
+            )
+    return renewed 
+
+
+def schedule_oauth_renewal() -> None: 
+    """ Start the periodic ``renew_oauth_tokens`` job, replacing any job 
+    queued, running, or scheduled previously (e.g., by the last release), 
+    which stops re-scheduling itself 
+    """
+    queue = django_rq.get_queue("low")
+    if not queue.is_async: 
+        renew_oauth_tokens() 
+        return None 
+    registry = queue.scheduled_job_registry 
+    for job in queue.job_class.fetch_many(registry.get_job_ids(), connection=queue.connection): 
+        if job is not None and job.func_name == "questioner.models.renew_oauth_tokens": 
+            registry.remove(job, delete_job=True)
+    job_id = uuid.uuid4().hex 
+    cache.set(OAUTH_RENEWAL_JOB_KEY, job_id, None)
+    queue.enqueue(renew_oauth_tokens, job_id=job_id)
+    return None 
 
 
 def get_thumbnail(question: _Q_TYPES, auth_token: str) -> str: 
     """Get a thumbnail image of the question for display 
     """
-    response = requests.get(
+    response = onshape.get(
         "https://cad.onshape.com/api/{}/d/{}/v/{}/e/{}/shadedviews".format(
             question.etype, question.did, question.vid, question.eid
         ), 
@@ -1691,11 +1985,7 @@ def get_thumbnail(question: _Q_TYPES, auth_token: str) -> str:
             "pixelSize": 0, 
             "viewMatrix": "0.612,0.612,0,0,-0.354,0.354,0.707,0,0.707,-0.707,0.707,0"
         }, 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-            "Authorization": "Bearer " + auth_token
-        }
+        auth_token=auth_token
     )
     
     if response.ok: 
@@ -1707,15 +1997,11 @@ def get_thumbnail(question: _Q_TYPES, auth_token: str) -> str:
 def get_jpeg_drawing(did: str, vid: str, eid: str, auth_token: str) -> str: 
     """ Get the JPEG version of the drawing to be displayed when modelling 
     """
-    response = requests.get(
+    response = onshape.get(
         "https://cad.onshape.com/api/blobelements/d/{}/v/{}/e/{}".format(
             did, vid, eid
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/octet-stream;charset=UTF-8;qs=0.09", 
-            "Authorization" : "Bearer " + auth_token
-        }
+        auth_token=auth_token, accept=onshape.BLOB_ACCEPT
     )
     
     if response.ok: 
@@ -1730,18 +2016,14 @@ def get_mass_properties(
 ) -> Any: 
     """ Get the mass and geometry properties of the given element 
     """
-    response = requests.get(
+    response = onshape.get(
         os.path.join(
             domain, 
             "api/{}/d/{}/{}/{}/e/{}/massproperties".format(
             etype, did, wvm, wvmid, eid
         )
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-            "Authorization" : "Bearer " + auth_token
-        }, 
+        auth_token=auth_token, 
         params={
             "massAsGroup": massAsGroup
         }
@@ -1755,18 +2037,14 @@ def get_mass_properties(
 def get_feature_list(user: AuthUser) -> Any: 
     """ Retrieve the feature list in the given element 
     """
-    response = requests.get(
+    response = onshape.get(
         os.path.join(
             user.os_domain, 
             "api/{}/d/{}/w/{}/e/{}/features".format(
                 user.etype, user.did, user.wid, user.eid
             )
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-            "Authorization": "Bearer " + user.access_token
-        }
+        auth_token=user.access_token
     )
     if response.ok: 
         return response.json() 
@@ -1774,21 +2052,35 @@ def get_feature_list(user: AuthUser) -> Any:
         return None 
 
 
+async def aget_feature_list(user: AuthUser) -> Any: 
+    """ Asynchronous version of :func:`get_feature_list` 
+    """
+    response = await onshape.aget(
+        os.path.join(
+            user.os_domain, 
+            "api/{}/d/{}/w/{}/e/{}/features".format(
+                user.etype, user.did, user.wid, user.eid
+            )
+        ), 
+        auth_token=user.access_token
+    )
+    if response.is_success: 
+        return response.json() 
+    else: 
+        return None 
+
+
 def get_current_microversion(user: AuthUser) -> Optional[str]: 
     """ Get the current microversion of the user's working document 
     """
-    response = requests.get(
+    response = onshape.get(
         os.path.join(
             user.os_domain, 
             "api/documents/d/{}/w/{}/currentmicroversion".format(
                 user.did, user.wid
             )
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-            "Authorization": "Bearer " + user.access_token
-        }
+        auth_token=user.access_token
     )
     if response.ok: 
         return response.json()['microversion']
@@ -1796,18 +2088,32 @@ def get_current_microversion(user: AuthUser) -> Optional[str]:
         return None 
 
 
+async def aget_current_microversion(user: AuthUser) -> Optional[str]: 
+    """ Asynchronous version of :func:`get_current_microversion` 
+    """
+    response = await onshape.aget(
+        os.path.join(
+            user.os_domain, 
+            "api/documents/d/{}/w/{}/currentmicroversion".format(
+                user.did, user.wid
+            )
+        ), 
+        auth_token=user.access_token
+    )
+    if response.is_success: 
+        return response.json()['microversion']
+    else: 
+        return None 
+
+
 def get_elements(did: str, vid: str, auth_token: str, elementId=None) -> Any: 
     """ Get all elements in a document's version and their information 
     """
-    response = requests.get(
+    response = onshape.get(
         "https://cad.onshape.com/api/documents/d/{}/v/{}/elements".format(
             did, vid
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-            "Authorization" : "Bearer " + auth_token
-        }, 
+        auth_token=auth_token, 
         params={
             "elementId": elementId
         }
@@ -1829,18 +2135,14 @@ def insert_ps_to_ps(
         The featureId of the successfully created derived feature; 
         None otherwise. 
     """
-    response = requests.post(
+    response = onshape.post(
         os.path.join(
             user.os_domain, 
             "api/partstudios/d/{}/w/{}/e/{}/features".format(
                 user.did, user.wid, user.eid
             )
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-            "Authorization" : "Bearer " + user.access_token
-        }, 
+        auth_token=user.access_token, 
         json={
                 "feature": {
                 "btType": "BTMFeature-134",
@@ -1884,18 +2186,14 @@ def create_assembly_instance(
     """ Insert all parts from a part studio (version) to a working assembly as 
     instances 
     """
-    response = requests.post(
+    response = onshape.post(
         os.path.join(
             user.os_domain, 
             "api/assemblies/d/{}/w/{}/e/{}/instances".format(
                 user.did, user.wid, user.eid
             )
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-            "Authorization" : "Bearer " + user.access_token
-        }, 
+        auth_token=user.access_token, 
         json={
             'documentId': s_did, 
             'versionId': s_vid, 
@@ -1909,18 +2207,14 @@ def create_assembly_instance(
 def get_assembly_definition(
     user: AuthUser, includeMateFeatures=True, includeMateConnectors=True
 ) -> Any: 
-    response = requests.get(
+    response = onshape.get(
         os.path.join(
             user.os_domain, 
             "api/assemblies/d/{}/w/{}/e/{}".format(
                 user.did, user.wid, user.eid
             )
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-            "Authorization" : "Bearer " + user.access_token
-        }, 
+        auth_token=user.access_token, 
         params={
             "includeMateFeatures": includeMateFeatures, 
             "includeMateConnectors": includeMateConnectors
@@ -1932,21 +2226,41 @@ def get_assembly_definition(
         return None 
 
 
+async def aget_assembly_definition(
+    user: AuthUser, includeMateFeatures=True, includeMateConnectors=True
+) -> Any: 
+    """ Asynchronous version of :func:`get_assembly_definition` 
+    """
+    response = await onshape.aget(
+        os.path.join(
+            user.os_domain, 
+            "api/assemblies/d/{}/w/{}/e/{}".format(
+                user.did, user.wid, user.eid
+            )
+        ), 
+        auth_token=user.access_token, 
+        params={
+            "includeMateFeatures": includeMateFeatures, 
+            "includeMateConnectors": includeMateConnectors
+        }
+    )
+    if response.is_success: 
+        return response.json() 
+    else: 
+        return None 
+
+
 def get_part_list(
     domain: str, did: str, wvm: str, wvmid: str, eid: str, auth_token: str
 ) -> Any: 
-    response = requests.get(
+    response = onshape.get(
         os.path.join(
             domain, 
             "api/parts/d/{}/{}/{}/e/{}".format(
                 did, wvm, wvmid, eid
             )
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-            "Authorization" : "Bearer " + auth_token
-        }
+        auth_token=auth_token
     )
     if response.ok: 
         return response.json() 
@@ -1954,16 +2268,12 @@ def get_part_list(
         return None 
 
 def get_user_name(user: AuthUser) -> Any: 
-    response = requests.get(
+    response = onshape.get(
         os.path.join(
             user.os_domain, 
             "api/users/sessioninfo"
         ), 
-        headers={
-            "Content-Type": "application/json", 
-            "Accept": "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09", 
-            "Authorization" : "Bearer " + user.access_token
-        }
+        auth_token=user.access_token
     )
     if response.ok:
         response = response.json()
@@ -1972,45 +2282,205 @@ def get_user_name(user: AuthUser) -> Any:
         return None 
 
 #################### Other helper functions ####################
-def plot_dist(
-    dist_data: npt.ArrayLike, label_val: Union[float, bool], label_avg=True, 
-    x_label="", y_label="Number of Users"
-) -> str: 
-    """ Ploot distribution of the given data and label relative position 
-    of the user in the distribution. 
+# Fields of :model:`questioner.Question` displayed in the question lists 
+QUESTION_CARD_FIELDS = [
+    "question_id", "question_type", "question_name", "difficulty", "allowed_etype", 
+    "is_published", "completion_count", "reviewer_completion_count", 
+    "completion_stats", "thumbnail_etag", "question_msps__is_multi_part"
+]
+
+
+def catalog_version() -> int: 
+    """ Current version of the question catalog """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None: 
+        cache.add(CATALOG_VERSION_KEY, 1, None)
+        version = cache.get(CATALOG_VERSION_KEY, 1)
+    return version 
+
+
+def bump_catalog_version() -> None: 
+    """ Invalidate the cached question catalog, e.g., after a question or a certificate 
+    is saved, published or deleted (completions are not part of the catalog) 
+    """
+    try: 
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError: # no version yet 
+        cache.add(CATALOG_VERSION_KEY, 1, None)
+    return None 
+
+
+@receiver(post_delete, sender=Certificate)
+@receiver(post_delete, sender=Question)
+def _bump_catalog_on_delete(sender, **kwargs) -> None: 
+    # Bulk deletes (e.g., in the admin) do not call the models' delete 
+    bump_catalog_version() 
+
+
+def question_catalog(published_only=False) -> List[Question]: 
+    """ Snapshot of the question cards listed in :view:`questioner.views.index`, each 
+    labelled with the certificate it counts towards (``cert_type``), with separate 
+    snapshots of published questions (for users) and all questions (for reviewers). 
+
+    Snapshots are cached by the catalog version for ``CATALOG_CACHE_TTL`` seconds, 
+    so they are only rebuilt after the catalog changes. The completion counters of 
+    the snapshots are outdated after new completions; see ``completion_counters``. 
+    """
+    cache_key = "catalog:{}:{}".format(catalog_version(), "published" if published_only else "all")
+    questions = cache.get(cache_key)
+    if questions is None: 
+        cert_type_map = {}
+        for certificate in Certificate.objects.defer('drawing_jpeg').order_by('certificate_name'):
+            for question_id in certificate.required_challenges:
+                cert_type_map[question_id] = certificate.certificate_name
+        questions = list(question_cards(published_only=published_only))
+        for question in questions: 
+            question.cert_type = cert_type_map.get(question.question_id, None)
+        cache.set(cache_key, questions, settings.CATALOG_CACHE_TTL)
+    return questions 
+
+
+def completion_counters() -> Dict[int, Dict[str, Any]]: 
+    """ Completion counts and average time spent (``avg_time``) of every question, 
+    shown with the cached question catalog. They are read in one query and cached 
+    for ``COMPLETION_COUNTER_CACHE_TTL`` seconds, rather than invalidating the 
+    catalog on every completion. 
+    """
+    counters = cache.get(COMPLETION_COUNTERS_CACHE_KEY)
+    if counters is None: 
+        counters = {
+            question.question_id: {
+                "completion_count": question.completion_count, 
+                "reviewer_completion_count": question.reviewer_completion_count, 
+                "avg_time": question.get_avg_time() 
+            }
+            for question in Question.objects.only(
+                "question_id", "completion_count", "reviewer_completion_count", "completion_stats"
+            )
+        }
+        cache.set(COMPLETION_COUNTERS_CACHE_KEY, counters, settings.COMPLETION_COUNTER_CACHE_TTL)
+    return counters 
+
+
+def question_cards(published_only=False) -> models.QuerySet: 
+    """ Lightweight "question card" representation of all questions for the question lists, 
+    ordered by name. Only ``QUESTION_CARD_FIELDS`` are loaded, leaving the heavy columns 
+    (e.g., images and reference model properties) in the database. 
+    """
+    questions = Question.objects.select_related("question_msps").only(*QUESTION_CARD_FIELDS)
+    if published_only: 
+        questions = questions.filter(is_published=True)
+    return questions.order_by("question_name")
+
+
+def histogram_bins(
+    records: models.QuerySet, field: str, scale=1.0, n_bins=10
+) -> Optional[Dict[str, Any]]: 
+    """ Histogram bins (same as ``numpy.histogram``) of a numeric field of the given 
+    records, counted in SQL and stored as JSON; values are multiplied by ``scale`` 
+    (e.g., to convert seconds to minutes). Returns ``None`` if there are no records. 
+    """
+    agg = records.aggregate(n=Count("pk"), lo=Min(field), hi=Max(field), mean=Avg(field))
+    if not agg["n"]: 
+        return None 
+    lo, hi = agg["lo"] * scale, agg["hi"] * scale 
+    if lo == hi: 
+        lo, hi = lo - 0.5, hi + 0.5 
+    edges = np.linspace(lo, hi, n_bins + 1)
+    raw_edges = edges / scale 
+    # Make sure rounding does not leave the extreme values out of the bins 
+    raw_edges[0] = min(raw_edges[0], agg["lo"])
+    raw_edges[-1] = max(raw_edges[-1], agg["hi"])
+    counts = records.aggregate(**{
+        "bin_{}".format(i): Count("pk", filter=Q(**{
+            field + "__gte": raw_edges[i], 
+            # The last bin includes its right edge 
+            field + ("__lte" if i == n_bins - 1 else "__lt"): raw_edges[i + 1]
+        }))
+        for i in range(n_bins)
+    })
+    return {
+        "n": agg["n"], 
+        "counts": [counts["bin_{}".format(i)] for i in range(n_bins)], 
+        "edges": edges.tolist(), 
+        "mean": agg["mean"] * scale
+    }
+
+
+def render_histogram(
+    bins: Dict[str, Any], label_avg=True, x_label="", y_label="Number of Users"
+) -> Dict[str, Any]: 
+    """ Render the histogram of the given bins as a PNG image, together with the 
+    pixel position above every bar where the "Me" marker is drawn by ``plot_dist`` 
     """
     # Plot 
     fig = Figure() 
     ax = fig.add_subplot(1, 1, 1)
-    ax.hist(dist_data)
+    edges = np.array(bins["edges"])
+    ax.hist(edges[:-1], bins=edges, weights=bins["counts"])
     if label_avg: 
         ax.axvline(
-            np.mean(dist_data), ls='--', c='k', label="Average"
+            bins["mean"], ls='--', c='k', label="Average"
         )
         ax.legend() 
     ax.set_xlabel(x_label)
     ax.set_ylabel(y_label)
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw() 
+    # Marker positions in image pixels (from the top left corner) 
+    height = canvas.get_width_height()[1]
+    anchors = []
+    for patch in ax.patches: 
+        x, y = ax.transData.transform(
+            (patch.get_x() + patch.get_width() / 2, patch.get_height() + 0.1)
+        )
+        anchors.append((patch.get_x(), patch.get_width(), float(x), height - float(y)))
+    # Data conversion 
+    img_output = io.BytesIO() 
+    canvas.print_png(img_output)
+    return {"png": img_output.getvalue(), "anchors": anchors}
+
+
+@lru_cache(maxsize=None)
+def marker_font() -> ImageFont.FreeTypeFont: 
+    """ Font of the "Me" marker, matching the default font of the plots """
+    return ImageFont.truetype(
+        font_manager.findfont(font_manager.FontProperties()), 
+        size=round(rcParams["font.size"] * rcParams["figure.dpi"] / 72)
+    )
+
+
+def plot_dist(
+    bins: Dict[str, Any], label_val: Union[float, bool], label_avg=True, 
+    x_label="", y_label="Number of Users", cache_key: Optional[str] = None
+) -> str: 
+    """ Ploot distribution of the given histogram bins and label relative position 
+    of the user in the distribution. 
+
+    The plot without the label is the same for all users, so it is rendered once 
+    and cached by ``cache_key`` (which should change with the data, e.g., include 
+    the number of completions); the label is drawn onto the cached image. 
+    """
+    rendered = cache.get("histogram:" + cache_key) if cache_key else None 
+    if rendered is None: 
+        rendered = render_histogram(bins, label_avg=label_avg, x_label=x_label, y_label=y_label)
+        if cache_key: 
+            cache.set("histogram:" + cache_key, rendered, settings.HISTOGRAM_CACHE_TTL)
+    img_data = rendered["png"]
     # Label my position in the distribution
     if label_val: 
-        patches = ax.patches
-        for patch in list(reversed(patches)): 
-            if (
-                round(patch.get_x(), 2) <= label_val and 
-                round(patch.get_x() + patch.get_width(), 2) >= label_val
-            ): 
+        for x, width, px, py in reversed(rendered["anchors"]): 
+            if round(x, 2) <= label_val and round(x + width, 2) >= label_val: 
                 # Mark where the user is at
-                ax.text(
-                    patch.get_x() + patch.get_width() / 2, 
-                    patch.get_height() + 0.1, 
-                    "Me", ha="center", va="bottom"
+                image = Image.open(io.BytesIO(img_data))
+                ImageDraw.Draw(image).text(
+                    (px, py), "Me", fill="black", font=marker_font(), anchor="md"
                 )
+                img_output = io.BytesIO() 
+                image.save(img_output, format="PNG")
+                img_data = img_output.getvalue() 
                 break 
-    # Data conversion 
-    img_output = io.BytesIO() 
-    FigureCanvasAgg(fig).print_png(img_output)
-    img_output.seek(0)
-    img_data = base64.b64encode(img_output.read())
-    return "data:image/png;base64," + str(img_data)[2:-1]
+    return "data:image/png;base64," + base64.b64encode(img_data).decode("ascii")
 
 
 def single_part_geo_check(
@@ -0,0 +1,277 @@
+"""
+Onshape API client shared by the questioner and data_miner apps
+
+All HTTP requests to Onshape (REST API and OAuth) should be made through this
+module, such that:
+
+- Every process keeps one pooled keep-alive ``requests.Session``, so repeated
+  calls to the same Onshape host reuse the TCP/TLS connection instead of
+  performing a new handshake for every call
+- Request headers are constructed in one place
+- Connect and read timeouts are applied to every call, configured through
+  ``ONSHAPE_CONNECT_TIMEOUT`` and ``ONSHAPE_READ_TIMEOUT`` in the settings
+- Independent calls can be fanned out concurrently with :func:`fetch_all`
+
+Async views use the ``httpx`` counterparts (:func:`arequest`, :func:`aget`,
+:func:`apost`), which share one pooled ``httpx.AsyncClient`` per event loop.
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from typing import Optional, Tuple, Dict, Callable, Any
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+# Default content negotiation for the Onshape REST API
+JSON_ACCEPT = "application/vnd.onshape.v2+json;charset=UTF-8;qs=0.09"
+BLOB_ACCEPT = "application/octet-stream;charset=UTF-8;qs=0.09"
+GLTF_ACCEPT = "model/gltf-binary;qs=0.08"
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_session() -> requests.Session:
+    """ Get the pooled session of the current process
+
+    A new session is created after a fork (e.g., in RQ work horses), since
+    sockets of the parent process must not be shared with the child process.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=settings.ONSHAPE_POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+                _session_pid = pid
+    return _session
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """ Get the thread pool of the current process used by :func:`fetch_all`
+    """
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _session_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.ONSHAPE_POOL_SIZE,
+                    thread_name_prefix="onshape"
+                )
+                _executor_pid = pid
+    return _executor
+
+
+def acquire_slot(key: str, until: float) -> Optional[Tuple[str, str]]:
+    """ Take one of the ``ONSHAPE_USER_CONCURRENCY`` call slots of the ``key``
+    (e.g., a user), which are shared by all processes (e.g., RQ work horses)
+    through the cache, waiting for a free slot until the ``until`` time (of
+    ``time.monotonic``)
+
+    Returns the slot and the token held in it for :func:`release_slot`, or
+    ``None`` if no slot was free in time. Slots are leased for
+    ``ONSHAPE_FETCH_DEADLINE`` seconds, so slots of crashed processes are freed.
+    """
+    token = uuid.uuid4().hex
+    while True:
+        for i in range(settings.ONSHAPE_USER_CONCURRENCY):
+            slot = "onshape-slot:{}:{}".format(key, i)
+            if cache.add(slot, token, settings.ONSHAPE_FETCH_DEADLINE):
+                return slot, token
+        if time.monotonic() >= until:
+            return None
+        time.sleep(0.1)
+
+
+def release_slot(slot: str, token: str) -> None:
+    """ Free a slot taken by :func:`acquire_slot`, unless its lease has expired
+    and it has been taken by another call
+    """
+    if cache.get(slot) == token:
+        cache.delete(slot)
+    return None
+
+
+def api_headers(auth_token: Optional[str] = None, accept=JSON_ACCEPT) -> Dict[str, str]:
+    """ Construct the standard headers of an Onshape API call
+    """
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": accept
+    }
+    if auth_token:
+        headers["Authorization"] = "Bearer " + auth_token
+    return headers
+
+
+def request(
+    method: str, url: str, auth_token: Optional[str] = None,
+    accept=JSON_ACCEPT, headers: Optional[Dict[str, str]] = None, **kwargs: Any
+) -> requests.Response:
+    """ Make an API call through the pooled session of the current process
+
+    If ``headers`` is not given, the standard Onshape API headers are used.
+    Connection errors and timeouts are returned as a ``504`` response, such
+    that callers can keep checking ``response.ok`` only.
+    """
+    if headers is None:
+        headers = api_headers(auth_token, accept=accept)
+    kwargs.setdefault(
+        "timeout",
+        (settings.ONSHAPE_CONNECT_TIMEOUT, settings.ONSHAPE_READ_TIMEOUT)
+    )
+    try:
+        return get_session().request(method, url, headers=headers, **kwargs)
+    except requests.RequestException as err:
+        response = requests.Response()
+        response.status_code = 504
+        response.reason = str(err)
+        response._content = b""
+        response.url = url
+        return response
+
+
+def get(url: str, auth_token: Optional[str] = None, **kwargs: Any) -> requests.Response:
+    """ GET request to Onshape; see :func:`request`
+    """
+    return request("GET", url, auth_token=auth_token, **kwargs)
+
+
+def post(url: str, auth_token: Optional[str] = None, **kwargs: Any) -> requests.Response:
+    """ POST request to Onshape; see :func:`request`
+    """
+    return request("POST", url, auth_token=auth_token, **kwargs)
+
+
+def fetch_all(
+    deadline: Optional[float] = None, concurrency_key: Optional[str] = None,
+    **calls: Callable[[], Any]
+) -> Dict[str, Any]:
+    """ Run independent Onshape helper calls and collect their results by name
+
+    With ``ONSHAPE_CONCURRENT_CALLS`` enabled, all calls are issued at the same
+    time on the thread pool of the process and share one overall ``deadline``
+    (``ONSHAPE_FETCH_DEADLINE`` seconds by default); otherwise, they are called
+    one after another. A call that raises or does not finish before the
+    deadline gives ``None``, which the helpers already use to signal a failed
+    API call.
+
+    Calls given a ``concurrency_key`` (e.g., the user's ID) are limited to
+    ``ONSHAPE_USER_CONCURRENCY`` at a time together with the calls of all
+    processes with the same key (see :func:`acquire_slot`); a call that gets no
+    slot before the deadline gives ``None``.
+
+    Example: ``fetch_all(features=partial(get_feature_list, user), ...)``
+    """
+    if not settings.ONSHAPE_CONCURRENT_CALLS or len(calls) <= 1:
+        results = {}
+        for name, call in calls.items():
+            try:
+                results[name] = call()
+            except Exception:
+                results[name] = None
+        return results
+
+    if deadline is None:
+        deadline = settings.ONSHAPE_FETCH_DEADLINE
+    if concurrency_key is not None:
+        until = time.monotonic() + deadline
+
+        def limited(call: Callable[[], Any]) -> Any:
+            slot = acquire_slot(concurrency_key, until)
+            if slot is None:
+                return None
+            try:
+                return call()
+            finally:
+                release_slot(*slot)
+
+        calls = {name: partial(limited, call) for name, call in calls.items()}
+    futures = {
+        name: get_executor().submit(call) for name, call in calls.items()
+    }
+    wait(futures.values(), timeout=deadline)
+
+    results = {}
+    for name, future in futures.items():
+        if future.done() and not future.exception():
+            results[name] = future.result()
+        else:
+            future.cancel()
+            results[name] = None
+    return results
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """ Get the pooled async client of the running event loop
+
+    One ASGI worker (the ``web`` process, see ``mysite/asgi.py``) runs one
+    event loop, so all requests served by the worker share the same
+    connection pool.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.ONSHAPE_READ_TIMEOUT,
+                connect=settings.ONSHAPE_CONNECT_TIMEOUT
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.ONSHAPE_ASYNC_POOL_SIZE,
+                max_keepalive_connections=settings.ONSHAPE_POOL_SIZE
+            )
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def arequest(
+    method: str, url: str, auth_token: Optional[str] = None,
+    accept=JSON_ACCEPT, headers: Optional[Dict[str, str]] = None, **kwargs: Any
+) -> httpx.Response:
+    """ Asynchronous version of :func:`request`; check ``response.is_success``
+    for the outcome of the call
+    """
+    if headers is None:
+        headers = api_headers(auth_token, accept=accept)
+    try:
+        return await get_async_client().request(method, url, headers=headers, **kwargs)
+    except httpx.HTTPError:
+        return httpx.Response(504, request=httpx.Request(method, url))
+
+
+async def aget(url: str, auth_token: Optional[str] = None, **kwargs: Any) -> httpx.Response:
+    """ Asynchronous GET request to Onshape; see :func:`arequest`
+    """
+    return await arequest("GET", url, auth_token=auth_token, **kwargs)
+
+
+async def apost(url: str, auth_token: Optional[str] = None, **kwargs: Any) -> httpx.Response:
+    """ Asynchronous POST request to Onshape; see :func:`arequest`
+    """
+    return await arequest("POST", url, auth_token=auth_token, **kwargs)
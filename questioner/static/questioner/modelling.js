@@ -4,4 +4,22 @@ function home_confirm_alert() {
 
 function give_up_confirm_alert() {
     return confirm("Warning, your modeling time will be reset and you will need to restart the challenge. To directly compare your part to the reference, click continue.");
-}
\ No newline at end of file
+}
+
+function poll_evaluation(status_url, result_url) {
+    // Check the status of the submission evaluation until it is done, 
+    // then load the page presenting the evaluation outcome (or the error 
+    // of a failed, stopped, canceled, or missing evaluation) 
+    fetch(status_url)
+        .then(response => response.json())
+        .then(data => {
+            if (["queued", "started", "deferred", "scheduled"].includes(data.status)) {
+                setTimeout(function() { poll_evaluation(status_url, result_url); }, 1000);
+            } else if (["finished", "failed", "stopped", "canceled", "missing"].includes(data.status)) {
+                window.location.href = result_url;
+            }
+        })
+        .catch(() => {
+            setTimeout(function() { poll_evaluation(status_url, result_url); }, 2000);
+        });
+}
@@ -1,3 +1,662 @@
-from django.test import TestCase
+import io
+import time
+import base64
+import threading
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from PIL import Image
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.core.cache import cache
+from django.db import models
+from django.utils import timezone
+
+from .models import *
+from . import onshape, views
+
+
+def create_user(os_user_id: str = "user-1", **kwargs) -> AuthUser:
+    """ An Onshape user with valid tokens working in a Part Studio
+    """
+    fields = {
+        "os_domain": "https://cad.onshape.com",
+        "did": "d", "wid": "w", "eid": "e", "etype": "partstudios",
+        "access_token": "token", "refresh_token": "refresh",
+        "expires_at": timezone.now() + timezone.timedelta(hours=1),
+        "last_start": timezone.now() - timezone.timedelta(minutes=5)
+    }
+    fields.update(kwargs)
+    return AuthUser.objects.create(os_user_id=os_user_id, **fields)
+
+
+def create_question(**kwargs) -> Question_SPPS:
+    """ A published SPPS question saved without the Onshape calls of
+    ``Question_SPPS.save``
+    """
+    fields = {
+        "question_type": QuestionType.SINGLE_PART_PS,
+        "question_name": "Question", "etype": "partstudios",
+        "did": "qd", "vid": "qv", "eid": "qe", "ref_mid": "qm",
+        "is_published": True, "is_collecting_data": True,
+        "thumbnail": "data:thumbnail", "drawing_jpeg": "data:drawing",
+        "thumbnail_etag": "thumbnail", "drawing_etag": "drawing"
+    }
+    fields.update(kwargs)
+    question = Question_SPPS(**fields)
+    models.Model.save(question)
+    return question
+
+
+class EvaluationCacheTests(TestCase):
+    """ Repeated submissions served from the evaluation cache behave as the
+    evaluations they replace
+    """
+    MISMATCH = "Mass does not match"
+    NO_PARTS = "No parts found - please model the part then try re-submitting."
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.question = create_question()
+        for target, value in [
+            ("get_current_microversion", "mid-1"),
+            ("should_collect_data", True),
+            ("collect_fail_data", None)
+        ]:
+            patcher = mock.patch.object(views, target, return_value=value)
+            setattr(self, target, patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def mock_evaluate(self, message: str, is_mismatch: bool):
+        """ Mimic ``Question_SPPS.evaluate`` failing with the given message
+        """
+        def evaluate(question, user):
+            if is_mismatch and not user.end_mid:
+                user.end_mid = "mid-1"
+                user.save()
+                return message, True
+            return message, False
+        patcher = mock.patch.object(Question_SPPS, "evaluate", autospec=True, side_effect=evaluate)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def submit(self) -> dict:
+        return views.evaluate_submission(
+            self.question.question_type, self.question.question_id, self.user.os_user_id
+        )
+
+    def new_attempt(self):
+        AuthUser.objects.filter(pk=self.user.pk).update(end_mid=None)
+
+    def test_repeated_mismatch_is_served_from_cache(self):
+        evaluate = self.mock_evaluate(self.MISMATCH, is_mismatch=True)
+        self.assertEqual(self.submit(), {"model_comparison": self.MISMATCH})
+        self.assertEqual(self.submit(), {"model_comparison": self.MISMATCH})
+        self.assertEqual(evaluate.call_count, 1)
+        self.assertEqual(self.collect_fail_data.call_count, 1)
+
+    def test_cached_mismatch_starts_the_failure_records_of_a_new_attempt(self):
+        evaluate = self.mock_evaluate(self.MISMATCH, is_mismatch=True)
+        self.submit()
+        self.new_attempt()
+        self.submit()
+        self.assertEqual(evaluate.call_count, 1)
+        self.assertEqual(AuthUser.objects.get(pk=self.user.pk).end_mid, "mid-1")
+        self.assertEqual(self.collect_fail_data.call_count, 2)
+
+    def test_cached_early_exit_does_not_start_failure_records(self):
+        evaluate = self.mock_evaluate(self.NO_PARTS, is_mismatch=False)
+        self.submit()
+        self.assertEqual(self.submit(), {"model_comparison": self.NO_PARTS})
+        self.assertEqual(evaluate.call_count, 1)
+        self.assertIsNone(AuthUser.objects.get(pk=self.user.pk).end_mid)
+        self.collect_fail_data.assert_not_called()
+
+    def test_failure_cached_after_first_failure_is_reevaluated_in_new_attempt(self):
+        AuthUser.objects.filter(pk=self.user.pk).update(end_mid="mid-0")
+        evaluate = self.mock_evaluate(self.NO_PARTS, is_mismatch=False)
+        self.submit()
+        self.submit()
+        self.assertEqual(evaluate.call_count, 1)
+        self.new_attempt()
+        self.submit()
+        self.assertEqual(evaluate.call_count, 2)
+        self.collect_fail_data.assert_not_called()
+
+    def test_new_reference_version_is_reevaluated(self):
+        evaluate = self.mock_evaluate(self.MISMATCH, is_mismatch=True)
+        self.submit()
+        Question_SPPS.objects.filter(pk=self.question.pk).update(vid="qv-2")
+        self.submit()
+        self.assertEqual(evaluate.call_count, 2)
+
+
+@override_settings(
+    ASYNC_EVALUATION=True,
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage"
+)
+class CheckModelTests(TestCase):
+    """ The modelling page presents evaluation jobs of the submitting user,
+    question, and step only, and stops waiting for jobs that will not finish
+    """
+    def setUp(self):
+        self.user = create_user()
+        self.question = create_question()
+        self.url = reverse("questioner:check", args=[
+            self.question.question_type, self.question.question_id, self.user.os_user_id
+        ])
+        self.job = mock.Mock(id="job-1", args=[
+            self.question.question_type, self.question.question_id, self.user.os_user_id, 1
+        ])
+        queue = mock.Mock(**{"fetch_job.return_value": self.job})
+        patcher = mock.patch.object(views.django_rq, "get_queue", return_value=queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_stopped_and_canceled_jobs_are_not_polled_again(self):
+        for status in ["failed", "stopped", "canceled"]:
+            self.job.get_status.return_value = status
+            response = self.client.get(self.url + "?job=job-1")
+            self.assertContains(response, "An unexpected error has occurred")
+            self.assertNotContains(response, "poll_evaluation")
+
+    def test_pending_job_is_polled(self):
+        self.job.get_status.return_value = "started"
+        response = self.client.get(self.url + "?job=job-1")
+        self.assertContains(response, "poll_evaluation")
+
+    def test_job_of_another_question_is_not_presented(self):
+        other = create_question(question_name="Other question")
+        self.job.args = [other.question_type, other.question_id, self.user.os_user_id, 1]
+        self.job.get_status.return_value = "finished"
+        response = self.client.get(self.url + "?job=job-1")
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(OAUTH_REFRESH_LOCK_TIMEOUT=1)
+class OAuthRefreshTests(TestCase):
+    """ The OAuth tokens of a user are refreshed once by concurrent callers
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = create_user(expires_at=timezone.now())
+        self.lock_key = "oauth-refresh:" + self.user.os_user_id
+        patcher = mock.patch.object(AuthUser, "_oauth_refresh_url", return_value="url")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def mock_post(self, side_effect=None):
+        response = mock.Mock(**{"json.return_value": {
+            "access_token": "new-token", "refresh_token": "new-refresh", "expires_in": 3600
+        }})
+        patcher = mock.patch.object(onshape, "post", return_value=response, side_effect=side_effect)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_outdated_tokens_are_not_refreshed_again(self):
+        post = self.mock_post()
+        stale_user = AuthUser.objects.get(pk=self.user.pk)
+        self.user.refresh_oauth_token()
+        stale_user.refresh_oauth_token()
+        self.assertEqual(post.call_count, 1)
+        self.assertEqual(stale_user.access_token, "new-token")
+        self.assertIsNone(cache.get(self.lock_key))
+
+    def test_waits_for_the_refresh_in_progress(self):
+        post = self.mock_post()
+        cache.set(self.lock_key, "other", 1)
+        self.user.refresh_oauth_token()
+        post.assert_not_called()
+
+    def test_lock_taken_over_after_expiry_is_kept(self):
+        def slow_post(*args, **kwargs):
+            cache.set(self.lock_key, "other", 10) # lock expired and re-taken
+            return mock.DEFAULT
+        self.mock_post(side_effect=slow_post)
+        self.user.refresh_oauth_token()
+        self.assertEqual(cache.get(self.lock_key), "other")
+
+
+class OAuthRenewalTests(TestCase):
+    """ The periodic token renewal job keeps exactly one schedule running
+    """
+    def setUp(self):
+        cache.clear()
+        self.queue = mock.Mock(is_async=True)
+        patcher = mock.patch("questioner.models.django_rq.get_queue", return_value=self.queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_job(self, job_id: str) -> int:
+        with mock.patch("questioner.models.get_current_job", return_value=mock.Mock(id=job_id)):
+            return renew_oauth_tokens()
+
+    def test_schedule_replaces_previous_runs(self):
+        self.queue.scheduled_job_registry.get_job_ids.return_value = []
+        self.queue.job_class.fetch_many.return_value = []
+        schedule_oauth_renewal()
+        job_id = self.queue.enqueue.call_args.kwargs["job_id"]
+        self.assertEqual(cache.get(OAUTH_RENEWAL_JOB_KEY), job_id)
+
+        self.run_job("replaced-job")
+        self.queue.enqueue_in.assert_not_called()
+        self.run_job(job_id)
+        self.assertEqual(
+            cache.get(OAUTH_RENEWAL_JOB_KEY), self.queue.enqueue_in.call_args.kwargs["job_id"]
+        )
+
+    def test_reschedules_when_renewal_fails(self):
+        cache.set(OAUTH_RENEWAL_JOB_KEY, "job")
+        with mock.patch.object(AuthUser.objects, "filter", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.run_job("job")
+        self.queue.enqueue_in.assert_called_once()
+
+    def test_renewed_tokens_survive_saves_of_loaded_users(self):
+        user = create_user(is_modelling=True, expires_at=timezone.now())
+        stale = AuthUser.objects.get(pk=user.pk) # e.g., held by an evaluation job
+        cache.set(OAUTH_RENEWAL_JOB_KEY, "job")
+        response = mock.Mock(**{"json.return_value": {
+            "access_token": "new-token", "refresh_token": "new-refresh", "expires_in": 3600
+        }})
+        with mock.patch.object(AuthUser, "_oauth_refresh_url", return_value="url"), \
+                mock.patch.object(onshape, "post", return_value=response):
+            self.assertEqual(self.run_job("job"), 1)
+
+        stale.end_mid = "m"
+        stale.save()
+        user.refresh_from_db()
+        self.assertEqual((user.access_token, user.refresh_token), ("new-token", "new-refresh"))
+        self.assertEqual(user.end_mid, "m")
+
+
+class AdminTokenTests(TestCase):
+    """ Question management calls share the cached token of the main admin
+    """
+    def setUp(self):
+        cache.clear()
+        invalidate_admin_token()
+        self.addCleanup(invalidate_admin_token)
+        self.admin = create_user("admin-1", is_reviewer=True)
+        Reviewer.objects.bulk_create([
+            Reviewer(os_user_id="admin-1", user_name="Admin", is_main_admin=True)
+        ])
+
+    def test_token_is_cached(self):
+        self.assertEqual(get_admin_token(), "token")
+        AuthUser.objects.filter(pk=self.admin.pk).update(access_token="other")
+        with self.assertNumQueries(0):
+            self.assertEqual(get_admin_token(), "token")
+        invalidate_admin_token()
+        self.assertEqual(get_admin_token(), "other")
+
+    def test_token_close_to_expiry_is_refreshed(self):
+        AuthUser.objects.filter(pk=self.admin.pk).update(expires_at=timezone.now())
+        def refresh(user):
+            user.access_token = "new-token"
+            user.expires_at = timezone.now() + timezone.timedelta(hours=1)
+        with mock.patch.object(AuthUser, "refresh_oauth_token", autospec=True, side_effect=refresh) as refresh_token:
+            self.assertEqual(get_admin_token(), "new-token")
+            self.assertEqual(get_admin_token(), "new-token")
+        refresh_token.assert_called_once()
+
+    def test_no_main_admin(self):
+        Reviewer.objects.all().delete()
+        with self.assertRaises(ValidationError):
+            get_admin_token()
+
+
+class ImageTests(TestCase):
+    """ Images are served by their content hash and revalidated without being read
+    """
+    def test_image_is_served_and_revalidated(self):
+        etag = store_image("data:image/png;base64,aW1hZ2U=")
+        self.assertEqual(store_image("data:image/png;base64,aW1hZ2U="), etag)
+        self.assertEqual(ImageBlob.objects.count(), 1)
+        url = reverse("questioner:image", args=[etag])
+        response = self.client.get(url)
+        self.assertEqual((response.status_code, response.content), (200, b"image"))
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertIn("immutable", response["Cache-Control"])
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get(reverse("questioner:image", args=["missing"])).status_code, 404)
+
+
+class CompletionRecordTests(TestCase):
+    """ Completions update the counters of a question in the database, and its
+    stats when they are next read
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.reviewer = create_user("reviewer-1", is_reviewer=True)
+        self.question = create_question()
+
+    def test_concurrent_completions_are_all_counted(self):
+        first = Question.objects.get(pk=self.question.pk)
+        second = Question.objects.get(pk=self.question.pk)
+        first.record_completion(self.user, 120, 5)
+        second.record_completion(self.reviewer, 240, 7)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.completion_count, 2)
+        self.assertEqual(self.question.reviewer_completion_count, 1)
+        self.assertEqual(second.completion_count, 2)
+
+    def test_stats_are_recomputed_after_new_completions(self):
+        self.question.record_completion(self.user, 120, 5)
+        self.assertEqual(self.question.get_completion_bins("time")["n"], 1)
+        self.question.record_completion(self.user, 240, 7)
+        question = Question.objects.get(pk=self.question.pk)
+        bins = question.get_completion_bins("time")
+        self.assertEqual(bins["n"], 2)
+        self.assertAlmostEqual(bins["mean"], 3.0)
+        self.assertEqual(question.get_completion_bins("features")["counts"][-1], 1)
+        self.assertEqual(Question.objects.get(pk=self.question.pk).completion_stats["count"], 2)
+
+    def test_stats_do_not_overwrite_counters(self):
+        stale = Question.objects.get(pk=self.question.pk)
+        self.question.record_completion(self.user, 120, 5)
+        stale.update_completion_stats()
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.completion_count, 1)
+        self.assertEqual(self.question.get_completion_bins("time")["n"], 1)
+
+    def test_stats_of_questions_without_completions_are_stored(self):
+        self.assertIsNone(self.question.get_completion_bins("time"))
+        question = Question.objects.get(pk=self.question.pk)
+        with self.assertNumQueries(0):
+            self.assertIsNone(question.get_completion_bins("time"))
+
+
+class CompletionPlotTests(TestCase):
+    """ Completion histograms are binned in SQL and rendered once for all users
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.question = create_question()
+        self.times = [30, 95, 100, 240, 600, 601]
+        for time_spent in self.times:
+            self.question.record_completion(self.user, time_spent, 5)
+
+    def test_bins_match_numpy(self):
+        records = CompletionRecord.objects.filter(question_id=self.question.question_id)
+        bins = histogram_bins(records, "time_spent", scale=1 / 60)
+        counts, edges = np.histogram(np.array(self.times) / 60, bins=10)
+        self.assertEqual(bins["counts"], counts.tolist())
+        np.testing.assert_allclose(bins["edges"], edges)
+        self.assertAlmostEqual(bins["mean"], np.mean(self.times) / 60)
+        self.assertEqual(histogram_bins(records.filter(time_spent=95), "time_spent")["counts"][5], 1)
+        self.assertIsNone(histogram_bins(records.none(), "time_spent"))
+
+    def test_plot_is_rendered_once(self):
+        bins = self.question.get_completion_bins("time")
+        with mock.patch("questioner.models.render_histogram", wraps=render_histogram) as render:
+            mine = plot_dist(bins, 1.6, cache_key="plot")
+            other = plot_dist(bins, 9.5, cache_key="plot")
+            unlabelled = plot_dist(bins, False, cache_key="plot")
+        render.assert_called_once()
+        self.assertEqual(len({mine, other, unlabelled}), 3)
+        self.assertTrue(mine.startswith("data:image/png;base64,"))
+
+
+class AttemptHistoryTests(TestCase):
+    """ The attempts of a user are read from the completion and failure records
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.question = create_question()
+
+    def test_completions_and_failures_are_recorded(self):
+        self.question.record_failure(self.user, 60)
+        for time_spent in [300, 120, 200]:
+            self.question.record_completion(self.user, time_spent, 5)
+        self.assertEqual(FailureRecord.objects.get(user=self.user).time_spent, 60)
+        self.assertEqual(self.question.get_user_completion(self.user).time_spent, 200)
+        self.assertEqual(self.question.get_user_completion(self.user, best=True).time_spent, 120)
+        self.assertEqual(len(self.user.completed_history[str(self.question)]), 3)
+
+    def test_data_is_collected_on_improvements_only(self):
+        self.assertTrue(views.should_collect_data(self.user, self.question))
+        for time_spent in [100, 100, 100, 90]:
+            self.question.record_completion(self.user, time_spent, 5)
+        self.assertFalse(views.should_collect_data(self.user, self.question))
+        self.question.record_completion(self.user, 70, 5)
+        self.assertTrue(views.should_collect_data(self.user, self.question))
+
+
+class DashboardTests(TestCase):
+    """ The dashboard summary of a user is built from their completions, and
+    cached until they complete another question
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.first = create_question(question_id=1, question_name="First", difficulty="EA")
+        self.second = create_question(question_id=2, question_name="Second", difficulty="CH")
+        Certificate.objects.bulk_create([
+            Certificate(certificate_name="Both", required_challenges=[1, 2], did="d", vid="v", jpeg_eid="j", drawing_eid="e"),
+            Certificate(certificate_name="First", required_challenges=[1], did="d", vid="v", jpeg_eid="j", drawing_eid="e")
+        ])
+
+    def test_summary(self):
+        self.first.record_completion(self.user, 125, 5)
+        self.first.record_completion(self.user, 60, 5)
+        summary = views.dashboard_summary(self.user)
+        self.assertEqual(summary["total_count"], 1)
+        self.assertEqual(summary["difficulty_count"], {"EA": 1, "ME": 0, "CH": 0})
+        self.assertEqual(summary["types_count"]["SPPS"], 1)
+        attempts = {question.question_id: getattr(question, "attempts", None) for question in summary["questions"]}
+        self.assertEqual(attempts, {1: ["2 min 5 sec", "1 min 0 sec"], 2: None})
+
+        both, first = summary["certificates"]
+        self.assertEqual((both[1], both[2], both[4], both[6]), ([1], [2], "", ["Second"]))
+        completed_at = CompletionRecord.objects.order_by("-pk")[0].completed_at
+        self.assertEqual(first[4], completed_at.strftime("%Y-%m-%d %H:%M:%S"))
+
+    def test_summary_is_cached_until_the_next_completion(self):
+        views.dashboard_summary(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(views.dashboard_summary(self.user)["total_count"], 0)
+        self.second.record_completion(self.user, 60, 5)
+        self.assertEqual(views.dashboard_summary(self.user)["total_count"], 1)
+
+
+def create_certificate(name: str, required_challenges, is_published=True, shade=255) -> Certificate:
+    """ A certificate with a blank template stored without the Onshape calls """
+    output = io.BytesIO()
+    Image.new("RGB", (3300, 2550), (shade, shade, shade)).save(output, format="PNG")
+    return Certificate.objects.create(
+        certificate_name=name, required_challenges=required_challenges, is_published=is_published,
+        did="d", vid="v", jpeg_eid="j", drawing_eid="e",
+        drawing_jpeg="data:image/png;base64," + base64.b64encode(output.getvalue()).decode()
+    )
+
+
+class CertificateRenderTests(TestCase):
+    """ Rendered certificates are cached until their template, the user's name or the date change
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.certificate = create_certificate("First", [1])
+        self.user_name = "User"
+        patcher = mock.patch("questioner.views.get_user_name", side_effect=lambda user: self.user_name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def render(self, cert_date="2026-10-17 10:00:00"):
+        with mock.patch("questioner.views.cert_template", wraps=views.cert_template) as template:
+            image = views.create_cert_png(self.user, self.certificate, cert_date)
+        return image, template.called
+
+    def test_render_is_cached(self):
+        image, rendered = self.render()
+        self.assertTrue(rendered)
+        self.assertEqual(self.render(), (image, False))
+
+    def test_changes_are_rendered(self):
+        image, _ = self.render()
+        images = {image}
+        image, rendered = self.render("2026-10-18 10:00:00")
+        self.assertTrue(rendered)
+        images.add(image)
+
+        self.user_name = "Renamed User"
+        cache.delete("user-name:" + self.user.os_user_id) # name cache expired
+        image, rendered = self.render()
+        self.assertTrue(rendered)
+        images.add(image)
+
+        self.certificate = create_certificate("Second", [1], shade=200)
+        image, rendered = self.render()
+        self.assertTrue(rendered)
+        images.add(image)
+        self.assertEqual(len(images), 4)
+
+
+@override_settings(STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage")
+class CertificatePrerenderTests(TestCase):
+    """ Certificates earned by a completion are rendered in the background
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.queue = mock.Mock()
+        patcher = mock.patch("questioner.views.django_rq.get_queue", return_value=self.queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for question_id in [1, 2]:
+            create_question(question_id=question_id, question_name=str(question_id))
+
+    def enqueued(self, question_id: int):
+        self.queue.enqueue.reset_mock()
+        views.enqueue_certificate_prerender(self.user, question_id)
+        return sorted(call.args[1] for call in self.queue.enqueue.call_args_list)
+
+    def test_newly_earned_certificates_are_enqueued(self):
+        both = create_certificate("Both", [1, 2])
+        first = create_certificate("First", [1])
+        second = create_certificate("Second", [2])
+        create_certificate("Unpublished", [1], is_published=False)
+        create_certificate("Empty", None)
+
+        Question.objects.get(question_id=1).record_completion(self.user, 60, 5)
+        self.assertEqual(self.enqueued(1), [first.id])
+        Question.objects.get(question_id=2).record_completion(self.user, 60, 5)
+        self.assertEqual(self.enqueued(2), [both.id, second.id])
+        completed_at = CompletionRecord.objects.order_by("-pk")[0].completed_at
+        self.assertEqual(
+            self.queue.enqueue.call_args.args[1:], (second.id, "user-1", completed_at.strftime("%Y-%m-%d %H:%M:%S"))
+        )
+
+    def test_unpublished_certificates_are_rendered_for_reviewers(self):
+        unpublished = create_certificate("Unpublished", [1], is_published=False)
+        self.user.is_reviewer = True
+        Question.objects.get(question_id=1).record_completion(self.user, 60, 5)
+        self.assertEqual(self.enqueued(1), [unpublished.id])
+
+    def test_prerendered_certificate_is_served(self):
+        certificate = create_certificate("First", [1])
+        cert_date = "2026-10-17 10:00:00"
+        with mock.patch("questioner.views.get_user_name", return_value="User") as get_user_name:
+            views.prerender_certificate(certificate.id, "user-1", cert_date)
+            with mock.patch("questioner.views.cert_template", side_effect=AssertionError):
+                response = self.client.get(reverse(
+                    "questioner:certificate", args=["user-1", certificate.id, cert_date]
+                ))
+        get_user_name.assert_called_once()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context["cert_image"], views.create_cert_png(self.user, certificate, cert_date)
+        )
+
+
+@override_settings(STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage")
+class IndexCacheTests(TestCase):
+    """ The index is rendered from the cached catalog, which completions do not
+    invalidate
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.question = create_question()
+        self.url = reverse("questioner:index", args=[self.user.os_user_id])
+
+    def test_steady_state_only_loads_the_user(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_completion_keeps_the_catalog(self):
+        self.client.get(self.url)
+        version = catalog_version()
+        self.question.record_completion(create_user("user-2"), 90, 3)
+        self.assertEqual(catalog_version(), version)
+
+        cache.delete(COMPLETION_COUNTERS_CACHE_KEY) # expired
+        response = self.client.get(self.url)
+        self.assertContains(response, "Number of times completed: 1")
+        self.assertContains(response, "Average time spent: 1 minutes 30 seconds")
+
+    def test_question_changes_renew_the_catalog(self):
+        self.client.get(self.url)
+        self.question.question_name = "Renamed question"
+        Question.save(self.question)
+        self.assertContains(self.client.get(self.url), "Renamed question")
+
+
+@override_settings(ONSHAPE_CONCURRENT_CALLS=True, ONSHAPE_USER_CONCURRENCY=2)
+class FetchAllTests(TestCase):
+    """ Independent Onshape calls are made concurrently within one deadline
+    """
+    def setUp(self):
+        cache.clear()
+
+    def test_failed_and_late_calls_give_none(self):
+        def fail():
+            raise ValueError
+        results = onshape.fetch_all(
+            deadline=0.2, ok=lambda: {"features": []}, empty=lambda: [], failed=fail,
+            late=lambda: time.sleep(1) or "late"
+        )
+        self.assertEqual(results, {"ok": {"features": []}, "empty": [], "failed": None, "late": None})
+
+    def test_calls_of_the_same_key_are_limited(self):
+        running, max_running = [0], [0]
+        lock = threading.Lock()
+
+        def call():
+            with lock:
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+            time.sleep(0.1)
+            with lock:
+                running[0] -= 1
+            return True
+
+        # Two jobs of the same user, e.g., a first failure and a final submission
+        jobs = [
+            threading.Thread(target=onshape.fetch_all, kwargs={
+                "concurrency_key": "user-1", **{str(i): call for i in range(3)}
+            })
+            for _ in range(2)
+        ]
+        for job in jobs:
+            job.start()
+        for job in jobs:
+            job.join()
+        self.assertEqual(max_running[0], 2)
+        self.assertIsNone(cache.get("onshape-slot:user-1:0"))
+
+    def test_calls_without_a_free_slot_give_none(self):
+        cache.set("onshape-slot:user-1:0", "other")
+        cache.set("onshape-slot:user-1:1", "other")
+        results = onshape.fetch_all(deadline=0.2, concurrency_key="user-1", a=lambda: 1, b=lambda: 2)
+        self.assertEqual(results, {"a": None, "b": None})
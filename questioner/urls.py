@@ -1,9 +1,11 @@
 from django.urls import path 
+from django.conf import settings
+from django.views.decorators.cache import cache_page
 from .import views
 
 app_name = 'questioner'
 urlpatterns = [
-    path('',views.home), 
+    path('',cache_page(settings.HOME_CACHE_TTL, key_prefix="home")(views.home)), 
     path('home/<str:os_user_id>/',views.home, name="home"),
     path('dashboard/<str:os_user_id>/',views.dashboard, name="dashboard"),
     path('certificate/<str:os_user_id>/<int:cert_id>/<str:cert_date>',views.certificate, name="certificate"),
@@ -14,7 +16,9 @@ urlpatterns = [
     path('modelling/<str:question_type>/<int:question_id>/<str:os_user_id>/<int:initiate>/<int:step>/', views.model, name='modelling'), 
     path('check/<str:question_type>/<int:question_id>/<str:os_user_id>/', views.check_model, name="check"), 
     path('check/<str:question_type>/<int:question_id>/<str:os_user_id>/<int:step>/', views.check_model, name="check"), 
+    path('check/status/<str:job_id>/', views.check_status, name="check_status"), 
     path('solution/<str:question_type>/<int:question_id>/<str:os_user_id>/', views.solution, name="solution"), 
     path('solution/<str:question_type>/<int:question_id>/<str:os_user_id>/<int:step>/', views.solution, name="solution"), 
-    path('complete/<str:question_type>/<int:question_id>/<str:os_user_id>/', views.complete, name="complete")
+    path('complete/<str:question_type>/<int:question_id>/<str:os_user_id>/', views.complete, name="complete"), 
+    path('image/<str:etag>/', views.image, name="image")
 ]
\ No newline at end of file
@@ -1,19 +1,28 @@
 import os 
-import requests
+import hashlib 
 from math import floor
-from datetime import timedelta, date
-from typing import Union 
+from datetime import datetime, timedelta, date
+from typing import Union, Optional, Tuple, Dict, List, Any 
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 
+import django_rq
+from asgiref.sync import sync_to_async
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse 
-from django.http import HttpRequest, HttpResponse, HttpResponseRedirect, HttpResponseNotFound
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect, HttpResponseNotFound, JsonResponse, Http404
 from django.utils import timezone 
 from django.utils.datastructures import MultiValueDictKeyError
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.cache import cache
+from django.db.models import Max
 from django.conf import settings
+from django.views.decorators.http import condition
+from django.views.decorators.cache import cache_control
 
 from .models import * 
+from . import onshape
 from data_miner.views import collect_fail_data, collect_final_data, collect_multi_step_data
 
 
@@ -32,7 +41,7 @@ def should_collect_data(user: AuthUser, question: _Q_TYPES_HINT) -> bool:
     data_miner. 
     """
     # Max number of data entries to be collected for every question 
-    MAX_ENTRIES_PER_QUESTION = 250 
+    MAX_ENTRIES_PER_QUESTION = settings.DATA_MAX_ENTRIES_PER_QUESTION 
     # Max number of data entries to be collected for every user on the same question 
     MAX_ENTRIES_PER_USER = 3
     # After the MAX_ENTRIES_PER_USER, new data are collected for a user iff the time spent 
@@ -46,18 +55,143 @@ def should_collect_data(user: AuthUser, question: _Q_TYPES_HINT) -> bool:
     ): 
         return False 
     
-    try: 
-        user_hist = user.completed_history[str(question)]
-    except KeyError: # no history yet 
+    # Time spent of the user's completions of the question 
+    user_hist = list(CompletionRecord.objects.filter(
+        user=user, question_id=question.question_id
+    ).order_by("pk").values_list("time_spent", flat=True))
+    if not user_hist: # no history yet 
         return True 
     if len(user_hist) > MAX_ENTRIES_PER_USER: 
-        best_perf = min([item[1] for item in user_hist[:-1]])
-        if user_hist[-1][1] > best_perf * (1 - MIN_IMPROVE_REQ): 
+        best_perf = min(user_hist[:-1])
+        if user_hist[-1] > best_perf * (1 - MIN_IMPROVE_REQ): 
             return False 
     
     return True 
 
 
+def index_questions(user: AuthUser) -> List[Question]: 
+    """ Question cards listed in :view:`questioner.views.index` for the given user, 
+    labelled with the certificate they count towards (``cert_type``), if the 
+    user has completed them before (``is_completed``), and their current 
+    completion counters (see :func:`questioner.models.completion_counters`) 
+    """
+    completed = cache.get(COMPLETED_CACHE_KEY.format(user.os_user_id))
+    if completed is None: 
+        completed = set(CompletionRecord.objects.filter(user=user).values_list("question_id", flat=True))
+        cache.set(COMPLETED_CACHE_KEY.format(user.os_user_id), completed, settings.DASHBOARD_CACHE_TTL)
+
+    questions = question_catalog(published_only=not user.is_reviewer)
+    counters = completion_counters() 
+    for question in questions:
+        question.is_completed = question.question_id in completed 
+        for field, value in counters.get(question.question_id, {}).items(): 
+            setattr(question, field, value)
+    return questions 
+
+
+def index_context(user: AuthUser) -> Dict[str, Any]: 
+    """ Context of :template:`questioner/index.html` shared by all views rendering it, 
+    including the version and timeout keying the cached question details 
+    """
+    return {
+        "questions": index_questions(user), 
+        "catalog_version": catalog_version(), 
+        "catalog_ttl": settings.CATALOG_CACHE_TTL
+    }
+
+
+def dashboard_summary(user: AuthUser) -> Dict[str, Any]: 
+    """ Completion history and certificate progress of the user presented in 
+    :view:`questioner.views.dashboard`, computed from one query of the user's 
+    completions and one of all question cards. 
+
+    The summary is cached per user for ``DASHBOARD_CACHE_TTL`` seconds, and is 
+    invalidated when the user completes a question. 
+    """
+    cache_key = DASHBOARD_CACHE_KEY.format(user.os_user_id)
+    summary = cache.get(cache_key)
+    if summary is not None: 
+        return summary 
+
+    difficulty_count = {'EA':0,'ME':0,'CH':0}
+    types_count = {'SPPS':0,'MPPS':0,'MSPS':0,'ASMB':0}
+
+    # Completion history of the user by question: [(completed_at, time_spent)]
+    history = {}
+    for question_id, completed_at, time_spent in CompletionRecord.objects.filter(
+        user=user
+    ).order_by("pk").values_list("question_id", "completed_at", "time_spent"): 
+        history.setdefault(question_id, []).append((completed_at, time_spent))
+
+    questions = list(question_cards())
+    question_map = {question.question_id: question for question in questions}
+    for question_id, attempts in history.items(): 
+        question = question_map.get(question_id)
+        if question is None: # deleted question 
+            continue 
+        if question.difficulty in difficulty_count: 
+            difficulty_count[question.difficulty] += 1
+        types_count[question.question_type] += 1
+        question.attempts = [
+            "{} min {} sec".format(int(time_spent // 60), int(time_spent % 60)) 
+            for _, time_spent in attempts
+        ]
+
+    # certificates array for each certificate [certname, [completed challenges], [incompleted challenges], cert_id, cert_date, is_published, [names of incompleted challenges]]
+    certificates = []
+    for certificate in Certificate.objects.defer('drawing_jpeg').order_by('certificate_name'):
+        required = certificate.required_challenges
+        completed = [num for num in required if num in history]
+        remaining = [num for num in required if num not in history]
+        cert_date = ""
+        if not remaining: 
+            # Earned on the last completion of the required challenges 
+            dates = [
+                completed_at for num in completed for completed_at, _ in history[num] 
+                if completed_at is not None
+            ]
+            if dates: 
+                cert_date = datetime.strftime(max(dates), '%Y-%m-%d %H:%M:%S')
+        certificates.append([
+            certificate.certificate_name, completed, remaining, 
+            certificate.id, cert_date, certificate.is_published, 
+            [question_map[num].question_name for num in remaining if num in question_map]
+        ])
+
+    summary = {
+        "questions": questions, 
+        "difficulty_count": difficulty_count, 
+        "types_count": types_count, 
+        "total_count": len(history), 
+        "certificates": certificates
+    }
+    cache.set(cache_key, summary, settings.DASHBOARD_CACHE_TTL)
+    return summary 
+
+
+async def aget_object_or_404(klass: Any, **kwargs: Any) -> Any: 
+    """ Asynchronous version of ``get_object_or_404`` for async views 
+    (only available in Django itself since Django 5.0) 
+    """
+    try: 
+        return await klass.objects.aget(**kwargs)
+    except klass.DoesNotExist: 
+        raise Http404("No {} matches the given query.".format(klass._meta.object_name))
+
+
+def evaluation_cache_key(
+    user: AuthUser, question: _Q_TYPES_HINT, step: int, microversion: str
+) -> str: 
+    """ Cache key of the evaluation outcome of a submitted model, which 
+    is identified by the question (step) and its reference version, and the 
+    microversion of the user's working element. 
+    """
+    return "evaluation:{}:{}:{}:{}:{}:{}:{}:{}".format(
+        str(question), step, question.vid, getattr(question, "ref_mid", ""), 
+        user.did, user.wid, user.eid, microversion
+    )
+
+
 # Create your views here.
 def home(request: HttpRequest, os_user_id=None):
     """ 
@@ -80,7 +214,7 @@ def home(request: HttpRequest, os_user_id=None):
     return render(request, "questioner/home.html", context=context)
 
 
-def login(request: HttpRequest): 
+async def login(request: HttpRequest): 
     """ 
     When the app extension is first opened, this view should be called. 
 
@@ -99,7 +233,7 @@ def login(request: HttpRequest):
 
     user_id = request.GET.get('userId')
     try: 
-        user = AuthUser.objects.get(os_user_id=user_id)
+        user = await AuthUser.objects.aget(os_user_id=user_id)
         # Check if user is modelling 
         if (
             user.is_modelling and 
@@ -108,13 +242,14 @@ def login(request: HttpRequest):
         ): 
             # Refresh token if needed 
             if user.expires_at < timezone.now() + timedelta(hours=1): 
-                user.refresh_oauth_token() 
+                await user.arefresh_oauth_token() 
             # Redirect to modelling page 
             args=[user.curr_question_type, user.curr_question_id, user.os_user_id, 0]
             # Check if multi-step 
-            if Q_Type_Dict[user.curr_question_type].objects.get(
+            curr_que = await Q_Type_Dict[user.curr_question_type].objects.aget(
                 question_id=user.curr_question_id
-            ).is_multi_step: 
+            )
+            if curr_que.is_multi_step: 
                 args.append(user.curr_step)
             return HttpResponseRedirect(reverse(
                 "questioner:modelling", 
@@ -129,7 +264,7 @@ def login(request: HttpRequest):
     user.wid = request.GET.get('wvmid')
     user.eid = request.GET.get('eid')
     user.etype = request.GET.get('etype')
-    user.save() 
+    await user.asave() 
 
     return redirect(
         os.path.join(
@@ -141,7 +276,7 @@ def login(request: HttpRequest):
     )
 
 
-def authorize(request: HttpRequest): 
+async def authorize(request: HttpRequest): 
     """ 
     When the user authorizes the OAuth integration, Onshape's OAuth authorization page will redirect the user to this page, as registered as the redirect URL. 
     
@@ -157,7 +292,7 @@ def authorize(request: HttpRequest):
         )
     
     # Use the authorization code to get access token and refresh token 
-    token_response = requests.post(
+    token_response = (await onshape.apost(
         os.path.join(
             os.environ['OAUTH_URL'], 
             "oauth/token"
@@ -167,64 +302,139 @@ def authorize(request: HttpRequest):
             os.environ['OAUTH_CLIENT_SECRET'].replace('=', '%3D')
         ), 
         headers={'Content-Type': "application/x-www-form-urlencoded"}
-    ).json() 
+    )).json() 
     
     # Use the sessioninfo API request to get the user's info 
     # for backend data storage 
-    sess_response = requests.get(
+    sess_response = (await onshape.aget(
         "https://cad.onshape.com/api/users/sessioninfo", 
-        headers={"Authorization": "Bearer " + token_response['access_token']}
-    ).json() 
+        auth_token=token_response['access_token']
+    )).json() 
 
-    user = AuthUser.objects.get(os_user_id=sess_response['id'])
+    user = await AuthUser.objects.aget(os_user_id=sess_response['id'])
     user.access_token = token_response['access_token']
     user.refresh_token = token_response['refresh_token']
     user.expires_at = timezone.now() + timedelta(seconds=token_response['expires_in'])
-    user.save() 
+    await user.asave(update_fields=AuthUser._TOKEN_FIELDS) 
 
     return HttpResponseRedirect(reverse("questioner:index", args=[user.os_user_id]))
 
 
-def create_cert_png(curr_user, base64_jpeg_data, cert_date):
+@lru_cache(maxsize=None)
+def cert_fonts() -> Tuple[ImageFont.FreeTypeFont, ImageFont.FreeTypeFont]: 
+    """ Fonts of the user name and the date on certificates, loaded once per process """
     static_dir = 'questioner' + settings.STATIC_URL + 'questioner/'
     font_path = os.path.join(static_dir, 'fonts', 'Raleway-Medium.ttf')
-    print(cert_date)
-    if base64_jpeg_data.startswith('data:image/jpeg;base64,'):
-        base64_jpeg = base64_jpeg_data[len('data:image/jpeg;base64,'):]
+    return ImageFont.truetype(font_path, 150), ImageFont.truetype(font_path, 100)
+
+
+@lru_cache(maxsize=8)
+def cert_template(etag: str) -> Image.Image: 
+    """ Decoded certificate template image, loaded once per process by its content hash """
+    img = Image.open(io.BytesIO(bytes(ImageBlob.objects.get(etag=etag).data)))
+    img.load() 
+    return img 
+
+
+def cached_user_name(user: AuthUser) -> Optional[str]: 
+    """ Onshape name of the user, cached for ``USER_NAME_CACHE_TTL`` seconds """
+    cache_key = "user-name:" + user.os_user_id 
+    user_name = cache.get(cache_key)
+    if user_name is None: 
+        user_name = get_user_name(user)
+        if user_name is not None: 
+            cache.set(cache_key, user_name, settings.USER_NAME_CACHE_TTL)
+    return user_name 
+
+
+def create_cert_png(curr_user, certificate, cert_date):
+    """ Render the certificate of the user as a base64 PNG image 
+
+    Rendered certificates are cached by the certificate, user, date, the user's 
+    name and the content hash of the certificate template for 
+    ``CERTIFICATE_CACHE_TTL`` seconds. 
+    """
+    user_name = cached_user_name(curr_user)
+    cache_key = "certificate:{}:{}:{}:{}:{}".format(
+        certificate.id, curr_user.os_user_id, cert_date.replace(' ', '_'), certificate.drawing_etag, 
+        hashlib.sha256(str(user_name).encode()).hexdigest()[:16]
+    )
+    img_base64 = cache.get(cache_key)
+    if img_base64 is not None: 
+        return img_base64
     try:
-        # Decode the base64 string into bytes
-        jpeg_bytes = base64.b64decode(base64_jpeg)
-        print("Base64 string successfully decoded")
-        try:
-            img = Image.open(io.BytesIO(jpeg_bytes))
-            draw = ImageDraw.Draw(img)
-            user_name = get_user_name(curr_user)
-            # Add text to the image
-            certW = 3300
-            date_arr = cert_date.split(' ', 1)[0].split('-')
-            date_text = date_arr[1] + "-" + date_arr[2] + "-" + date_arr[0]
-            name_font = ImageFont.truetype(font_path, 150)
-            cert_font = ImageFont.truetype(font_path, 100)
-            nameW, h = draw.textsize(user_name, font=name_font)
-            dateW, h = draw.textsize(date_text, font=cert_font)
-            name_pos = ((certW-nameW)/2, 1260)
-            date_pos = ((certW-dateW)/2, 2075)
-            date_color = (51, 51, 51)
-            name_color = (64, 170, 29)
-            draw.text(name_pos, user_name, font=name_font, fill=name_color, stroke_width=2, stroke_fill=name_color)
-            draw.text(date_pos, date_text, font=cert_font, fill=date_color)
-            img_io = io.BytesIO()
-            img.save(img_io, 'PNG')
-            print("successfully converted to png")
-            img_base64 = base64.b64encode(img_io.getvalue()).decode('utf-8')
-            return img_base64
-        except Exception as e:
-            print(f"Error opening image: {e}")
-            return HttpResponse(f"Error opening image: {e}", status=400)
+        img = cert_template(certificate.drawing_etag).copy()
+        draw = ImageDraw.Draw(img)
+        # Add text to the image
+        certW = 3300
+        date_arr = cert_date.split(' ', 1)[0].split('-')
+        date_text = date_arr[1] + "-" + date_arr[2] + "-" + date_arr[0]
+        name_font, cert_font = cert_fonts()
+        nameW, h = draw.textsize(user_name, font=name_font)
+        dateW, h = draw.textsize(date_text, font=cert_font)
+        name_pos = ((certW-nameW)/2, 1260)
+        date_pos = ((certW-dateW)/2, 2075)
+        date_color = (51, 51, 51)
+        name_color = (64, 170, 29)
+        draw.text(name_pos, user_name, font=name_font, fill=name_color, stroke_width=2, stroke_fill=name_color)
+        draw.text(date_pos, date_text, font=cert_font, fill=date_color)
+        img_io = io.BytesIO()
+        img.save(img_io, 'PNG')
+        img_base64 = base64.b64encode(img_io.getvalue()).decode('utf-8')
     except Exception as e:
-        print(f"General error: {e}")
-        return HttpResponse(f"Error converting image: {str(e)}", status=500)
-      
+        print(f"Error rendering certificate: {e}")
+        return HttpResponse(f"Error rendering certificate: {str(e)}", status=500)
+    cache.set(cache_key, img_base64, settings.CERTIFICATE_CACHE_TTL)
+    return img_base64
+
+def prerender_certificate(cert_id: int, os_user_id: str, cert_date: str) -> None: 
+    """ RQ job rendering a certificate the user has just earned into the certificate 
+    render cache, so the first view of :view:`questioner.views.certificate` is served 
+    without rendering or calling Onshape for the user's name 
+    """
+    user = AuthUser.objects.get(os_user_id=os_user_id)
+    certificate = Certificate.objects.defer('drawing_jpeg').get(id=cert_id)
+    if user.expires_at < timezone.now() + timedelta(minutes=10): 
+        user.refresh_oauth_token() 
+    create_cert_png(user, certificate, cert_date)
+    return None 
+
+
+def enqueue_certificate_prerender(user: AuthUser, question_id: int) -> None: 
+    """ Enqueue ``prerender_certificate`` on the 'low' queue for every certificate 
+    that requires the given question and is now earned by the user, i.e., the user 
+    has completed all of its required challenges 
+    """
+    certificates = [
+        certificate 
+        for certificate in Certificate.objects.defer('drawing_jpeg').order_by('id') 
+        if question_id in (certificate.required_challenges or []) and 
+        (certificate.is_published or user.is_reviewer)
+    ]
+    if not certificates: 
+        return None 
+    required = set().union(*[certificate.required_challenges for certificate in certificates])
+    # Last completion time of every required challenge completed by the user 
+    last_completions = dict(
+        CompletionRecord.objects.filter(user=user, question_id__in=required)
+        .values("question_id").annotate(last=Max("completed_at"))
+        .values_list("question_id", "last")
+    )
+    for certificate in certificates: 
+        if not set(certificate.required_challenges) <= last_completions.keys(): 
+            continue 
+        dates = [
+            last_completions[num] for num in certificate.required_challenges 
+            if last_completions[num] is not None
+        ]
+        if dates: # same date as presented in the dashboard 
+            django_rq.get_queue("low").enqueue(
+                prerender_certificate, certificate.id, user.os_user_id, 
+                datetime.strftime(max(dates), '%Y-%m-%d %H:%M:%S')
+            )
+    return None 
+
+
 def dashboard(request: HttpRequest, os_user_id: str):
     """ 
     User Dashboard
@@ -238,53 +448,9 @@ def dashboard(request: HttpRequest, os_user_id: str):
     :template:`questioner/dashboard.html`
     """
     curr_user = get_object_or_404(AuthUser, os_user_id=os_user_id)
-    difficulty_count = {'EA':0,'ME':0,'CH':0}
-    types_count = {'SPPS':0,'MPPS':0,'MSPS':0,'ASMB':0}
-
-    certificates = []
-
-    # certificates array for each certificate [certname, [completed challenges], [incompleted challenges], cert_id, cert_date]
-    for certificate in Certificate.objects.order_by('certificate_name'):
-        base_jpeg = certificate.drawing_jpeg
-        certificates.append([certificate.certificate_name,[],certificate.required_challenges, certificate.id, "", certificate.is_published])
-    
-    for key in curr_user.completed_history:
-        num = key.split('_')[1]
-        chall_type = key.split('_')[0]
-        try:
-            difficulty_count[Question.objects.filter(question_id=num).values('difficulty')[0]['difficulty']] += 1
-            types_count[chall_type] += 1
-        except:
-            pass
-        
-        for i, cert in enumerate(certificates):
-            if int(num) in cert[2]:
-                certificates[i][2].remove(int(num))
-                certificates[i][1].append(int(num))
-
-        for i,attempt in enumerate(curr_user.completed_history[key]):
-            curr_user.completed_history[key][i][1] = "{} min {} sec".format(
-            int(attempt[1] // 60), int(attempt[1] % 60)
-        )
-    
-    dates = []
-    for i, cert in enumerate(certificates):
-        if len(cert[2]) == 0:
-            for key, value in curr_user.completed_history.items():
-                num = int(key.split('_')[1])
-                if num in cert[1]:
-                    for cert_date in value:
-                        dates.append(cert_date[0])
-            dates.sort(reverse=True)
-            certificates[i][3] = cert[3]
-            certificates[i][4] = dates[0]
 
     context = {"user": curr_user}
-    context["questions"] = Question.objects.order_by("question_name")
-    context["difficulty_count"] = difficulty_count
-    context["types_count"] = types_count
-    context["total_count"] = len(curr_user.completed_history.keys())
-    context["certificates"] = certificates
+    context.update(dashboard_summary(curr_user))
 
     return render(request, "questioner/dashboard.html", context=context)
 
@@ -299,14 +465,11 @@ def certificate(request: HttpRequest, os_user_id: str, cert_id: int, cert_date:
     :template:`questioner/certificate.html`
     """
     curr_user = get_object_or_404(AuthUser, os_user_id=os_user_id)
+    certificate = get_object_or_404(Certificate.objects.defer('drawing_jpeg'), id=cert_id)
 
-    try:
-        certificate = Certificate.objects.get(id=cert_id)
-        base_jpeg = certificate.drawing_jpeg
-    except Certificate.DoesNotExist:
-        print(f"Certificate with id {cert_id} does not exist.")
-
-    cert_image = create_cert_png(curr_user, base_jpeg, cert_date)
+    cert_image = create_cert_png(curr_user, certificate, cert_date)
+    if isinstance(cert_image, HttpResponse): 
+        return cert_image 
 
     context = {"cert_image": cert_image}
 
@@ -332,28 +495,13 @@ def index(request: HttpRequest, os_user_id: str):
     """
     curr_user = get_object_or_404(AuthUser, os_user_id=os_user_id)
 
-    certs = {}
-    for certificate in Certificate.objects.order_by('certificate_name'):
-        certs[certificate.certificate_name] = certificate.required_challenges
-
     context = {"user": curr_user}
-    if curr_user.is_reviewer: 
-        context["questions"] = Question.objects.order_by("question_name")
-    else: 
-        context["questions"] = Question.objects.filter(is_published=True).order_by("question_name")
-
-    cert_type_map = {}
-    for cert_type, ids in certs.items():
-        for question_id in ids:
-            cert_type_map[question_id] = cert_type
-
-    for question in context['questions']:
-        question.cert_type = cert_type_map.get(question.question_id, None)
+    context.update(index_context(curr_user))
 
     return render(request, "questioner/index.html", context=context)
 
 
-def model(request: HttpRequest, question_type: str, question_id: int, os_user_id: str, initiate: int, step=1): 
+async def model(request: HttpRequest, question_type: str, question_id: int, os_user_id: str, initiate: int, step=1): 
     """ 
     The view that the users see when working on a question. 
     
@@ -375,34 +523,31 @@ def model(request: HttpRequest, question_type: str, question_id: int, os_user_id
     
     :template:`questioner/modelling.html`
     """
-    curr_user = get_object_or_404(AuthUser, os_user_id=os_user_id)
+    curr_user = await aget_object_or_404(AuthUser, os_user_id=os_user_id)
     if question_type not in Q_Type_Dict.keys(): 
         return HttpResponseNotFound("Question type not found") 
-    curr_que = get_object_or_404(Q_Type_Dict[question_type], question_id=question_id)
+    curr_que = await aget_object_or_404(Q_Type_Dict[question_type], question_id=question_id)
     
     if initiate: 
         # Refresh token if needed 
         if curr_user.expires_at < timezone.now() + timedelta(hours=1): 
-            curr_user.refresh_oauth_token() 
+            await curr_user.arefresh_oauth_token() 
         
         # Check if the user is starting with an empty part studio or assembly 
         if curr_user.etype == ElementType.PARTSTUDIO: 
-            response = get_feature_list(curr_user)
+            response = await aget_feature_list(curr_user)
             if response: 
                 if len(response['features']) > 0: 
                     context = {
                         "user": curr_user, 
                         "error_message": "Please start with an empty part studio and relaunch this app ..."
                     }
-                    if curr_user.is_reviewer: 
-                        context["questions"] = Question.objects.order_by("question_name")
-                    else: 
-                        context["questions"] = Question.objects.filter(is_published=True).order_by("question_name")
-                    return render(request, "questioner/index.html", context=context)
+                    context.update(await sync_to_async(index_context)(curr_user))
+                    return await sync_to_async(render)(request, "questioner/index.html", context=context)
             else: 
                 return HttpResponse("An unexpected error has occurred. You may have lost your internet connection or granted OAuth access to the wrong Onshape account/Enterprise. Please refresh the page and relaunch the app ...")
         elif curr_user.etype == ElementType.ASSEMBLY: 
-            response = get_assembly_definition(curr_user)
+            response = await aget_assembly_definition(curr_user)
             if response: 
                 if (
                     response["parts"] or 
@@ -414,11 +559,8 @@ def model(request: HttpRequest, question_type: str, question_id: int, os_user_id
                         "user": curr_user, 
                         "error_message": "Please start with an empty assembly and relaunch this app ..."
                     }
-                    if curr_user.is_reviewer: 
-                        context["questions"] = Question.objects.order_by("question_name")
-                    else: 
-                        context["questions"] = Question.objects.filter(is_published=True).order_by("question_name")
-                    return render(request, "questioner/index.html", context=context)
+                    context.update(await sync_to_async(index_context)(curr_user))
+                    return await sync_to_async(render)(request, "questioner/index.html", context=context)
             else: 
                 return HttpResponse("An unexpected error has occurred. You may have lost your internet connection or granted OAuth access to the wrong Onshape account/Enterprise. Please refresh the page and relaunch the app ...")
         else: 
@@ -426,8 +568,8 @@ def model(request: HttpRequest, question_type: str, question_id: int, os_user_id
 
         # Run any start modelling process 
         curr_user.add_field = {} # clean field 
-        curr_user.save() 
-        initiate_succ = curr_que.initiate_actions(curr_user)
+        await curr_user.asave() 
+        initiate_succ = await sync_to_async(curr_que.initiate_actions)(curr_user)
         if not initiate_succ: 
             return HttpResponse("Failed to start the question. Please relaunch the app and try again ...")
 
@@ -440,21 +582,21 @@ def model(request: HttpRequest, question_type: str, question_id: int, os_user_id
         curr_user.curr_step = 1
 
         # Get current microversion ID 
-        curr_user.start_mid = get_current_microversion(curr_user)
-        curr_user.save() 
+        curr_user.start_mid = await aget_current_microversion(curr_user)
+        await curr_user.asave() 
     
     if step > 1: 
         curr_user.curr_step = step 
-        curr_user.save() 
+        await curr_user.asave() 
         
     context={
         "user": curr_user, 
         "question": curr_que
     }
     if curr_que.is_multi_step:
-        context["step"] = Question_Step_PS.objects.filter(
+        context["step"] = await Question_Step_PS.objects.filter(
             question=curr_que
-        ).get(step_number=step)
+        ).aget(step_number=step)
     
     return render(
         request, "questioner/modelling.html", 
@@ -462,46 +604,64 @@ def model(request: HttpRequest, question_type: str, question_id: int, os_user_id
     )
 
 
-def check_model(request: HttpRequest, question_type: str, question_id: int, os_user_id: str, step=1): 
+def evaluate_submission(
+    question_type: str, question_id: int, os_user_id: str, step=1
+) -> Dict[str, str]: 
     """ 
-    When a user submits a model, API calls are made to check if the 
-    model is dimensionally correct and placed in proper orientation. 
+    Evaluate the model submitted by a user and run all follow-up actions (data collection and step progression). 
     
-    **Context:**
+    This function is either called directly by :view:`questioner.views.check_model` or run as a job on the ``high`` RQ queue when ``ASYNC_EVALUATION`` is enabled, hence only IDs are taken as arguments and a JSON-serializable outcome is returned: 
     
-    If the model is correct, redirect to :view:`questioner.complete`. 
-    
-    If not correct, re-render the modelling page with evaluation feedback and ask for modifications before re-submission. 
-    
-    - User is also then given the option to give-up, which redirects them to :view:`questioner.solution`. 
-    
-    **Arguments:**
-    
-    - ``question_type``: one of the supported question type model inheriting :model:`questioner.Question`  
-    - ``question_id``: the unique ID of the question 
-    - ``os_user_id``: the unique ID linked to the user's :model:`questioner.AuthUser` profile 
-    - ``step``: only applicable to multi-step questions (index starts from 1)
-    
-    **Template:**
-    
-    :template:`questioner/modelling.html`
+    - ``{"redirect": url}`` if the submission is correct 
+    - ``{"model_comparison": html}`` if the submission failed the evaluation 
+    - ``{"error": message}`` if evaluation cannot proceed due to API errors 
     """
-    curr_user = get_object_or_404(AuthUser, os_user_id=os_user_id)
-    if question_type not in Q_Type_Dict.keys(): 
-        return HttpResponseNotFound("Question type not found") 
-    curr_que = get_object_or_404(Q_Type_Dict[question_type], question_id=question_id)
+    curr_user = AuthUser.objects.get(os_user_id=os_user_id)
+    curr_que = Q_Type_Dict[question_type].objects.get(question_id=question_id)
 
     # Refresh token if needed 
     if curr_user.expires_at < timezone.now() + timedelta(minutes=20): 
         curr_user.refresh_oauth_token() 
     
-    if curr_que.is_multi_step: 
-        response = curr_que.evaluate(curr_user, step)
+    # A repeated submission of an unchanged model is served from the cache. 
+    # Only failed evaluations are cached, since a successful evaluation 
+    # records the completion and ends the attempt. Whether a failure starts 
+    # the failure records of an attempt (by setting ``end_mid``) is only known 
+    # if it is evaluated before the first failure, and is otherwise 
+    # re-evaluated when needed. 
+    curr_mid = get_current_microversion(curr_user)
+    cache_key = None 
+    cached = None 
+    if curr_mid: 
+        cache_key = evaluation_cache_key(curr_user, curr_que, step, curr_mid)
+        cached = cache.get(cache_key)
+        if cached and not curr_user.end_mid and cached["first_failure"] is None: 
+            cached = None 
+    
+    if cached: 
+        if curr_user.end_mid: 
+            response = (cached["message"], False)
+        elif cached["first_failure"]: 
+            curr_user.end_mid = curr_mid 
+            curr_user.save() 
+            response = (cached["message"], cached["collect"])
+        else: # e.g., no parts or no material assigned 
+            response = (cached["message"], False)
     else: 
-        response = curr_que.evaluate(curr_user)
+        had_end_mid = bool(curr_user.end_mid)
+        if curr_que.is_multi_step: 
+            response = curr_que.evaluate(curr_user, step)
+        else: 
+            response = curr_que.evaluate(curr_user)
+        if cache_key and response and type(response) is not bool: 
+            cache.set(cache_key, {
+                "message": response[0], 
+                "first_failure": None if had_end_mid else bool(curr_user.end_mid), 
+                "collect": response[1]
+            }, settings.EVALUATION_CACHE_TTL)
 
     if not response: # API error 
-        return HttpResponse("An unexpected error has occurred. Please check internet connection and try relaunching the app in the part studio that you originally started this modelling question with ...")
+        return {"error": "An unexpected error has occurred. Please check internet connection and try relaunching the app in the part studio that you originally started this modelling question with ..."}
     elif type(response) is bool: # Submission is correct 
         # Initiate data collection from data miner 
         if should_collect_data(curr_user, curr_que): 
@@ -514,40 +674,140 @@ def check_model(request: HttpRequest, question_type: str, question_id: int, os_u
         if curr_que.is_multi_step and step < curr_que.total_steps: 
             curr_user.end_mid = None 
             curr_user.save() 
-            return HttpResponseRedirect(reverse(
+            return {"redirect": reverse(
                 "questioner:modelling", args=[
                     question_type, question_id, os_user_id, 0, step + 1
                 ]
-            ))
+            )}
         
+        # Certificates earned by this completion are rendered in the background 
+        enqueue_certificate_prerender(curr_user, curr_que.question_id)
+
         # Redirect to complete page 
-        return HttpResponseRedirect(reverse(
+        return {"redirect": reverse(
             "questioner:complete", args=[
                 curr_que.question_type, curr_que.question_id, curr_user.os_user_id
             ]
-        ))
+        )}
     else: # Submission failed 
         # Initiate failure attempt collection 
         if response[1] and should_collect_data(curr_user, curr_que): 
             collect_fail_data(curr_user)
-        
-        context={
-            "user": curr_user, 
-            "question": curr_que, 
-            "model_comparison": response[0] # failure message 
-        }
-        if curr_que.is_multi_step:
-            context["step"] = Question_Step_PS.objects.filter(
-                question=curr_que
-            ).get(step_number=step)
-        
-        return render(
-            request, "questioner/modelling.html", 
-            context=context
+        return {"model_comparison": response[0]} # failure message 
+
+
+async def render_evaluation(
+    request: HttpRequest, curr_user: AuthUser, curr_que: _Q_TYPES_HINT, step: int, 
+    outcome: Dict[str, str]
+) -> HttpResponse: 
+    """ Present the outcome of :func:`evaluate_submission` to the user 
+    """
+    if "error" in outcome: 
+        return HttpResponse(outcome["error"])
+    elif "redirect" in outcome: 
+        return HttpResponseRedirect(outcome["redirect"])
+    
+    await curr_user.arefresh_from_db() 
+    context={
+        "user": curr_user, 
+        "question": curr_que, 
+        "model_comparison": outcome["model_comparison"]
+    }
+    if curr_que.is_multi_step:
+        context["step"] = await Question_Step_PS.objects.filter(
+            question=curr_que
+        ).aget(step_number=step)
+    
+    return render(
+        request, "questioner/modelling.html", 
+        context=context
+    )
+
+
+async def check_model(request: HttpRequest, question_type: str, question_id: int, os_user_id: str, step=1): 
+    """ 
+    When a user submits a model, API calls are made to check if the 
+    model is dimensionally correct and placed in proper orientation. 
+    
+    **Context:**
+    
+    If the model is correct, redirect to :view:`questioner.complete`. 
+    
+    If not correct, re-render the modelling page with evaluation feedback and ask for modifications before re-submission. 
+    
+    - User is also then given the option to give-up, which redirects them to :view:`questioner.solution`. 
+    
+    If ``ASYNC_EVALUATION`` is enabled, the evaluation is enqueued on the ``high`` RQ queue and the modelling page is rendered with a loading screen, which polls :view:`questioner.views.check_status` and returns to this view with the ``job`` query parameter to present the outcome once the evaluation is done. 
+    
+    **Arguments:**
+    
+    - ``question_type``: one of the supported question type model inheriting :model:`questioner.Question`  
+    - ``question_id``: the unique ID of the question 
+    - ``os_user_id``: the unique ID linked to the user's :model:`questioner.AuthUser` profile 
+    - ``step``: only applicable to multi-step questions (index starts from 1)
+    
+    **Template:**
+    
+    :template:`questioner/modelling.html`
+    """
+    curr_user = await aget_object_or_404(AuthUser, os_user_id=os_user_id)
+    if question_type not in Q_Type_Dict.keys(): 
+        return HttpResponseNotFound("Question type not found") 
+    curr_que = await aget_object_or_404(Q_Type_Dict[question_type], question_id=question_id)
+
+    if not settings.ASYNC_EVALUATION: 
+        outcome = await sync_to_async(evaluate_submission)(
+            question_type, question_id, os_user_id, step
         )
+        return await render_evaluation(request, curr_user, curr_que, step, outcome)
+    
+    queue = django_rq.get_queue("high")
+    if "job" in request.GET: # returning from the loading screen 
+        job = await sync_to_async(queue.fetch_job)(request.GET["job"])
+        if job is None or list(job.args[:4]) != [question_type, question_id, os_user_id, step]: 
+            return HttpResponseNotFound("Evaluation not found. Please re-submit your model ...")
+    else: 
+        job = await sync_to_async(queue.enqueue)(
+            evaluate_submission, question_type, question_id, os_user_id, step
+        )
+    
+    status = await sync_to_async(job.get_status)()
+    if status == "finished": 
+        outcome = await sync_to_async(lambda: job.result)()
+        return await render_evaluation(request, curr_user, curr_que, step, outcome)
+    elif status in ("failed", "stopped", "canceled"): 
+        return HttpResponse("An unexpected error has occurred. Please check internet connection and try relaunching the app in the part studio that you originally started this modelling question with ...")
+    
+    # Show loading screen until the evaluation is done 
+    context={
+        "user": curr_user, 
+        "question": curr_que, 
+        "status_url": reverse("questioner:check_status", args=[job.id]), 
+        "result_url": request.path + "?job=" + job.id 
+    }
+    if curr_que.is_multi_step:
+        context["step"] = await Question_Step_PS.objects.filter(
+            question=curr_que
+        ).aget(step_number=step)
+    return render(
+        request, "questioner/modelling.html", 
+        context=context
+    )
+
+
+def check_status(request: HttpRequest, job_id: str): 
+    """ 
+    A lightweight AJAX view polled by the loading screen of :view:`questioner.views.check_model` to check if an evaluation job is done. 
+    
+    Returns the RQ job status as JSON, e.g., ``{"status": "finished"}``; ``"missing"`` if the job cannot be found. 
+    """
+    job = django_rq.get_queue("high").fetch_job(job_id)
+    if job is None: 
+        return JsonResponse({"status": "missing"})
+    return JsonResponse({"status": job.get_status()})
 
 
-def solution(request: HttpRequest, question_type: str, question_id: int, os_user_id: str, step=1): 
+async def solution(request: HttpRequest, question_type: str, question_id: int, os_user_id: str, step=1): 
     """ 
     If a user gives up on the problem, some form of solution is presented.
     
@@ -571,22 +831,22 @@ def solution(request: HttpRequest, question_type: str, question_id: int, os_user
     
     :template:`questioner/solution.html` 
     """
-    curr_user = get_object_or_404(AuthUser, os_user_id=os_user_id)
+    curr_user = await aget_object_or_404(AuthUser, os_user_id=os_user_id)
     if question_type not in Q_Type_Dict.keys(): 
         return HttpResponseNotFound("Question type not found") 
-    curr_que = get_object_or_404(Q_Type_Dict[question_type], question_id=question_id)
+    curr_que = await aget_object_or_404(Q_Type_Dict[question_type], question_id=question_id)
 
     # Reset user data model 
     curr_user.is_modelling = False 
-    curr_user.save() 
+    await curr_user.asave() 
     # Initiate any give-up actions if available 
     if curr_que.is_multi_step: 
-        instructions, do_collect_data = curr_que.give_up(curr_user, step)
+        instructions, do_collect_data = await sync_to_async(curr_que.give_up)(curr_user, step)
     else: 
-        instructions, do_collect_data = curr_que.give_up(curr_user)
+        instructions, do_collect_data = await sync_to_async(curr_que.give_up)(curr_user)
     # Record model's final state at the point of give-up 
-    if do_collect_data and should_collect_data(curr_user, curr_que): 
-        collect_final_data(curr_user, is_failure=True)
+    if do_collect_data and await sync_to_async(should_collect_data)(curr_user, curr_que): 
+        await sync_to_async(collect_final_data)(curr_user, is_failure=True)
 
     return render(
         request, "questioner/solution.html", 
@@ -598,7 +858,7 @@ def solution(request: HttpRequest, question_type: str, question_id: int, os_user
     )
 
 
-def complete(request: HttpRequest, question_type: str, question_id: int, os_user_id: str): 
+async def complete(request: HttpRequest, question_type: str, question_id: int, os_user_id: str): 
     """ 
     The view that the users see when a question is finished. 
     
@@ -618,22 +878,38 @@ def complete(request: HttpRequest, question_type: str, question_id: int, os_user
     
     :template:`questioner/complete.html`
     """
-    curr_user = get_object_or_404(AuthUser, os_user_id=os_user_id)
+    curr_user = await aget_object_or_404(AuthUser, os_user_id=os_user_id)
     if question_type not in Q_Type_Dict.keys(): 
         return HttpResponseNotFound("Question type not found") 
-    curr_que = get_object_or_404(Q_Type_Dict[question_type], question_id=question_id)
+    curr_que = await aget_object_or_404(Q_Type_Dict[question_type], question_id=question_id)
 
     if "best" in request.GET: 
         show_best = True 
     else: 
         show_best = False
 
+    stats_display = await sync_to_async(curr_que.show_result)(curr_user, show_best=show_best)
+
     return render(
         request, "questioner/complete.html", 
         context={
             "user": curr_user, 
             "question": curr_que, 
             "show_best": show_best, 
-            "stats_display": curr_que.show_result(curr_user, show_best=show_best)
+            "stats_display": stats_display
         }
-    )
\ No newline at end of file
+    )
+
+@condition(etag_func=lambda request, etag: etag)
+@cache_control(public=True, max_age=365 * 24 * 60 * 60, immutable=True)
+def image(request: HttpRequest, etag: str): 
+    """ 
+    Serve a question thumbnail or drawing stored as :model:`questioner.ImageBlob` 
+    
+    Images are addressed by their content hash, so the response can be cached by the browser for good; a request revalidating the image (``If-None-Match``) is answered with ``304 Not Modified`` without reading the image. 
+
+    **Arguments:** 
+    - ``etag``: the content hash of the image 
+    """
+    blob = get_object_or_404(ImageBlob, etag=etag)
+    return HttpResponse(bytes(blob.data), content_type=blob.content_type)